@@ -0,0 +1,180 @@
+import glob
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+from rich.console import Console
+from rich.table import Table
+
+from robocompdsl.common.filesgenerator import FilesGenerator
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.logger import logger
+
+COMPONENT_DSL_SUFFIXES = ['.cdsl', '.jcdsl']
+
+console = Console()
+
+
+@dataclass
+class GenerationResult:
+    dsl_file: Path
+    output_path: Path
+    parse_time: float = 0.
+    generation_time: float = 0.
+    written_files: int = 0
+    unchanged_files: int = 0
+    new_files: int = 0
+    up_to_date: bool = False
+    error: Optional[str] = None
+
+    @property
+    def total_time(self):
+        return self.parse_time + self.generation_time
+
+
+def find_component_files(inputs: List[str], manifest: Optional[Path] = None) -> List[Tuple[Path, Path]]:
+    """
+    Return the list of (dsl file, output path) of the components to be generated.
+    :param inputs: cdsl files, glob patterns or directories (workspaces) to be searched recursively for cdsl files.
+    The output path of these components is the directory of the cdsl file.
+    :param manifest: file with a cdsl file path and, optionally, its output path in each line. Empty lines and lines
+    starting with # are ignored. Relative paths are relative to the directory of the manifest.
+    :return: list of tuples with the absolute paths of the dsl file and the output directory
+    """
+    components = []
+    for item in inputs:
+        item_path = Path(item)
+        if item_path.is_dir():
+            candidates = sorted(path for path in item_path.rglob('*') if path.suffix in COMPONENT_DSL_SUFFIXES)
+        elif item_path.is_file():
+            candidates = [item_path]
+        else:
+            candidates = sorted(Path(path) for path in glob.glob(item, recursive=True))
+            if not candidates:
+                logger.warning(f"No component found for {item}")
+        for candidate in candidates:
+            if candidate.suffix in COMPONENT_DSL_SUFFIXES:
+                components.append((candidate.absolute(), candidate.absolute().parent))
+    if manifest is not None:
+        base_dir = manifest.absolute().parent
+        with open(manifest, 'r') as reader:
+            for line_number, line in enumerate(reader, 1):
+                line = line.strip()
+                if not line or line.startswith('#'):
+                    continue
+                fields = line.split()
+                if len(fields) > 2:
+                    raise ValueError(f"Invalid line {line_number} in manifest {manifest}: {line}")
+                dsl_file = base_dir / fields[0]
+                output_path = base_dir / fields[1] if len(fields) > 1 else dsl_file.parent
+                components.append((dsl_file, output_path))
+    # Remove duplicates keeping the order
+    unique = {}
+    for dsl_file, output_path in components:
+        unique.setdefault(dsl_file.resolve(), (dsl_file, output_path))
+    return list(unique.values())
+
+
+def generate_component(dsl_file: Path, output_path: Path, test: bool = False, force: bool = False) -> GenerationResult:
+    """
+    Generate a single component as "robocompdsl DSL_FILE OUTPUT_PATH" would do when executed from the directory of
+    the dsl file (statemachine paths in the cdsl are relative to it). Errors are returned in the result.
+    """
+    result = GenerationResult(dsl_file, output_path)
+    current_dir = os.getcwd()
+    try:
+        os.chdir(dsl_file.parent)
+        start = time.perf_counter()
+        files_generator = FilesGenerator()
+        files_generator.generate(dsl_file, str(output_path), None, test, force)
+        result.parse_time = files_generator.parse_time
+        result.generation_time = time.perf_counter() - start - result.parse_time
+        result.up_to_date = files_generator.manifest_check is not None and files_generator.manifest_check.up_to_date
+        result.written_files = len(files_generator.written_files)
+        result.unchanged_files = len(files_generator.unchanged_files)
+        result.new_files = len(files_generator.new_files)
+    except SystemExit as e:
+        result.error = f"Exited with code {e.code}"
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    finally:
+        os.chdir(current_dir)
+    return result
+
+
+def _generate_component_job(job):
+    return generate_component(*job)
+
+
+class BatchGenerator:
+    """
+    Generate several components in the same process (or pool of processes), so the python startup, the creation of
+    the parsers, the loading of the plugins and the loading of the common idsls in the IDSLPool are done only once.
+    """
+    def __init__(self, jobs: int = 1, test: bool = False, force: bool = False):
+        self.jobs = max(1, jobs)
+        self.test = test
+        self.force = force
+
+    def generate(self, components: List[Tuple[Path, Path]]) -> List[GenerationResult]:
+        self._warm_up()
+        jobs = [(dsl_file, output_path, self.test, self.force) for dsl_file, output_path in components]
+        if self.jobs > 1 and len(jobs) > 1:
+            # With fork the workers inherit the loaded plugins, parsers and idsls
+            start_methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in start_methods else None)
+            with ProcessPoolExecutor(max_workers=self.jobs, mp_context=context) as executor:
+                return list(executor.map(_generate_component_job, jobs))
+        return [_generate_component_job(job) for job in jobs]
+
+    @staticmethod
+    def _warm_up():
+        from robocompdsl.templates.common.plugin_collection import PluginCollection
+        from robocompdsl.templates.templateCPP import plugins as cpp_plugins
+        from robocompdsl.templates.templatePython import plugins as python_plugins
+        from robocompdsl.dsl_parsers.idslpool import idsl_pool
+        for dsl_type in ['cdsl', 'smdsl', 'idsl']:
+            # Accessing the parser property creates the grammar
+            DSLFactory().get_parser(dsl_type).parser
+        PluginCollection.for_package(cpp_plugins.__name__)
+        PluginCollection.for_package(python_plugins.__name__)
+        try:
+            idsl_pool.module_providing_interface("CommonBehavior")
+        except ValueError as e:
+            logger.warning(f"Could not load the mandatory idsls: {e}")
+
+    @staticmethod
+    def print_summary(results: List[GenerationResult], wall_time: float = None):
+        table = Table(title="Generated components")
+        table.add_column("Component")
+        table.add_column("Parse (ms)", justify="right")
+        table.add_column("Generation (ms)", justify="right")
+        table.add_column("Total (ms)", justify="right")
+        table.add_column("Written", justify="right")
+        table.add_column("Unchanged", justify="right")
+        table.add_column(".new", justify="right")
+        table.add_column("Status")
+        for result in results:
+            try:
+                component = result.dsl_file.relative_to(Path.cwd())
+            except ValueError:
+                component = result.dsl_file
+            if result.error is None and result.up_to_date:
+                status = "[dim]Up to date[/dim]"
+            elif result.error is None:
+                status = "[green]OK[/green]"
+            else:
+                status = f"[red]{result.error}[/red]"
+            table.add_row(str(component), f"{result.parse_time * 1000:.1f}",
+                          f"{result.generation_time * 1000:.1f}", f"{result.total_time * 1000:.1f}", str(result.written_files), str(result.unchanged_files),
+                          str(result.new_files), status)
+        console.print(table)
+        failed = len([result for result in results if result.error is not None])
+        summary = f"{len(results) - failed} components generated, {failed} failed"
+        if wall_time is not None:
+            summary += f" in {wall_time:.2f}s"
+        console.print(summary, style='red' if failed else 'green')
@@ -2,6 +2,7 @@ import filecmp
 import os
 import subprocess
 import sys
+import time
 from pathlib import Path
 
 from rich import text
@@ -9,10 +10,13 @@ from rich.console import Console
 import pyparsing
 
 from robocompdsl.common import robocompdslutils
+from robocompdsl.common.generationmanifest import GenerationManifest
+from robocompdsl.common.profiler import profiler
 from robocompdsl.templates.templateCPP.templatecpp import TemplatesManagerCpp
 from robocompdsl.templates.templateICE.templateice import TemplateManagerIce
 from robocompdsl.templates.templatePython.templatepython import TemplatesManagerPython
 from robocompdsl.dsl_parsers import dsl_factory
+from robocompdsl.logger import logger
 
 LANG_TO_TEMPLATE = {
     'cpp': 'cpp',
@@ -30,6 +34,13 @@ class FilesGenerator:
         self.__output_path = None
         self.diff = None
         self.ast = None
+        self.written_files = []
+        self.unchanged_files = []
+        self.new_files = []
+        self.manifest = None
+        self.manifest_check = None
+        self.parse_time = 0.
+        self.jobs = 1
 
     @property
     def dsl_file(self):
@@ -51,20 +62,44 @@ class FilesGenerator:
         self.__output_path = value
 
     # TODO: diff and test should not be responsability of this class
-    def generate(self, input_file, output_path, diff=None, test=False):
+    def generate(self, input_file, output_path, diff=None, test=False, force=False, jobs=1):
         self.dsl_file = input_file
         self.output_path = output_path
         self.diff = diff
-        self.__load_ast()
-        new_existing_files = self.__create_files(test)
+        self.jobs = jobs
+        self.written_files, self.unchanged_files, self.new_files = [], [], []
+        self.manifest, self.manifest_check, self.parse_time = None, None, 0.
+        if self.dsl_file.suffix in [".cdsl", ".jcdsl"]:
+            # The generation manifest of the component tells if something changed without parsing anything
+            self.manifest = GenerationManifest(self.output_path)
+            if not force:
+                with profiler.span("check generation manifest"):
+                    self.manifest_check = self.manifest.check(self.dsl_file, self.__generation_options(test),
+                                                              self.__idsl_search_path())
+                logger.debug(f"Generation manifest of {self.output_path}: {self.manifest_check.reason}")
+                if self.manifest_check.up_to_date:
+                    console.print(f":zzz: Nothing changed since the last generation of {self.output_path}", style='dim')
+                    return
+        start = time.perf_counter()
+        with profiler.span("parse", dsl_file=self.dsl_file):
+            self.__load_ast()
+        self.parse_time = time.perf_counter() - start
+        with profiler.span("generate", output_path=self.output_path):
+            new_existing_files = self.__create_files(test)
+        self.new_files = list(new_existing_files.values())
+        self.__show_summary()
         self.__show_diff(new_existing_files)
 
     def __load_ast(self):
         try:
             self.ast = dsl_factory.DSLFactory().from_file(self.dsl_file)
         except ValueError as e:
-            console.log(f"Parsing error in file {text.Text(self.dsl_file, style='red')} while generating AST.")
-            console.log(f"Exception info: {text.Text(e.args[0], style='red')} in line {e.args[1]} of:\n{text.Text(e.args[2].rstrip(), style='magenta')}")
+            console.log(f"Parsing error in file {text.Text(str(self.dsl_file), style='red')} while generating AST.")
+            if len(e.args) >= 3:
+                console.log(f"Exception info: {text.Text(e.args[0], style='red')} in line {e.args[1]} of:\n{text.Text(e.args[2].rstrip(), style='magenta')}")
+            else:
+                # Semantic errors of the dsl only have a message
+                console.log(f"Exception info: {text.Text(str(e), style='red')}")
             exit(1)
         except FileNotFoundError as e:
             console.log(f"Dependency file not found for {text.Text(self.dsl_file, style='red')} while generating AST.")
@@ -91,6 +126,54 @@ class FilesGenerator:
             new_existing_files = self.__generate_interface()
         return new_existing_files
 
+    @staticmethod
+    def __generation_options(test):
+        return {'test': test}
+
+    @staticmethod
+    def __idsl_search_path():
+        # the -I directories, ROBOCOMP_INTERFACES and the common directories, in order of precedence
+        from robocompdsl.dsl_parsers.idslpool import idsl_pool
+        return list(idsl_pool.include_directories)
+
+    def __outputs_to_generate(self):
+        """
+        Return the set of files to generate when only some idsl files changed since the last generation, or None
+        if all the files must be generated.
+        """
+        if self.manifest_check is None or self.manifest_check.full:
+            return None
+        if self.manifest.imports_changed(self.__component_imports()):
+            logger.debug("The idsl files imported by the component changed")
+            return None
+        return self.manifest.outputs_depending_on(self.manifest_check.changed_idsls) | \
+            self.manifest_check.outdated_outputs
+
+    def __component_imports(self):
+        return sorted(set(self.ast.imports) | set(self.ast.recursiveImports or []))
+
+    def __update_manifest(self, test, template_objects, partial):
+        from robocompdsl.dsl_parsers.idslpool import idsl_pool
+        outputs = {}
+        for template_obj in template_objects:
+            outputs.update(template_obj.outputs)
+        idsl_files = []
+        for idsl in self.__component_imports():
+            idsl_file = idsl_pool.idsl_file_for_module(idsl.split('.')[0])
+            if idsl_file is not None:
+                idsl_files.append(str(idsl_file))
+        self.manifest.update(self.dsl_file, getattr(self.ast, 'statemachine_path', None), self.__component_imports(),
+                             idsl_files, self.__generation_options(test), outputs, partial, self.__idsl_search_path())
+        self.manifest.save()
+
+    def __show_summary(self):
+        console.print(f"{len(self.written_files)} files written, {len(self.unchanged_files)} unchanged, "
+                      f"{len(self.new_files)} saved as .new", style='green' if self.written_files else 'dim')
+
+    def __add_generated_files(self, template_obj):
+        self.written_files.extend(template_obj.written_files)
+        self.unchanged_files.extend(template_obj.unchanged_files)
+
     def __show_diff(self, new_existing_files):
         # Code to launch diff tool on .new files to be compared with their old version
         if self.diff is not None and len(new_existing_files) > 0:
@@ -123,17 +206,33 @@ class FilesGenerator:
             template_obj = TemplatesManagerPython(self.ast)
         else:
             template_obj = TemplatesManagerCpp(self.ast)
+        template_objects = [template_obj]
+        # Interfaces are checked here so it's not recorded as a dependency of the first file reading the pool
+        self.ast.idsl_pool
+        only_outputs = self.__outputs_to_generate()
+        if only_outputs is not None:
+            console.print(f"Only generating the {len(only_outputs)} files affected by the changes in "
+                          f"{', '.join(sorted(self.manifest_check.changed_idsls)) or 'the generated files'}")
 
         try:
+            template_obj.only_outputs = only_outputs
+            template_obj.jobs = self.jobs
             new_existing_files = template_obj.generate_files(self.output_path)
+            self.__add_generated_files(template_obj)
             if template == 'python' and test:
                 self.ast.requires, self.ast.implements = self.ast.implements, self.ast.requires
                 self.ast.publishes, self.ast.subscribesTo = self.ast.subscribesTo, self.ast.publishes
                 test_template_object = TemplatesManagerPython(self.ast)
+                test_template_object.only_outputs = only_outputs
+                test_template_object.jobs = self.jobs
                 test_template_object.generate_files(self.output_path+"/test")
+                self.__add_generated_files(test_template_object)
+                template_objects.append(test_template_object)
         except KeyError as e:
             console.log(e)
             raise
+        with profiler.span("update generation manifest"):
+            self.__update_manifest(test, template_objects, only_outputs is not None)
 
     # for module in self.ast.idsl_pool.modulePool.values():
         #     template_obj = TemplateManagerIce(module)
@@ -145,6 +244,7 @@ class FilesGenerator:
     def __generate_interface(self):
         template_obj = TemplateManagerIce(self.ast)
         new_existing_files = template_obj.generate_files(self.output_path)
+        self.__add_generated_files(template_obj)
         return new_existing_files
 
     def __create_component_directories(self, test=False):
@@ -0,0 +1,219 @@
+import functools
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional, Set
+
+from robocompdsl.logger import logger
+
+GENERATION_MANIFEST_FORMAT_VERSION = 2
+MANIFEST_DIR = ".robocompdsl"
+MANIFEST_FILE = "manifest.json"
+ROBOCOMPDSL_DIR = Path(__file__).absolute().parent.parent
+
+
+def file_hash(path) -> Optional[str]:
+    """
+    Return the sha256 of the content of the file in path or None if it doesn't exist
+    """
+    try:
+        with open(path, 'rb') as reader:
+            return hashlib.sha256(reader.read()).hexdigest()
+    except (FileNotFoundError, IsADirectoryError):
+        return None
+
+
+@functools.lru_cache(maxsize=None)
+def generator_fingerprint() -> str:
+    """
+    Return a hash of the path, size and mtime of the robocompdsl sources and templates, so a change in the
+    generator itself invalidates the manifests of the generated components.
+    """
+    from robocompdsl.templates.common.abstracttemplatesmanager import TEMPLATES_DIR
+    digest = hashlib.sha256()
+    for directory in sorted({ROBOCOMPDSL_DIR, Path(TEMPLATES_DIR).absolute()}):
+        for root, dirs, files in os.walk(directory):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            for filename in sorted(files):
+                stat = os.stat(os.path.join(root, filename))
+                digest.update(f"{os.path.join(root, filename)}:{stat.st_size}:{stat.st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+
+@dataclass
+class ManifestCheck:
+    """
+    Result of comparing a generation manifest with the current inputs and outputs of a component.
+    """
+    # nothing to generate
+    up_to_date: bool = False
+    # the component must be completely generated
+    full: bool = True
+    # idsl files whose content changed since the last generation
+    changed_idsls: Set[str] = field(default_factory=set)
+    # generated files that were modified or removed after the last generation
+    outdated_outputs: Set[str] = field(default_factory=set)
+    reason: str = ""
+
+
+class GenerationManifest:
+    """
+    Record of the last generation of a component, stored in .robocompdsl/manifest.json inside the output directory.
+    It keeps the hashes of the inputs (cdsl, smdsl and every idsl file used), the directories where the idsl files
+    were searched and the hashes of the generated files with the idsl files each of them depends on, so the next
+    generation can be skipped when nothing changed, or limited to the files depending on the changed idsl files.
+    """
+    def __init__(self, output_path):
+        self.output_path = Path(output_path).absolute()
+        self.manifest_file = self.output_path / MANIFEST_DIR / MANIFEST_FILE
+        self.data = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_file, 'r') as reader:
+                data = json.load(reader)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Discarding invalid generation manifest {self.manifest_file}: {e}")
+            return None
+        if not isinstance(data, dict) or data.get('version') != GENERATION_MANIFEST_FORMAT_VERSION:
+            return None
+        return data
+
+    def output_path_of(self, relative_path):
+        return str(self.output_path / relative_path)
+
+    def check(self, dsl_file, options, search_path=None) -> ManifestCheck:
+        """
+        Compare the manifest with the current state of the inputs and outputs without parsing anything.
+        :param dsl_file: cdsl file of the component
+        :param options: dict with the generation options that change the generated files
+        :param search_path: directories where the idsl files are searched, in order of precedence
+        """
+        if self.data is None:
+            return ManifestCheck(reason="no previous generation manifest")
+        inputs = self.data['inputs']
+        if self.data['generator'] != generator_fingerprint():
+            return ManifestCheck(reason="robocompdsl changed")
+        if self.data['options'] != options:
+            return ManifestCheck(reason="generation options changed")
+        if inputs['cdsl']['path'] != str(Path(dsl_file).absolute()):
+            return ManifestCheck(reason="different cdsl file")
+        if inputs['search_path'] != self._search_path(search_path):
+            return ManifestCheck(reason="idsl search path changed")
+        shadowing = self._shadowing_idsl(inputs['search_path'], inputs['idsls'])
+        if shadowing is not None:
+            return ManifestCheck(reason=f"new idsl file {shadowing}")
+        for key in ['cdsl', 'smdsl']:
+            if inputs[key] is not None and file_hash(inputs[key]['path']) != inputs[key]['sha256']:
+                return ManifestCheck(reason=f"{key} file changed")
+        changed_idsls = {path for path, sha256 in inputs['idsls'].items() if file_hash(path) != sha256}
+        outdated_outputs = set()
+        for relative_path, output in self.data['outputs'].items():
+            path = self.output_path_of(relative_path)
+            if output['kind'] == 'generated' and file_hash(path) != output['sha256']:
+                outdated_outputs.add(path)
+            elif output['kind'] == 'specific' and not os.path.exists(path):
+                outdated_outputs.add(path)
+        if not changed_idsls and not outdated_outputs:
+            return ManifestCheck(up_to_date=True, full=False, reason="nothing changed")
+        return ManifestCheck(full=False, changed_idsls=changed_idsls, outdated_outputs=outdated_outputs,
+                             reason=f"{len(changed_idsls)} idsl files and {len(outdated_outputs)} generated files changed")
+
+    @staticmethod
+    def _search_path(search_path):
+        return [str(Path(directory).absolute()) for directory in search_path or []]
+
+    @staticmethod
+    def _shadowing_idsl(search_path, idsl_files):
+        """
+        Return the path of a file that would now be found instead of one of the idsl_files because it has the same
+        name in a directory searched before, or None if there isn't any.
+        """
+        for idsl_file in idsl_files:
+            for directory in search_path:
+                try:
+                    name = Path(idsl_file).relative_to(directory)
+                except ValueError:
+                    continue
+                for previous in search_path[:search_path.index(directory)]:
+                    if (Path(previous) / name).is_file():
+                        return str(Path(previous) / name)
+                break
+        return None
+
+    def imports_changed(self, imports):
+        """
+        Return True if the list of idsl files imported (directly or not) by the component is different from the
+        recorded one. Files like CMakeLists.txt depend on this list, not on the content of the idsl files.
+        """
+        return self.data is None or self.data['inputs']['imports'] != sorted(imports)
+
+    def outputs_depending_on(self, idsl_files):
+        """
+        Return the absolute paths of the recorded outputs that depend on any of the idsl files
+        """
+        return {self.output_path_of(relative_path) for relative_path, output in self.data['outputs'].items()
+                if set(output['idsls']) & set(idsl_files)}
+
+    def update(self, dsl_file, smdsl_file, imports, idsl_files, options, outputs, partial=False, search_path=None):
+        """
+        Store the current inputs and the outputs generated.
+        :param imports: names of the idsl files imported by the component
+        :param idsl_files: paths of the idsl files used by the component
+        :param outputs: dict from the absolute path of the generated files to their record (kind, sha256, idsls)
+        :param partial: if True, only some outputs were generated and the records of the others are kept
+        :param search_path: directories where the idsl files were searched, in order of precedence
+        """
+        new_outputs = {}
+        for path, output in outputs.items():
+            relative_path = os.path.relpath(path, self.output_path)
+            new_outputs[relative_path] = output
+        if partial and self.data is not None:
+            kept = {}
+            generated = {relative_path[:-4] if output['kind'] == 'new' else relative_path
+                         for relative_path, output in new_outputs.items()}
+            for relative_path, output in self.data['outputs'].items():
+                base = relative_path[:-4] if output['kind'] == 'new' else relative_path
+                if base not in generated:
+                    kept[relative_path] = output
+            kept.update(new_outputs)
+            new_outputs = kept
+        idsl_files = set(idsl_files)
+        for output in new_outputs.values():
+            idsl_files.update(output['idsls'])
+        self.data = {
+            'version': GENERATION_MANIFEST_FORMAT_VERSION,
+            'generator': generator_fingerprint(),
+            'options': options,
+            'inputs': {
+                'cdsl': self._input(dsl_file),
+                'smdsl': self._input(smdsl_file) if smdsl_file else None,
+                'imports': sorted(imports),
+                'search_path': self._search_path(search_path),
+                'idsls': {str(path): file_hash(path) for path in sorted(idsl_files)},
+            },
+            'outputs': dict(sorted(new_outputs.items())),
+        }
+
+    @staticmethod
+    def _input(path):
+        path = Path(path).absolute()
+        return {'path': str(path), 'sha256': file_hash(path)}
+
+    def save(self):
+        """
+        Write the manifest file. Errors are only logged, the worst case is a full generation the next time.
+        """
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.manifest_file.parent, suffix=".tmp")
+            with os.fdopen(fd, 'w') as writer:
+                json.dump(self.data, writer, indent=1)
+            os.replace(tmp_path, self.manifest_file)
+        except OSError as e:
+            logger.debug(f"Could not write the generation manifest {self.manifest_file}: {e}")
@@ -0,0 +1,209 @@
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional
+
+from rich.console import Console
+from rich.table import Table
+
+from robocompdsl.common.generationmanifest import MANIFEST_DIR, file_hash, generator_fingerprint
+from robocompdsl.common.profiler import profiler
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idslpool import idsl_pool
+from robocompdsl.logger import logger
+
+ICE_MANIFEST_FORMAT_VERSION = 1
+ICE_MANIFEST_FILE = "ice_manifest.json"
+
+console = Console()
+
+
+@dataclass
+class IceResult:
+    idsl_file: Path
+    ice_file: Path
+    generation_time: float = 0.
+    written: bool = False
+    # the source and the output didn't change since the last translation, so nothing was done
+    up_to_date: bool = False
+    # sha256 of the generated content
+    sha256: Optional[str] = None
+    error: Optional[str] = None
+
+
+class IceManifest:
+    """
+    Record of the idsl files translated to an output directory, stored in .robocompdsl/ice_manifest.json inside it.
+    It keeps the hash of each idsl file and of the ice file generated from it, so unchanged files are not parsed or
+    rendered again. The ice file only depends on the content of its idsl file, not on the imported ones.
+    """
+    def __init__(self, output_path):
+        self.output_path = Path(output_path).absolute()
+        self.manifest_file = self.output_path / MANIFEST_DIR / ICE_MANIFEST_FILE
+        self.files = self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_file, 'r') as reader:
+                data = json.load(reader)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.debug(f"Discarding invalid ice manifest {self.manifest_file}: {e}")
+            return {}
+        if not isinstance(data, dict) or data.get('version') != ICE_MANIFEST_FORMAT_VERSION or \
+                data.get('generator') != generator_fingerprint():
+            return {}
+        return data['files']
+
+    def up_to_date(self, idsl_file, ice_file):
+        record = self.files.get(str(idsl_file))
+        return record is not None and record['ice'] == str(ice_file) and \
+            record['sha256'] == file_hash(idsl_file) and record['ice_sha256'] == file_hash(ice_file)
+
+    def update(self, result: IceResult, source_hash):
+        if result.error is None:
+            self.files[str(result.idsl_file)] = {'sha256': source_hash, 'ice': str(result.ice_file),
+                                                 'ice_sha256': result.sha256}
+        else:
+            self.files.pop(str(result.idsl_file), None)
+
+    def save(self):
+        """
+        Write the manifest file. Errors are only logged, the worst case is translating every file the next time.
+        """
+        data = {'version': ICE_MANIFEST_FORMAT_VERSION, 'generator': generator_fingerprint(),
+                'files': dict(sorted(self.files.items()))}
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.manifest_file.parent, suffix=".tmp")
+            with os.fdopen(fd, 'w') as writer:
+                json.dump(data, writer, indent=1)
+            os.replace(tmp_path, self.manifest_file)
+        except OSError as e:
+            logger.debug(f"Could not write the ice manifest {self.manifest_file}: {e}")
+
+
+def generate_ice(idsl_file: Path, ice_file: Path) -> IceResult:
+    """
+    Write the ice file of an idsl file already loaded by the DSLFactory. Errors are returned in the result.
+    """
+    from robocompdsl.templates.templateICE.templateice import TemplateManagerIce
+    result = IceResult(idsl_file, ice_file)
+    start = time.perf_counter()
+    try:
+        template_obj = TemplateManagerIce(DSLFactory().from_file(idsl_file))
+        template_obj.generate_files(str(ice_file))
+        result.written = bool(template_obj.written_files)
+        result.sha256 = template_obj.outputs[str(ice_file)]['sha256']
+    except Exception as e:
+        result.error = f"{type(e).__name__}: {e}"
+    result.generation_time = time.perf_counter() - start
+    return result
+
+
+def _generate_ice_job(job):
+    return generate_ice(*job)
+
+
+class IceGenerator:
+    """
+    Translate every idsl file of a directory to an ice file in the same process (or pool of processes), so the idsl
+    files are parsed once in the shared IDSLPool instead of once per robocompdsl execution.
+    """
+    def __init__(self, jobs: int = 1, force: bool = False):
+        self.jobs = max(1, jobs)
+        self.force = force
+
+    def generate(self, idsl_dir: Path, output_path: Path) -> List[IceResult]:
+        idsl_dir, output_path = idsl_dir.absolute(), output_path.absolute()
+        output_path.mkdir(parents=True, exist_ok=True)
+        manifest = IceManifest(output_path)
+        # The files of the directory take precedence over the ones with the same name in other include directories
+        idsl_pool.update_directories([idsl_dir])
+        idsl_pool.jobs = self.jobs
+        results, pending = [], []
+        for idsl_file in sorted(idsl_dir.glob('*.idsl')):
+            ice_file = output_path / (idsl_file.stem + '.ice')
+            if not self.force and manifest.up_to_date(idsl_file, ice_file):
+                results.append(IceResult(idsl_file, ice_file, up_to_date=True))
+            else:
+                pending.append((idsl_file, ice_file))
+        source_hashes = {idsl_file: file_hash(idsl_file) for idsl_file, _ in pending}
+        errors = self._load(idsl_file for idsl_file, _ in pending)
+        jobs = [job for job in pending if job[0] not in errors]
+        generated = {result.idsl_file: result for result in self._generate_all(jobs)}
+        for idsl_file, ice_file in pending:
+            result = generated.get(idsl_file) or IceResult(idsl_file, ice_file, error=errors.get(idsl_file))
+            manifest.update(result, source_hashes[idsl_file])
+            results.append(result)
+        manifest.save()
+        return sorted(results, key=lambda result: result.idsl_file)
+
+    @staticmethod
+    def _load(idsl_files):
+        """
+        Load the idsl files and their imports in the pool, parsing each level of imports in parallel.
+        :return: dict with the error of the files that could not be loaded
+        """
+        idsl_files = list(idsl_files)
+        errors = {}
+        # Files changed since they were loaded by this process must be read again
+        for idsl_file in idsl_files:
+            DSLFactory().invalidate(idsl_file)
+            module = dict.get(idsl_pool, idsl_file.stem)
+            if module is not None and module['filename'] == str(idsl_file):
+                del idsl_pool[idsl_file.stem]
+        with profiler.span(f"load {len(idsl_files)} idsl files", 'idsl pool'):
+            try:
+                idsl_pool.load_idsls([idsl_file.name for idsl_file in idsl_files])
+            except Exception:
+                # Load them one by one to know which ones failed
+                for idsl_file in idsl_files:
+                    try:
+                        idsl_pool.load_idsls([idsl_file.name])
+                    except Exception as e:
+                        errors[idsl_file] = f"{type(e).__name__}: {e}"
+        return errors
+
+    def _generate_all(self, jobs):
+        if self.jobs > 1 and len(jobs) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            # With fork the workers inherit the parsed modules, the plugins and the compiled templates
+            with ProcessPoolExecutor(max_workers=min(self.jobs, len(jobs)),
+                                     mp_context=multiprocessing.get_context('fork')) as executor:
+                return list(executor.map(_generate_ice_job, jobs, chunksize=max(1, len(jobs) // (4 * self.jobs))))
+        return [_generate_ice_job(job) for job in jobs]
+
+    @staticmethod
+    def print_summary(results: List[IceResult], wall_time: float = None):
+        # Up to date files are only counted, there can be hundreds of them
+        changed = [result for result in results if not result.up_to_date]
+        if changed:
+            table = Table(title="Generated ice files")
+            table.add_column("IDSL")
+            table.add_column("ICE")
+            table.add_column("Time (ms)", justify="right")
+            table.add_column("Status")
+            for result in changed:
+                if result.error is not None:
+                    status = f"[red]{result.error}[/red]"
+                elif result.written:
+                    status = "[green]Written[/green]"
+                else:
+                    status = "[dim]Unchanged[/dim]"
+                table.add_row(result.idsl_file.name, str(result.ice_file), f"{result.generation_time * 1000:.1f}",
+                              status)
+            console.print(table)
+        failed = len([result for result in results if result.error is not None])
+        written = len([result for result in results if result.written])
+        up_to_date = len(results) - len(changed)
+        summary = (f"{len(results)} idsl files: {written} ice files written, {len(changed) - written - failed} "
+                   f"unchanged, {up_to_date} up to date, {failed} failed")
+        if wall_time is not None:
+            summary += f" in {wall_time:.2f}s"
+        console.print(summary, style='red' if failed else 'green' if written else 'dim')
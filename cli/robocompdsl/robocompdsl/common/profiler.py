@@ -0,0 +1,112 @@
+import json
+import os
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from rich.console import Console
+from rich.table import Table
+
+console = Console()
+
+ProfileEvent = namedtuple('ProfileEvent', ['name', 'category', 'start', 'duration', 'pid', 'tid', 'args'])
+
+
+class Profiler:
+    """
+    Records the wall time of the stages of the generation (parsing, plugin loading, template dicts, rendering,
+    writing...). It's disabled by default and spans are only recorded after enable() is called, so the instrumented
+    code has almost no cost in normal executions.
+    The events can be shown as a table or saved in the Chrome trace event format (chrome://tracing, Perfetto).
+    """
+    def __init__(self):
+        self.enabled = False
+        self.events = []
+        self._origin = time.perf_counter_ns()
+
+    def enable(self):
+        self.enabled = True
+        self.events = []
+        self._origin = time.perf_counter_ns()
+
+    def disable(self):
+        self.enabled = False
+
+    @contextmanager
+    def span(self, name, category='stage', **args):
+        """
+        Context manager recording the time spent inside the with block as an event of the category
+        """
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            self.events.append(ProfileEvent(name, category, start - self._origin, time.perf_counter_ns() - start,
+                                            os.getpid(), threading.get_ident(), args))
+
+    def call(self, name, category, function, *args, **kwargs):
+        """
+        Call function with the arguments recording the time spent in it
+        """
+        with self.span(name, category):
+            return function(*args, **kwargs)
+
+    def summary(self):
+        """
+        Return a list of (category, name, count, total ns, max ns) sorted by total time. Nested spans are included in
+        the time of the enclosing ones.
+        """
+        totals = {}
+        for event in self.events:
+            count, total, maximum = totals.get((event.category, event.name), (0, 0, 0))
+            totals[(event.category, event.name)] = (count + 1, total + event.duration, max(maximum, event.duration))
+        rows = [(category, name, count, total, maximum) for (category, name), (count, total, maximum) in totals.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def print_table(self, limit=None):
+        table = Table(title="Generation profile (inclusive times)")
+        table.add_column("Category")
+        table.add_column("Name")
+        table.add_column("Calls", justify="right")
+        table.add_column("Total (ms)", justify="right")
+        table.add_column("Mean (ms)", justify="right")
+        table.add_column("Max (ms)", justify="right")
+        rows = self.summary()
+        for category, name, count, total, maximum in rows[:limit]:
+            table.add_row(category, name, str(count), f"{total / 1e6:.2f}", f"{total / count / 1e6:.3f}",
+                          f"{maximum / 1e6:.3f}")
+        console.print(table)
+        if limit is not None and len(rows) > limit:
+            console.print(f"{len(rows) - limit} more entries in the trace file", style='dim')
+
+    def trace(self):
+        """
+        Return the events in the Chrome trace event format
+        """
+        events = []
+        for event in sorted(self.events, key=lambda e: e.start):
+            events.append({
+                'name': event.name,
+                'cat': event.category,
+                'ph': 'X',
+                'ts': event.start / 1000,
+                'dur': event.duration / 1000,
+                'pid': event.pid,
+                'tid': event.tid,
+                'args': {key: str(value) for key, value in event.args.items()},
+            })
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def dump_trace(self, path):
+        with open(path, 'w') as writer:
+            json.dump(self.trace(), writer)
+
+
+"""
+Profiler shared by all the modules. It's only enabled with the --profile option.
+"""
+profiler = Profiler()
@@ -1,5 +1,6 @@
 import os
 import sys
+import tempfile
 from distutils import spawn
 from rich.console import Console
 
@@ -52,6 +53,36 @@ def create_directory(directory):
             raise RuntimeError('\nCOULDN\'T CREATE %s' % directory)
 
 
+def write_if_changed(path, content):
+    """
+    Write content to the file in path only if the file doesn't exist or has a different content, so the mtime of
+    unchanged files is kept and build tools don't rebuild them. The file is replaced atomically, keeping its mode.
+    :return: True if the file has been written, False if it was unchanged.
+    """
+    data = content.encode('utf-8') if isinstance(content, str) else content
+    try:
+        with open(path, 'rb') as reader:
+            if reader.read() == data:
+                return False
+        mode = os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        umask = os.umask(0)
+        os.umask(umask)
+        mode = 0o666 & ~umask
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.' + os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as writer:
+            writer.write(data)
+        os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return True
+
+
 def get_random_available_port(host="localhost"):
     import random
     while(True):
@@ -0,0 +1,264 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+from pathlib import Path
+from typing import Iterable, Optional, Set
+
+from rich.console import Console
+
+from robocompdsl.common.filesgenerator import FilesGenerator
+from robocompdsl.common.generationmanifest import GenerationManifest, generator_fingerprint
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idslpool import idsl_pool
+from robocompdsl.logger import logger
+
+# Time without new events after a change before regenerating, as editors can write a file several times when saving it
+DEFAULT_DEBOUNCE = 0.05
+DEFAULT_POLLING_INTERVAL = 0.5
+
+console = Console()
+
+
+class PollingWatcher:
+    """
+    Watch a set of files comparing their mtime, size and inode every interval seconds.
+    """
+    def __init__(self, interval: float = DEFAULT_POLLING_INTERVAL, debounce: float = DEFAULT_DEBOUNCE):
+        self.interval = interval
+        self.debounce = debounce
+        self._signatures = {}
+
+    @staticmethod
+    def _signature(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size, stat.st_ino
+
+    def set_files(self, paths: Iterable[Path]):
+        # Files already watched keep their signature, so changes made while generating are not missed
+        paths = {Path(path).absolute() for path in paths}
+        self._signatures = {path: self._signatures[path] if path in self._signatures else self._signature(path)
+                            for path in paths}
+
+    def _changed(self):
+        changed = set()
+        for path, signature in self._signatures.items():
+            current = self._signature(path)
+            if current != signature:
+                self._signatures[path] = current
+                changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Wait until some of the files change or timeout seconds pass
+        :return: the changed files, empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._changed()
+            if changed:
+                time.sleep(self.debounce)
+                return changed | self._changed()
+            if deadline is not None and time.monotonic() >= deadline:
+                return set()
+            time.sleep(self.interval if deadline is None else max(0., min(self.interval, deadline - time.monotonic())))
+
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """
+    Watch a set of files with the inotify API of Linux, through ctypes so no extra package is needed.
+    The directories of the files are watched instead of the files, as editors usually save a file writing a new one
+    and renaming it over the old one.
+    """
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+    EVENT_HEADER = struct.Struct('iIII')
+
+    def __init__(self, debounce: float = DEFAULT_DEBOUNCE):
+        self.debounce = debounce
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._fd = self._libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), os.strerror(ctypes.get_errno()))
+        self._files = set()
+        # watch descriptor to directory and the other way around
+        self._directories = {}
+        self._descriptors = {}
+
+    def set_files(self, paths: Iterable[Path]):
+        self._files = {Path(path).absolute() for path in paths}
+        directories = {path.parent for path in self._files}
+        for directory in set(self._descriptors) - directories:
+            self._libc.inotify_rm_watch(self._fd, self._descriptors.pop(directory))
+        for directory in directories - set(self._descriptors):
+            descriptor = self._libc.inotify_add_watch(self._fd, os.fsencode(directory), self.WATCH_MASK)
+            if descriptor < 0:
+                logger.warning(f"Could not watch {directory}: {os.strerror(ctypes.get_errno())}")
+                continue
+            self._descriptors[directory] = descriptor
+        self._directories = {descriptor: directory for directory, descriptor in self._descriptors.items()}
+
+    def _read_events(self, timeout):
+        changed = set()
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return changed
+        try:
+            data = os.read(self._fd, 64 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            descriptor, _, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            directory = self._directories.get(descriptor)
+            if directory is not None and name:
+                path = directory / os.fsdecode(name)
+                if path in self._files:
+                    changed.add(path)
+        return changed
+
+    def wait(self, timeout: Optional[float] = None) -> Set[Path]:
+        """
+        Wait until some of the files change or timeout seconds pass
+        :return: the changed files, empty on timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return changed
+            changed = self._read_events(remaining)
+        # Wait for the rest of the events of the same save
+        while True:
+            more = self._read_events(self.debounce)
+            if not more:
+                return changed
+            changed |= more
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def create_watcher(polling: bool = False, interval: float = DEFAULT_POLLING_INTERVAL):
+    """
+    Return an InotifyWatcher when inotify is available and polling is not requested, or a PollingWatcher
+    """
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher()
+        except (OSError, AttributeError) as e:
+            logger.debug(f"inotify not available, polling the files: {e}")
+    return PollingWatcher(interval)
+
+
+class ComponentWatcher:
+    """
+    Generate a component again each time its cdsl, its statemachine or any of the idsl files it uses change.
+    The parsers, the plugins, the compiled templates and the loaded idsls are kept in memory between generations, and
+    only the changed files (and the idsl modules importing them) are removed from the caches, so regenerating only
+    takes the time of rendering the affected files. The generation manifest skips the files that don't depend on the
+    changes and unchanged files are not written.
+    """
+    def __init__(self, dsl_file: Path, output_path: str, watcher, jobs: int = 1, force: bool = False):
+        self.dsl_file = Path(dsl_file).absolute()
+        self.output_path = output_path
+        self.watcher = watcher
+        self.jobs = jobs
+        self.force = force
+        self.watched = {self.dsl_file}
+        self.generations = 0
+
+    def generate(self):
+        start = time.perf_counter()
+        try:
+            FilesGenerator().generate(self.dsl_file, self.output_path, None, False, self.force, self.jobs)
+        except SystemExit:
+            # Parsing errors are already shown by the FilesGenerator
+            console.print("Generation failed, waiting for changes", style='red')
+        except Exception as e:
+            console.print(f"Generation failed, waiting for changes: {type(e).__name__}: {e}", style='red')
+        else:
+            self.force = False
+            # Files no longer used are not watched
+            self.watched = set()
+        self.generations += 1
+        self.watched |= self.inputs()
+        self.watcher.set_files(self.watched)
+        console.print(f"Generated in {(time.perf_counter() - start) * 1000:.0f} ms. Watching {len(self.watched)} files",
+                      style='dim')
+
+    def inputs(self) -> Set[Path]:
+        """
+        Return the cdsl, smdsl and idsl files used in the last generation, as recorded in its manifest
+        """
+        inputs = {self.dsl_file}
+        data = GenerationManifest(self.output_path).data
+        if data is not None:
+            if data['inputs']['smdsl'] is not None:
+                inputs.add(Path(data['inputs']['smdsl']['path']))
+            inputs.update(Path(path) for path in data['inputs']['idsls'])
+        return inputs
+
+    def invalidate(self, changed: Set[Path]):
+        """
+        Remove the changed files from the in-memory caches. The component itself is always read again (usually from
+        the persistent cache) because it keeps the imports resolved when it was loaded. Restoring it from the cache
+        resolves its recursiveImports again from the current idsl files.
+        """
+        factory = DSLFactory()
+        changed = {str(path) for path in changed}
+        stale = {name for name, module in dict.items(idsl_pool) if str(module['filename']) in changed}
+        # Modules importing a changed module keep its imports in their recursive_imports
+        while True:
+            importers = {name for name, module in dict.items(idsl_pool) if name not in stale and
+                         any(imported.split('.')[0] in stale for imported in module['imports'])}
+            if not importers:
+                break
+            stale |= importers
+        for name in stale:
+            factory.invalidate(dict.__getitem__(idsl_pool, name)['filename'])
+            del idsl_pool[name]
+        for path in changed | {str(self.dsl_file)}:
+            factory.invalidate(path)
+        idsl_pool.catalog.refresh()
+        # Templates are compiled again when they change, so the generator fingerprint must be computed again too
+        generator_fingerprint.cache_clear()
+        logger.debug(f"Invalidated the idsl modules {sorted(stale)}")
+
+    def run(self, max_generations: Optional[int] = None):
+        """
+        Generate the component and then again on each change until interrupted or max_generations are done
+        """
+        self.generate()
+        try:
+            while max_generations is None or self.generations < max_generations:
+                changed = self.watcher.wait()
+                if not changed:
+                    continue
+                console.print(f"Changed {', '.join(sorted(path.name for path in changed))}")
+                self.invalidate(changed)
+                self.generate()
+        finally:
+            self.watcher.close()
@@ -0,0 +1,143 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+from pathlib import Path
+
+import pyparsing
+
+from robocompdsl.logger import logger
+
+CACHE_FORMAT_VERSION = "1"
+DEFAULT_CACHE_DIR = Path(os.getenv('XDG_CACHE_HOME', Path('~/.cache').expanduser())) / "robocomp" / "dsl"
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+CACHE_SUFFIX = ".pickle"
+
+
+class DSLCache:
+    """
+    Persistent on-disk cache for the structures generated by the dsl parsers.
+    Entries are keyed by the sha256 of the dsl file content, its dsl type and the version of the parser that
+    produced them, so any change in the file or in the grammar results in a cache miss. The structures are stored
+    pickled, and the cache directory is kept under max_size bytes evicting the least recently used entries.
+    """
+    def __init__(self, cache_dir=None, max_size=None):
+        self.cache_dir = Path(cache_dir) if cache_dir is not None else Path(
+            os.getenv('ROBOCOMPDSL_CACHE_DIR', DEFAULT_CACHE_DIR))
+        self.max_size = max_size if max_size is not None else int(
+            os.getenv('ROBOCOMPDSL_CACHE_SIZE', DEFAULT_MAX_SIZE))
+
+    @staticmethod
+    def key(content, dsl_type, parser_version):
+        """
+        Return the cache key for the content of a dsl file
+        :param content: string with the content of the dsl file
+        :param dsl_type: type of the dsl (file extension)
+        :param parser_version: version string of the parser for this dsl type
+        :return: hex digest identifying the entry
+        """
+        hasher = hashlib.sha256()
+        for part in (CACHE_FORMAT_VERSION, pyparsing.__version__, "%d.%d" % sys.version_info[:2],
+                     dsl_type.lower(), parser_version):
+            hasher.update(part.encode('utf-8'))
+            hasher.update(b'\0')
+        hasher.update(content.encode('utf-8'))
+        return hasher.hexdigest()
+
+    def _entry_path(self, key):
+        return self.cache_dir / (key + CACHE_SUFFIX)
+
+    def get(self, key):
+        """
+        Return the struct stored for key or None if there's no valid entry for it.
+        """
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as reader:
+                struct = pickle.load(reader)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Discarding invalid cache entry {entry_path}: {e}")
+            self._remove(entry_path)
+            return None
+        # mtime is used as the last access time for the eviction
+        try:
+            os.utime(entry_path)
+        except OSError:
+            pass
+        logger.debug(f"DSL cache hit {entry_path}")
+        return struct
+
+    def put(self, key, struct):
+        """
+        Store the struct for key. Failing to write the cache is never an error for the caller.
+        """
+        try:
+            data = pickle.dumps(struct, protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception as e:
+            logger.debug(f"Struct for {key} can't be cached: {e}")
+            return False
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as writer:
+                writer.write(data)
+            os.replace(tmp_path, self._entry_path(key))
+        except OSError as e:
+            logger.debug(f"Could not write dsl cache entry in {self.cache_dir}: {e}")
+            return False
+        self.evict()
+        return True
+
+    def entries(self):
+        """
+        :return: list of (path, size, mtime) for the entries in the cache
+        """
+        result = []
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.name.endswith(CACHE_SUFFIX):
+                        try:
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        result.append((Path(entry.path), stat.st_size, stat.st_mtime))
+        except FileNotFoundError:
+            pass
+        return result
+
+    def size(self):
+        return sum(size for _, size, _ in self.entries())
+
+    def evict(self):
+        """
+        Remove the least recently used entries until the cache is under max_size.
+        """
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        if total <= self.max_size:
+            return 0
+        removed = 0
+        for entry_path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_size:
+                break
+            if self._remove(entry_path):
+                total -= size
+                removed += 1
+        logger.debug(f"Evicted {removed} entries from the dsl cache")
+        return removed
+
+    def clear(self):
+        for entry_path, _, _ in self.entries():
+            self._remove(entry_path)
+
+    @staticmethod
+    def _remove(entry_path):
+        try:
+            os.remove(entry_path)
+            return True
+        except OSError:
+            return False
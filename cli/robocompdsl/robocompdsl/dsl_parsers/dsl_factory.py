@@ -1,16 +1,23 @@
 import errno
 import os
 import traceback
+from dataclasses import is_dataclass, replace
 from os import path
+from pathlib import Path
 import pyparsing
 
+from robocompdsl.common.profiler import profiler
+from robocompdsl.dsl_parsers.dsl_cache import DSLCache
 from robocompdsl.dsl_parsers.specific_parsers.cdsl.jcdsl_parser import CDSLJsonParser
 from robocompdsl.dsl_parsers.specific_parsers.cdsl.cdsl_parser import CDSLParser
 # from robocompdsl.dsl_parsers.specific_parsers.cdsl.cdsl_ply_parser import CDSLParser
 from robocompdsl.dsl_parsers.specific_parsers.idsl_parser import IDSLParser
+from robocompdsl.dsl_parsers.specific_parsers.idsl.ply_parser.idsl_ply_parser import IDSLPlyParser
 from robocompdsl.dsl_parsers.specific_parsers.smdsl_parser import SMDSLParser
 from robocompdsl.logger import logger
 
+IDSL_PARSERS = {'pyparsing': IDSLParser, 'ply': IDSLPlyParser}
+
 
 class Singleton(object):
     """
@@ -32,10 +39,36 @@ class DSLFactory(Singleton):
     and store in it's cache) the structure representing the dsl file. If from_file method is called again to generate
     and return the same file this will be obtained from the cache unless the "update" parameter is passed to this
     method.
+    The structures are also stored in a persistent cache (see DSLCache) shared between executions, keyed by the
+    content of the file, so unchanged files are not parsed again. It can be disabled with set_persistent_cache(None).
+    IDSL files are parsed with the pyparsing grammar unless the PLY one is selected with set_idsl_parser('ply') or
+    the ROBOCOMPDSL_IDSL_PARSER environment variable.
     """
+    persistent_cache = DSLCache()
+    persistent_dsl_types = ['idsl', 'cdsl', 'smdsl']
+    idsl_parser = os.getenv('ROBOCOMPDSL_IDSL_PARSER', 'pyparsing')
+
     def __init__(self):
         super(DSLFactory, self).__init__()
 
+    def set_persistent_cache(self, cache):
+        """
+        Set the persistent cache used by the factory
+        :param cache: DSLCache instance or None to disable the persistent cache
+        """
+        self.persistent_cache = cache
+
+    def set_idsl_parser(self, name):
+        """
+        Select the parser used for the idsl files
+        :param name: one of the keys of IDSL_PARSERS ('pyparsing' or 'ply')
+        """
+        if name not in IDSL_PARSERS:
+            raise ValueError("Invalid idsl parser '%s'. Valid parsers are %s" % (name, ', '.join(IDSL_PARSERS)))
+        self.idsl_parser = name
+        if hasattr(self, '_parsers'):
+            self._parsers.pop('idsl', None)
+
     def from_string(self, string, dsl_type, **kwargs):
         """
         Return a struct/dict representing constructed from a string representing a dsl with the type dsl_type
@@ -44,7 +77,7 @@ class DSLFactory(Singleton):
         :return: struct/dict containing the information of the dsl contained in the string. This also result the created parser
         """
         # get the parser for the dsl type
-        parser = self.create_parser(dsl_type)
+        parser = self.get_parser(dsl_type)
         # get the result as a dict from the string
         result = parser.string_to_struct(string, **kwargs)
         return result, parser
@@ -59,7 +92,8 @@ class DSLFactory(Singleton):
         """
         if file_path is None:
             return None
-        if file_path is None or not file_path.is_file():
+        file_path = Path(file_path)
+        if not file_path.is_file():
             print("DSLFactory. %s could not be found in Robocomp" % file_path)
             raise IOError(errno.ENOENT, os.strerror(errno.ENOENT), file_path)
         else:
@@ -70,9 +104,6 @@ class DSLFactory(Singleton):
             result = self._cache[file_path]
         else:
             # print("______________________Parsing %s______________" % file_path)
-            if file_path is None or file_path == "":
-                raise IOError(errno.ENOENT, os.strerror(errno.ENOENT), file_path)
-
             # get format from filename
             dsl_type = path.splitext(file_path)[1][1:]
 
@@ -84,22 +115,98 @@ class DSLFactory(Singleton):
                 print("DSLFactory: Error reading input file %s" % file_path)
                 raise
 
-            # get the result from string
+            # get the result from the persistent cache or from string
             try:
-                result, parser = self.from_string(string, dsl_type, **kwargs)
+                with profiler.span(os.path.basename(file_path), 'parse'):
+                    result = self._from_persistent_cache(string, dsl_type, update, **kwargs)
             except (pyparsing.ParseException, ValueError) as e:
                 e.filepath = file_path
                 raise
-
             else:
-                # store the filename in the result
-                result['filename'] = file_path
-                # store the parser with the result in the cache fo the factory
-                self._cache[file_path] = result
+                result = self._store_in_memory(file_path, result)
+        return result
+
+    def cached_struct(self, file_path, string):
+        """
+        Return the struct of a file from the in-memory or the persistent cache, or None if it's not cached.
+        Unlike from_file it has no side effects, so the imports of a cached idsl are not loaded into the IDSLPool.
+        :param string: content of the file, used as the key of the persistent cache
+        """
+        file_path = os.path.abspath(file_path)
+        if file_path in self._cache:
+            return self._cache[file_path]
+        dsl_type = path.splitext(file_path)[1][1:]
+        if self.persistent_cache is None or dsl_type.lower() not in self.persistent_dsl_types:
+            return None
+        parser = self.get_parser(dsl_type)
+        result = self.persistent_cache.get(self.persistent_cache.key(string, dsl_type, parser.version()))
+        if result is None:
+            return None
+        return self._store_in_memory(file_path, result)
+
+    def store_struct(self, file_path, string, struct):
+        """
+        Store in the caches the struct of a file parsed without from_file (i.e. in a worker process)
+        :return: the struct with the filename set, as returned by from_file
+        """
+        file_path = os.path.abspath(file_path)
+        dsl_type = path.splitext(file_path)[1][1:]
+        if self.persistent_cache is not None and dsl_type.lower() in self.persistent_dsl_types:
+            parser = self.get_parser(dsl_type)
+            self.persistent_cache.put(self.persistent_cache.key(string, dsl_type, parser.version()), struct)
+        return self._store_in_memory(file_path, struct)
+
+    def invalidate(self, file_path):
+        """
+        Remove a file from the in-memory cache, so the next from_file reads it again. The persistent cache is keyed
+        by the content of the files, so it doesn't need to be invalidated.
+        :return: True if the file was cached
+        """
+        return self._cache.pop(os.path.abspath(file_path), None) is not None
+
+    def _store_in_memory(self, file_path, result):
+        # store the filename in the result
+        if is_dataclass(result):
+            result = replace(result, filename=file_path)
+        else:
+            result['filename'] = file_path
+        # store the parser with the result in the cache fo the factory
+        self._cache[file_path] = result
         return result
 
-    @staticmethod
-    def create_parser(dsl_type):
+    def _from_persistent_cache(self, string, dsl_type, update=False, **kwargs):
+        """
+        Return the struct for a dsl string looking for it first in the persistent cache. On a miss the string is
+        parsed and the result stored in the cache.
+        """
+        if self.persistent_cache is None or dsl_type.lower() not in self.persistent_dsl_types:
+            result, _ = self.from_string(string, dsl_type, **kwargs)
+            return result
+        parser = self.get_parser(dsl_type)
+        key = self.persistent_cache.key(string, dsl_type, parser.version())
+        if not update:
+            result = self.persistent_cache.get(key)
+            if result is not None:
+                return parser.struct_from_cache(result, **kwargs)
+        result = parser.string_to_struct(string, **kwargs)
+        self.persistent_cache.put(key, result)
+        return result
+
+    def get_parser(self, dsl_type):
+        """
+        Return the shared parser for a specific dsl type. Parsers are created once per factory, so the grammar of
+        each dsl is only built once no matter how many files are parsed.
+        :param dsl_type: type of the dsl to get the parser for
+        :return:
+        """
+        if not hasattr(self, '_parsers'):
+            self._parsers = {}
+        dsl_type = dsl_type.lower()
+        if dsl_type not in self._parsers:
+            self._parsers[dsl_type] = self.create_parser(dsl_type)
+        return self._parsers[dsl_type]
+
+    def create_parser(self, dsl_type):
         """
         Return the corresponding parser for a specific dsl type.
         :param dsl_type: type of the dsl to get the parser for
@@ -110,7 +217,10 @@ class DSLFactory(Singleton):
         elif dsl_type.lower() == 'smdsl':
             return SMDSLParser()
         elif dsl_type.lower() == 'idsl':
-            return IDSLParser()
+            if self.idsl_parser not in IDSL_PARSERS:
+                raise ValueError("Invalid idsl parser '%s'. Valid parsers are %s" % (self.idsl_parser,
+                                                                                     ', '.join(IDSL_PARSERS)))
+            return IDSL_PARSERS[self.idsl_parser]()
         elif dsl_type.lower() == 'jcdsl':
             return CDSLJsonParser()
         else:
@@ -1,4 +1,6 @@
 import abc
+import hashlib
+import inspect
 import os
 
 
@@ -71,6 +73,34 @@ class DSLParserTemplate:
         self.__pyparsing_result = self.parser.parseString(string)
         return self.pyparsing_result
 
+    def release_parse_result(self):
+        """
+        Drop the references to the string and the pyparsing result of the last parse. Parsers converting the result
+        to their own structures call it so the parse tree is not kept alive by the cached parser.
+        """
+        self.__string = None
+        self.__pyparsing_result = None
+
+    @classmethod
+    def version(cls):
+        """
+        Version of the parser used to validate persistently cached structs.
+        By default it's a hash of the source file where the parser is defined, so any change on the grammar or the
+        struct generation invalidates the cached results.
+        """
+        if '_version' not in cls.__dict__:
+            with open(inspect.getfile(cls), 'rb') as source:
+                cls._version = hashlib.sha1(source.read()).hexdigest()
+        return cls._version
+
+    def struct_from_cache(self, struct, **kwargs):
+        """
+        Called when the struct for a dsl has been restored from the persistent cache instead of being parsed.
+        Parsers with side effects while parsing (loading the imported idsls) must reproduce them here.
+        """
+        self.struct = struct
+        return struct
+
     @abc.abstractmethod
     def _create_parser(self):
         """private method to create the parser"""
@@ -0,0 +1,150 @@
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import List, Optional
+
+from robocompdsl.dsl_parsers.dsl_cache import DEFAULT_CACHE_DIR
+from robocompdsl.logger import logger
+
+CATALOG_FORMAT_VERSION = 1
+DEFAULT_CATALOG_FILE = DEFAULT_CACHE_DIR.parent / "idsl_catalog.json"
+
+
+class IDSLCatalog:
+    """
+    Catalog of the idsl files available in a list of include directories.
+    Each directory is listed once and its listing is only refreshed when the mtime of the directory changes, so
+    finding the path of an idsl is a dict lookup instead of trying to open the file in every directory.
+    Directories are searched in the order they are given: if the same file exists in several of them the first one wins.
+    The listings can be saved to a file (see save) and are reused by later executions while the directories don't change.
+    """
+    def __init__(self, directories: Optional[List[Path]] = None, catalog_file: Optional[Path] = None):
+        self.catalog_file = Path(catalog_file) if catalog_file is not None else Path(
+            os.getenv('ROBOCOMPDSL_IDSL_CATALOG', DEFAULT_CATALOG_FILE))
+        self.directories = []
+        self._listings = {}
+        self._files = None
+        self._stored = None
+        if directories:
+            self.set_directories(directories)
+
+    def set_directories(self, directories: List[Path]):
+        """
+        Set the include directories in precedence order. They are listed on the first search.
+        """
+        self.directories = list(directories)
+        self._files = None
+
+    def refresh(self):
+        """
+        List again the directories whose mtime changed since they were listed
+        :return: True if any listing changed
+        """
+        changed = False
+        directories = [directory.absolute() for directory in self.directories]
+        for directory in directories:
+            changed |= self._update_listing(directory)
+        # Listings of directories no longer included are not used
+        for directory in set(self._listings) - set(directories):
+            del self._listings[directory]
+            changed = True
+        if changed or self._files is None:
+            self._files = {}
+            for directory in reversed(directories):
+                self._files.update(self._listings[directory][1])
+        return changed
+
+    def find(self, filename: str) -> Optional[Path]:
+        """
+        Return the path of the idsl filename in the include directories, or None if it doesn't exist.
+        """
+        if self._files is None:
+            self.refresh()
+        path = self._files.get(filename)
+        if path is not None and path.is_file():
+            return path
+        # Missing or removed file. Check if the directories changed since they were listed.
+        if self.refresh():
+            path = self._files.get(filename)
+            if path is not None and path.is_file():
+                return path
+        return None
+
+    def files(self):
+        """
+        :return: dict with the idsl filenames and their paths
+        """
+        if self._files is None:
+            self.refresh()
+        return dict(self._files)
+
+    def _update_listing(self, directory: Path) -> bool:
+        # directory is absolute, so relative include directories are listed again if the working directory changes
+        mtime = self._directory_mtime(directory)
+        if directory in self._listings and self._listings[directory][0] == mtime:
+            return False
+        if self._stored is None:
+            self._stored = self._read_catalog_file()
+        stored = self._stored.get(str(directory))
+        if stored is not None and stored['mtime'] == mtime:
+            listing = {name: Path(path) for name, path in stored['files'].items()}
+        else:
+            listing = self._list_directory(directory) if mtime is not None else {}
+            logger.debug(f"Listed {len(listing)} idsl files in {directory}")
+        self._listings[directory] = (mtime, listing)
+        return True
+
+    @staticmethod
+    def _directory_mtime(directory: Path):
+        try:
+            return directory.stat().st_mtime_ns
+        except OSError:
+            return None
+
+    @staticmethod
+    def _list_directory(directory: Path):
+        listing = {}
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.name.endswith('.idsl'):
+                        listing[entry.name] = Path(entry.path).absolute()
+        except OSError as e:
+            logger.debug(f"Could not list {directory}: {e}")
+        return listing
+
+    def _read_catalog_file(self):
+        try:
+            with open(self.catalog_file, 'r') as reader:
+                stored = json.load(reader)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(stored, dict) or stored.get('version') != CATALOG_FORMAT_VERSION:
+            return {}
+        return {entry['path']: entry for entry in stored.get('directories', [])}
+
+    def save(self, catalog_file: Optional[Path] = None) -> Path:
+        """
+        Write the listings of the current directories to catalog_file (or the default catalog file)
+        :return: the path of the written file
+        """
+        catalog_file = Path(catalog_file) if catalog_file is not None else self.catalog_file
+        self.refresh()
+        content = {
+            'version': CATALOG_FORMAT_VERSION,
+            'directories': [
+                {
+                    'path': str(directory),
+                    'mtime': self._listings[directory][0],
+                    'files': {name: str(path) for name, path in sorted(self._listings[directory][1].items())}
+                }
+                for directory in map(Path.absolute, self.directories) if self._listings[directory][0] is not None
+            ]
+        }
+        catalog_file.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=catalog_file.parent, suffix=".tmp")
+        with os.fdopen(fd, 'w') as writer:
+            json.dump(content, writer, indent=4)
+        os.replace(tmp_path, catalog_file)
+        return catalog_file
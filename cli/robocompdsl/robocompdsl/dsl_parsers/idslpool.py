@@ -1,17 +1,36 @@
 import os
 from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
+from multiprocessing import get_all_start_methods, get_context
 from pathlib import Path
 from typing import Optional, List
 
 import pyparsing
 
+from robocompdsl.common.profiler import profiler
 from robocompdsl.dsl_parsers.parsing_utils import communication_is_ice
 from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idsl_catalog import IDSLCatalog
 from robocompdsl.logger import logger
 
 
 FILE_PATH_DIR = os.path.dirname(os.path.realpath(__file__))
 ALT_INTERFACES_DIR = Path(FILE_PATH_DIR) / "../../../../../interfaces/IDSLs/"
+# minimum number of idsl files to parse in the same level of imports to start worker processes
+PARALLEL_PARSE_MIN_FILES = 4
+
+
+def _parse_idsl_string(string):
+    """
+    Parse an idsl in a worker process without loading its imports. None is returned if it fails, so the file is parsed
+    again in the main process to raise the error.
+    """
+    try:
+        return DSLFactory().get_parser('idsl').string_to_struct(string, resolve_imports=False)
+    except Exception:
+        return None
 
 
 class IDSLPool(OrderedDict):
@@ -20,6 +39,10 @@ class IDSLPool(OrderedDict):
     idsl is the idsl filename or path
     module is the python structure loaded from an idsl file
     interfaces are the names defined for the communication inside idsl files and loaded in the modules.
+    The pool keeps an index of interface names and type names to the modules defining them. It's updated each time
+    a module is stored, so queries like module_providing_interface don't need to walk all the loaded modules.
+    The idsl files are located in the include directories through an IDSLCatalog. Directories added later take
+    precedence, so the -I directories are searched before ROBOCOMP_INTERFACES and this one before the common dirs.
     """
     mandatory_idsls = ["CommonBehavior.idsl"]
 
@@ -29,13 +52,22 @@ class IDSLPool(OrderedDict):
 
     def __init__(self) -> None:
         super(IDSLPool, self).__init__()
+        self._interfaces_index = {}
+        self._types_index = {}
+        self._type_modules = {}
+        self._module_types = {}
+        self._accessed_modules = None
+        # processes used to parse the idsl files of each level of imports
+        self.jobs = 1
         self.include_directories = []
-        self.update_directories(self.common_idsl_dirs + self.idsl_dir_in_env())
+        self.catalog = IDSLCatalog()
+        self.update_directories(self.idsl_dir_in_env() + self.common_idsl_dirs)
 
     def update_directories(self, directories: List) -> List:
         if any(not isinstance(d, Path) for d in directories):
             raise TypeError(f"Directories must be a list of Path objects. {directories} given")
-        self.include_directories = list(set(directories + self.include_directories))
+        self.include_directories = list(OrderedDict.fromkeys(directories + self.include_directories))
+        self.catalog.set_directories(self.include_directories)
         logger.debug(f"Updated directories with {directories}: {self.include_directories}")
         return self.include_directories
 
@@ -52,52 +84,145 @@ class IDSLPool(OrderedDict):
         logger.debug(f"Adding idsl {filename} to the pool")
         module_name = filename.split('.')[0]
         if module_name not in self:
-            for p in self.include_directories:
-                try:
-                    path = p / filename
-                    logger.debug(f"Trying with {path}")
-
-                    # if found, load the module from the file
-                    module = DSLFactory().from_file(path)
-                    # store the module
-                    self[module_name] = module
-                    # try to add the modules that this one imports
-                    aux_imports = []
-                    for i_import in module['imports']:
-                        if i_import != '' and i_import not in self:
-                            if communication_is_ice(i_import):
-                                aux_imports.append(i_import)
-                    self.update_with_idsls(aux_imports)
-                    return module
-                except IOError as e:
-                    logger.debug(f"File {filename} not found in {p} with error {e}")
-                    pass
-            if module_name not in self:
-                raise ValueError('Couldn\'t locate %s ' % filename)
-            logger.debug(f"Tryied to add {filename} to the pool but not found in {self.include_directories}")
+            self.load_idsls([filename])
+        return self[module_name]
 
-        else:
-            return self[module_name]
+    def _candidate_paths(self, filename: str) -> List[Path]:
+        """
+        Return the paths where the idsl filename could be found, in order of precedence.
+        """
+        if os.sep in filename:
+            # Relative paths can't be resolved with the catalog of each directory
+            return [p / filename for p in self.include_directories]
+        path = self.catalog.find(filename)
+        if path is None:
+            logger.debug(f"{filename} not found in the catalog of {self.include_directories}")
+            return []
+        return [path]
 
     def update_with_idsls(self, files: List[str]):
         """
-        Recursively add the already loaded idsl modules to the pool.
+        Add the idsl files and all the files they import to the pool.
 
         :param files: list of idsl files to be included in the pool (file.idsl)
+        :return: the files imported by the given ones, stored as recursive_imports of the modules
         """
         if len(files) == 0:
             return
         logger.debug(f"Looking for {files} in {self.include_directories}")
-        recursive_imports = []
-        for f in files:
-            if f not in self:
-                module = self.add_idsl(f)
-                for i_import in module['imports']:
-                    if i_import != '' and i_import not in self:
-                        if communication_is_ice(i_import):
-                            recursive_imports.append(i_import)
-        return recursive_imports
+        self.load_idsls(files)
+        return self._second_level_imports(files, lambda module_name: dict.get(self, module_name))
+
+    def load_idsls(self, files: List[str]):
+        """
+        Load the idsl files and the ones they import, directly or not, into the pool.
+        The imports are walked breadth first. The files of each level not found in the caches of the DSLFactory are
+        parsed together, in self.jobs worker processes when there are enough of them. The modules are stored when
+        all of them are loaded, in the same order and with the same recursive_imports they would have if every file
+        loaded its imports while being parsed: the imported modules before the modules importing them. The
+        recursive_imports of the cached modules are computed again from the current files.
+        """
+        modules = {}
+        parsed = {}
+        level = [filename for filename in files if filename != '']
+        depth = 0
+        while level:
+            with profiler.span(f"imports level {depth}", 'idsl pool', files=len(level)):
+                to_parse = []
+                loaded = []
+                for filename in level:
+                    module_name = filename.split('.')[0]
+                    if module_name in self or module_name in modules or module_name in loaded:
+                        continue
+                    loaded.append(module_name)
+                    path = self._locate(filename)
+                    with open(path, 'r') as reader:
+                        string = reader.read()
+                    module = DSLFactory().cached_struct(path, string)
+                    if module is None:
+                        to_parse.append((module_name, path, string))
+                    else:
+                        modules[module_name] = module
+                for (module_name, path, string), module in zip(to_parse, self._parse_idsls(to_parse)):
+                    modules[module_name] = module
+                    parsed[module_name] = (path, string)
+                level = [imported for module_name in loaded for imported in modules[module_name]['imports']
+                         if imported != '' and communication_is_ice(imported)]
+            depth += 1
+
+        def get_module(module_name):
+            return modules[module_name] if module_name in modules else dict.get(self, module_name)
 
+        # the cached modules are recomputed too, as the files they import could have changed their own imports
+        for module_name in list(modules):
+            recursive_imports = tuple(self._second_level_imports(modules[module_name]['imports'], get_module))
+            if module_name in parsed:
+                path, string = parsed[module_name]
+                modules[module_name] = DSLFactory().store_struct(
+                    path, string, replace(modules[module_name], recursive_imports=recursive_imports))
+            elif modules[module_name]['recursive_imports'] != recursive_imports:
+                modules[module_name] = replace(modules[module_name], recursive_imports=recursive_imports)
+
+        stored = set()
+
+        def store(module_name):
+            if module_name in stored or module_name not in modules:
+                return
+            stored.add(module_name)
+            for imported in modules[module_name]['imports']:
+                if imported != '':
+                    store(imported.split('.')[0])
+            self[module_name] = modules[module_name]
+
+        for filename in files:
+            store(filename.split('.')[0])
+
+    @staticmethod
+    def _second_level_imports(files, get_module):
+        """
+        Return the files imported by the modules of the files, in order and with repetitions
+        :param get_module: function returning the module for a module name, without recording the access
+        """
+        imports = []
+        for filename in files:
+            module = get_module(filename.split('.')[0])
+            if module is None:
+                continue
+            imports.extend(imported for imported in module['imports']
+                           if imported != '' and communication_is_ice(imported))
+        return imports
+
+    def _locate(self, filename):
+        for path in self._candidate_paths(filename):
+            if Path(path).is_file():
+                return path
+            logger.debug(f"File {filename} not found in {path}")
+        raise ValueError('Couldn\'t locate %s ' % filename)
+
+    def _parse_idsls(self, to_parse):
+        """
+        Parse the (module name, path, content) idsl files without loading their imports, in worker processes if
+        self.jobs allows it. Files failing in a worker are parsed again here to raise the error.
+        """
+        results = [None] * len(to_parse)
+        if self.jobs > 1 and len(to_parse) >= PARALLEL_PARSE_MIN_FILES and 'fork' in get_all_start_methods():
+            # the grammar is built before forking so the workers don't build it again
+            DSLFactory().get_parser('idsl').parser
+            with profiler.span(f"{len(to_parse)} idsl files in {self.jobs} processes", 'parse'):
+                with ProcessPoolExecutor(max_workers=min(self.jobs, len(to_parse)),
+                                         mp_context=get_context('fork')) as executor:
+                    results = list(executor.map(_parse_idsl_string, [string for _, _, string in to_parse]))
+        return [module if module is not None else self._parse_idsl(path, string)
+                for (_, path, string), module in zip(to_parse, results)]
+
+    @staticmethod
+    def _parse_idsl(path, string):
+        try:
+            with profiler.span(os.path.basename(path), 'parse'):
+                return DSLFactory().get_parser('idsl').string_to_struct(string, resolve_imports=False)
+        except (pyparsing.ParseException, ValueError) as e:
+            e.filepath = str(path)
+            raise
 
     def idsl_file_for_module(self, idsl_name):
         """
@@ -118,15 +243,94 @@ class IDSLPool(OrderedDict):
         :return: the module providing the queried interface
         """
         self._initialice_mandatory_modules()
-        logger.debug(f"Looking for {interface} in {list(self.keys())}")
-        for module in self:
-            logger.debug(f"Module {module} has {len(self[module]['interfaces'])} interfaces")
-            for m in self[module]['interfaces']:
-                if m['name'] == interface:
-                    logger.debug(f"Found {interface} in {module} ({self[module]['filename']}")
-                    return self[module]
-        logger.warning(f"Couldn't find any module providing {interface}")
-        return None
+        try:
+            return self[self._interfaces_index[interface]]
+        except KeyError:
+            logger.warning(f"Couldn't find any module providing {interface}")
+            return None
+
+    def kind_of_type(self, vtype, module_name=None):
+        """
+        Query the pool to get the kind (struct, sequence, dictionary, enum, exception) of a type
+        :param vtype: name of the type without the module part
+        :param module_name: name of the pool module where the type must be defined. Any module if None.
+        :return: the kind of the type or None if it's not found
+        """
+        if module_name is None:
+            self._record_access(self._type_modules.get(vtype))
+            return self._types_index.get(vtype)
+        self._record_access(module_name)
+        return self._module_types.get(module_name, {}).get(vtype)
+
+    @contextmanager
+    def track_accesses(self):
+        """
+        Context manager returning the set of the names of the modules read from the pool (by name, interface or type)
+        inside the with block. Used to know which idsl files each generated file depends on.
+        """
+        previous = self._accessed_modules
+        self._accessed_modules = set()
+        try:
+            yield self._accessed_modules
+        finally:
+            accessed = self._accessed_modules
+            self._accessed_modules = previous
+            if previous is not None:
+                previous.update(accessed)
+
+    def _record_access(self, module_name):
+        if self._accessed_modules is not None and module_name is not None:
+            self._accessed_modules.add(module_name)
+
+    def __setitem__(self, module_name, module):
+        reindex = module_name in self
+        super(IDSLPool, self).__setitem__(module_name, module)
+        if reindex:
+            self._rebuild_indexes()
+        else:
+            self._index_module(module_name, module)
+
+    def __delitem__(self, module_name):
+        super(IDSLPool, self).__delitem__(module_name)
+        self._rebuild_indexes()
+
+    # OrderedDict implements these without calling __setitem__ or __delitem__
+    def pop(self, module_name, *default):
+        module = super(IDSLPool, self).pop(module_name, *default)
+        self._rebuild_indexes()
+        return module
+
+    def popitem(self, last=True):
+        item = super(IDSLPool, self).popitem(last)
+        self._rebuild_indexes()
+        return item
+
+    def clear(self):
+        super(IDSLPool, self).clear()
+        self._rebuild_indexes()
+
+    def update(self, *args, **kwargs):
+        for module_name, module in dict(*args, **kwargs).items():
+            self[module_name] = module
+
+    def _index_module(self, module_name, module):
+        # The first module loaded defining a name is the one returned, as when walking the modules in order
+        for interface in module['interfaces']:
+            self._interfaces_index.setdefault(interface['name'], module_name)
+        module_types = {}
+        for idsl_type in module['types']:
+            module_types.setdefault(idsl_type['name'], idsl_type['type'])
+            self._types_index.setdefault(idsl_type['name'], idsl_type['type'])
+            self._type_modules.setdefault(idsl_type['name'], module_name)
+        self._module_types[module_name] = module_types
+
+    def _rebuild_indexes(self):
+        self._interfaces_index = {}
+        self._types_index = {}
+        self._type_modules = {}
+        self._module_types = {}
+        for module_name, module in self.items():
+            self._index_module(module_name, module)
 
     def module_inteface_check(self):
         for module in self:
@@ -172,7 +376,9 @@ class IDSLPool(OrderedDict):
     def __getitem__(self, item):
         if len(self) == 0:
             self._initialice_mandatory_modules()
-        return super().__getitem__(item)
+        module = super().__getitem__(item)
+        self._record_access(item)
+        return module
 
     def _initialice_mandatory_modules(self):
         if len(self) == 0:
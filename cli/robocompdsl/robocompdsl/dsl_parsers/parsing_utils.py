@@ -130,23 +130,25 @@ def decorator_and_type_to_const_ampersand(decorator, vtype, module_pool, cpp11=F
 def get_kind_from_pool(vtype, module_pool, debug=False):
     logger.debug(vtype)
     split = vtype.split("::")
-    logger.debug(split)
     if len(split) > 1:
         vtype = split[1]
         mname = split[0]
         logger.debug('SPLIT (' + vtype+'), (' + mname + ')')
-        if mname in module_pool:
-            logger.debug('dentro SPLIT (' + vtype+'), (' + mname + ')')
-            r = get_type_from_module(vtype, module_pool[mname])
-            if r is not None: return r
+        candidates = [mname]
         if mname.startswith("RoboComp"):
-            if mname[8:] in module_pool:
-                r = get_type_from_module(vtype, module_pool[mname[8:]])
+            candidates.append(mname[8:])
+        for candidate in candidates:
+            if candidate in module_pool:
+                if hasattr(module_pool, 'kind_of_type'):
+                    r = module_pool.kind_of_type(vtype, candidate)
+                else:
+                    r = get_type_from_module(vtype, module_pool[candidate])
                 if r is not None: return r
     else:
         logger.debug('no split')
+        if hasattr(module_pool, 'kind_of_type'):
+            return module_pool.kind_of_type(vtype)
         for module in module_pool:
-            logger.debug('  '+str(module))
             r = get_type_from_module(vtype, module_pool[module])
             if r is not None: return r
 
@@ -156,4 +158,3 @@ def get_type_from_module(vtype, module):
         if t['name'] == vtype:
             return t['type']
     return None
-
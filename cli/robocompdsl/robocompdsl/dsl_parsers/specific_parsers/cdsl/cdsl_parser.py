@@ -1,3 +1,5 @@
+import hashlib
+import inspect
 import os
 from operator import itemgetter
 
@@ -26,6 +28,16 @@ class CDSLParser(DSLParserTemplate):
         assert isinstance(dir_list, list)
         self._include_directories = dir_list
 
+    @classmethod
+    def version(cls):
+        # The cached structs are pickled ComponentFacade instances, so the facade is also part of the version
+        if '_version' not in cls.__dict__:
+            hasher = hashlib.sha1()
+            for module in (inspect.getmodule(cls), componentfacade):
+                with open(inspect.getfile(module), 'rb') as source:
+                    hasher.update(source.read())
+            cls._version = hasher.hexdigest()
+        return cls._version
 
     def _create_parser(self):
         OBRACE, CBRACE, SEMI, OPAR, CPAR = list(map(Suppress, "{};()"))
@@ -34,10 +46,13 @@ class CDSLParser(DSLParserTemplate):
         # keywords
         (IMPORT, COMMUNICATIONS, LANGUAGE, COMPONENT, CPP, CPP11, GUI, QWIDGET, QMAINWINDOW, QDIALOG, QT,
          PYTHON, REQUIRES, IMPLEMENTS, SUBSCRIBESTO, PUBLISHES, OPTIONS, TRUE, FALSE,
-         INNERMODELVIEWER, STATEMACHINE, VISUAL, AGMAGENT, AGM2AGENT, AGM2AGENTICE, DSR, ICE, ROS) = list(map(CaselessKeyword, """
+         INNERMODELVIEWER, STATEMACHINE, VISUAL, AGMAGENT, AGM2AGENT, AGM2AGENTICE, DSR, ICE, ROS,
+         PRECOMPILEDSLICES, FASTSEQUENCES, NUMPYHELPERS, ASYNCPROXIES, BATCHPUBLISH, COMPUTESCHEDULER,
+         SERVANTMETRICS) = list(map(CaselessKeyword, """
         import communications language component cpp cpp11 gui QWidget QMainWindow QDialog Qt 
         python requires implements subscribesTo publishes options true false
-        InnerModelViewer statemachine visual agmagent agm2agent agm2agentice dsr ice ros""".split()))
+        InnerModelViewer statemachine visual agmagent agm2agent agm2agentice dsr ice ros
+        PrecompiledSlices FastSequences NumpyHelpers AsyncProxies BatchPublish ComputeScheduler ServantMetrics""".split()))
 
         identifier = Word(alphas + "_", alphanums + "_")
         PATH = CharsNotIn("\";")
@@ -77,7 +92,10 @@ class CDSLParser(DSLParserTemplate):
         gui_options = (QWIDGET | QMAINWINDOW | QDIALOG)
         gui = Group(Optional(GUI.suppress() - QT('type') + OPAR - gui_options('widget') - CPAR + SEMI))
         # additional options
-        valid_options = INNERMODELVIEWER | AGMAGENT | DSR
+        # BatchPublish can be followed by the published topics to batch, all of them by default
+        batch_publish = Group(BATCHPUBLISH + Optional(OPAR - delimitedList(identifier) - CPAR))
+        valid_options = INNERMODELVIEWER | AGMAGENT | DSR | PRECOMPILEDSLICES | FASTSEQUENCES | NUMPYHELPERS | ASYNCPROXIES \
+                        | COMPUTESCHEDULER | SERVANTMETRICS | batch_publish
         options = Group(Optional(OPTIONS.suppress() - delimitedList(valid_options)) + SEMI)
         statemachine = Group(
             Optional(STATEMACHINE.suppress() - QUOTE + CharsNotIn("\";").setResultsName('machine_path') + QUOTE + Optional(VISUAL.setResultsName('visual').setParseAction(lambda t: True)) + SEMI))
@@ -104,9 +122,13 @@ class CDSLParser(DSLParserTemplate):
         component = componentfacade.ComponentFacade()
         # Set options
         component.options = []
+        component.batchTopics = []
 
         if "options" in parsing_result['component']['content']:
             for op in parsing_result['component']['content']['options']:
+                if not isinstance(op, str):
+                    # Option with arguments
+                    op, component.batchTopics = op[0], list(op[1:])
                 component.options.append(op.lower())
 
 
@@ -181,6 +203,11 @@ class CDSLParser(DSLParserTemplate):
                     else:
                         component.rosInterfaces.append(interface)
                         component.usingROS = True
+        for topic in component.batchTopics:
+            if topic not in [interface.name for interface in component.publishes]:
+                raise ValueError(f"BatchPublish topic {topic} is not published by the component")
+        if 'computescheduler' in component.options and component.statemachine_path is not None:
+            raise ValueError("ComputeScheduler can't be used with a statemachine, compute() is run by its states")
         # Handle options for communications
         if component.is_agm_agent():
             component.iceInterfaces += [['AGMCommonBehavior', 'ice'], ['AGMExecutive', 'ice'], ['AGMExecutiveTopic', 'ice'], ['AGMWorldModel', 'ice']]
@@ -194,6 +221,14 @@ class CDSLParser(DSLParserTemplate):
         logger.debug(f"Component created: {component.name}")
         return component
 
+    def struct_from_cache(self, struct, **kwargs):
+        if "include_directories" in kwargs:
+            self.include_directories = kwargs["include_directories"]
+        from robocompdsl.dsl_parsers.idslpool import idsl_pool
+        # the imported idsl files could have changed their own imports since the component was cached
+        struct.recursiveImports = idsl_pool.update_with_idsls(list(struct.imports))
+        return super(CDSLParser, self).struct_from_cache(struct, **kwargs)
+
     def __str__(self):
         if self.struct is not None:
             struct_str = ""
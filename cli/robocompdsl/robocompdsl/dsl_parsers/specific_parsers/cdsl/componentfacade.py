@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from abc import ABC
 
 from robocompdsl.logger import logger
+from robocompdsl.dsl_parsers.parsing_utils import communication_is_ice
 
 
 # class ComponentFacade(dict):
@@ -214,11 +215,11 @@ class ComponentFacade:
                 value = new_class(value)
         super(ComponentFacade, self).__setattr__(key, value)
 
-    # TODO: bad idea to import and make the check each time we access the property
+    # The check of the interfaces is only done the first time the property is accessed
     @property
     def idsl_pool(self):
-        if hasattr(self, '__idsl_pool'):
-            return self.__idsl_pool
+        if '_idsl_pool' in self.__dict__:
+            return self._idsl_pool
         else:
             interface_list = self.requires + self.implements + self.subscribesTo + \
                              self.publishes
@@ -228,20 +229,39 @@ class ComponentFacade:
                 if not idsl_pool.module_providing_interface(interface_required.name):
                     logger.error(f"Interface {interface_required.name} not found in any module in the IDSL pool {idsl_pool.interfaces()} {list(idsl_pool.keys())}")
                     raise rcExceptions.InterfaceNotFound(interface_required.name, idsl_pool.interfaces())
-            self.__idsl_pool = idsl_pool
+            self._idsl_pool = idsl_pool
             return idsl_pool
 
     @property
     def statemachine(self):
-        if not hasattr(self, '__statemachine'):
+        if '_statemachine' not in self.__dict__:
             from ...dsl_factory import DSLFactory
-            self.__statemachine = DSLFactory().from_file(self.statemachine_path)
-        return self.__statemachine
+            self._statemachine = DSLFactory().from_file(self.statemachine_path)
+        return self._statemachine
 
     def is_agm_agent(self):
         #TODO: check if options exists
         return self.options.agmagent
 
+    @property
+    def batched_publishes(self):
+        """
+        Names of the published topics sent in batches: the ones given to the BatchPublish option, all if none is given
+        """
+        if not self.options.batchpublish:
+            return []
+        topics = getattr(self, 'batchTopics', [])
+        return [interface.name for interface in self.publishes
+                if communication_is_ice(interface) and (not topics or interface.name in topics)]
+
+    @property
+    def compute_scheduler(self):
+        """
+        Whether compute() is run by the generated scheduler. The CDSLParser rejects the option for components with
+        their own state machine, which schedule it there.
+        """
+        return self.options.computescheduler and self.statemachine_path is None
+
     @property
     def ice_interfaces_names(self):
         names = []
@@ -268,6 +288,9 @@ class ComponentFacade:
         if not isinstance(other, ComponentFacade):
             return False
         for attr in self.__dict__:
+            if attr in ('_idsl_pool', '_statemachine'):
+                # values cached by the properties
+                continue
             if hasattr(other, attr):
                 equal = equal and getattr(self, attr) == getattr(other, attr)
             else:
@@ -0,0 +1,193 @@
+"""
+Classes of the structure returned by the IDSL parsers.
+
+They are frozen dataclasses with __slots__, so every parsed module takes much less memory than the nested dicts and
+pyparsing results used before, and the attributes can be used directly (method.params, struct.name...). To keep the
+templates and the rest of the code working, every node can also be read as a read-only mapping with the keys of the
+old dicts (method['return'], module['interfaces']...). Optional values set to None are missing keys in the mapping.
+"""
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass, fields
+from typing import Dict, Optional, Tuple, Union
+
+
+class IDSLNode(Mapping):
+    """
+    Base of the IDSL nodes. Subclasses must be frozen dataclasses declaring their fields in __slots__.
+    """
+    __slots__ = ()
+    # mapping key of the fields whose name can't be the key
+    _key_aliases = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        aliases = {field: key for key, field in cls._key_aliases.items()}
+        cls._field_keys = tuple((field, aliases.get(field, field)) for field in cls.__slots__)
+        cls._key_fields = {key: field for field, key in cls._field_keys}
+
+    def __getitem__(self, key):
+        try:
+            value = getattr(self, self._key_fields[key])
+        except (KeyError, TypeError):
+            raise KeyError(key) from None
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self):
+        for field, key in self._field_keys:
+            if getattr(self, field) is not None:
+                yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __reduce__(self):
+        # frozen instances with __slots__ can't be restored with the default pickle protocol in all python versions
+        return self.__class__, tuple(getattr(self, f.name) for f in fields(self))
+
+    def to_dict(self):
+        """
+        Return the node as the nested dicts and lists returned by the parsers before these classes existed
+        """
+        return OrderedDict((key, _to_plain(value)) for key, value in self.items())
+
+
+def _to_plain(value):
+    if isinstance(value, IDSLNode):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return OrderedDict((key, _to_plain(item)) for key, item in value.items())
+    if isinstance(value, (tuple, list)):
+        return [_to_plain(item) for item in value]
+    return value
+
+
+@dataclass(frozen=True)
+class IDSLParam(IDSLNode):
+    __slots__ = ('decorator', 'type', 'name')
+    # 'out' or 'none'
+    decorator: str
+    type: str
+    name: str
+
+
+@dataclass(frozen=True)
+class IDSLMethod(IDSLNode):
+    __slots__ = ('name', 'decorator', 'return_type', 'params', 'throws')
+    _key_aliases = {'return': 'return_type'}
+    name: str
+    # 'idempotent' or ''
+    decorator: str
+    return_type: str
+    params: Tuple[IDSLParam, ...]
+    # exceptions and separators as written in the idsl, or 'nothing'
+    throws: Union[Tuple[str, ...], str]
+
+
+@dataclass(frozen=True)
+class IDSLInterface(IDSLNode):
+    __slots__ = ('name', 'methods')
+    name: str
+    # methods sorted by name
+    methods: Dict[str, IDSLMethod]
+
+
+@dataclass(frozen=True)
+class IDSLStructMember(IDSLNode):
+    __slots__ = ('type', 'identifier', 'defaultValue')
+    type: str
+    identifier: str
+    defaultValue: Optional[str]
+
+    def to_list(self):
+        return [self.type, self.identifier] + ([self.defaultValue] if self.defaultValue is not None else [])
+
+
+@dataclass(frozen=True)
+class IDSLStruct(IDSLNode):
+    __slots__ = ('type', 'name', 'structIdentifiers')
+    type: str
+    name: str
+    structIdentifiers: Tuple[IDSLStructMember, ...]
+
+
+@dataclass(frozen=True)
+class IDSLSequence(IDSLNode):
+    __slots__ = ('type', 'name', 'typeSequence')
+    type: str
+    name: str
+    typeSequence: str
+
+
+@dataclass(frozen=True)
+class IDSLContentType(IDSLNode):
+    """
+    Enums, exceptions and dictionaries. Their content is kept as written in the idsl.
+    """
+    __slots__ = ('type', 'name', 'content')
+    type: str
+    name: str
+    content: str
+
+
+@dataclass(frozen=True)
+class IDSLTypeReference(IDSLNode):
+    """
+    Entries of simpleStructs and simpleSequences: the name of the module and the name of the type in strName.
+    """
+    __slots__ = ('name', 'strName')
+    name: str
+    strName: str
+
+
+@dataclass(frozen=True)
+class IDSLModule(IDSLNode):
+    """
+    An idsl file. The structs and sequences are also in types, with their names prefixed by the name of the module
+    ("RoboCompModule/Type") in structs and sequences.
+    """
+    __slots__ = ('name', 'imports', 'recursive_imports', 'interfaces', 'types', 'sequences', 'simpleSequences',
+                 'structs', 'simpleStructs', 'filename')
+    name: str
+    imports: Tuple[str, ...]
+    recursive_imports: Tuple[str, ...]
+    interfaces: Tuple[IDSLInterface, ...]
+    types: Tuple[Union[IDSLStruct, IDSLSequence, IDSLContentType], ...]
+    sequences: Tuple[IDSLSequence, ...]
+    simpleSequences: Tuple[IDSLTypeReference, ...]
+    structs: Tuple[IDSLStruct, ...]
+    simpleStructs: Tuple[IDSLTypeReference, ...]
+    # set by the DSLFactory when the module is read from a file
+    filename: Optional[str]
+
+    def to_dict(self):
+        result = super(IDSLModule, self).to_dict()
+        # the members of the structs in 'structs' were lists, not dicts
+        for struct, struct_dict in zip(self.structs, result['structs']):
+            struct_dict['structIdentifiers'] = [member.to_list() for member in struct.structIdentifiers]
+        return result
+
+
+def module_from_contents(name, imports, recursive_imports, interfaces, contents):
+    """
+    Build an IDSLModule from the parsed interfaces and the list of type definitions of the module.
+    :param interfaces: list of IDSLInterface
+    :param contents: list of IDSLStruct, IDSLSequence and IDSLContentType in the order of the idsl file
+    """
+    contents = tuple(contents)
+    sequences = tuple(content for content in contents if content.type == 'sequence')
+    structs = tuple(content for content in contents if content.type == 'struct')
+    return IDSLModule(
+        name=name,
+        imports=tuple(imports),
+        recursive_imports=tuple(recursive_imports or ()),
+        interfaces=tuple(interfaces),
+        types=contents,
+        sequences=tuple(IDSLSequence(s.type, name + "/" + s.name, s.typeSequence) for s in sequences),
+        simpleSequences=tuple(IDSLTypeReference(name, s.name) for s in sequences),
+        structs=tuple(IDSLStruct(s.type, name + "/" + s.name, s.structIdentifiers) for s in structs),
+        simpleStructs=tuple(IDSLTypeReference(name, s.name) for s in structs),
+        filename=None,
+    )
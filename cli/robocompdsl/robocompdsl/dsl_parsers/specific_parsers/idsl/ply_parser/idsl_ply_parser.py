@@ -0,0 +1,108 @@
+import hashlib
+import inspect
+import os
+from operator import itemgetter
+from pathlib import Path
+
+import ply
+
+from robocompdsl.dsl_parsers.dsl_cache import DEFAULT_CACHE_DIR
+from robocompdsl.dsl_parsers.specific_parsers.idsl import idsl_ast
+from robocompdsl.dsl_parsers.specific_parsers.idsl.idsl_ast import IDSLContentType, IDSLInterface, IDSLMethod, \
+    IDSLParam, IDSLSequence, IDSLStruct, IDSLStructMember, module_from_contents
+from robocompdsl.dsl_parsers.specific_parsers.idsl.ply_parser import ply_parser_lex, ply_parser_yacc
+from robocompdsl.dsl_parsers.specific_parsers.idsl.ply_parser.ply_parser_yacc import IDSLYaccParser
+from robocompdsl.dsl_parsers.specific_parsers.idsl_parser import IDSLParser
+from robocompdsl.logger import logger
+
+
+class IDSLPlyParser(IDSLParser):
+    """
+    IDSL parser using the PLY LALR grammar instead of the pyparsing one. The resulting struct is the same returned by
+    IDSLParser. The parse tables are generated once and stored in the tables_dir (by default in the parsetab
+    directory of the dsl cache), so they are only rebuilt when the grammar changes.
+    """
+    def __init__(self, tables_dir=None):
+        super(IDSLPlyParser, self).__init__()
+        self.tables_dir = Path(tables_dir) if tables_dir is not None else Path(
+            os.getenv('ROBOCOMPDSL_CACHE_DIR', DEFAULT_CACHE_DIR)) / "parsetab"
+
+    @classmethod
+    def version(cls):
+        if '_version' not in cls.__dict__:
+            hasher = hashlib.sha1(ply.__version__.encode('utf-8'))
+            for module in (ply_parser_lex, ply_parser_yacc, idsl_ast, inspect.getmodule(cls)):
+                with open(inspect.getfile(module), 'rb') as source:
+                    hasher.update(source.read())
+            cls._version = hasher.hexdigest()
+        return cls._version
+
+    def tables_file(self):
+        return self.tables_dir / f"idsl_{self.version()[:16]}.pickle"
+
+    def _create_parser(self):
+        tables_file = self.tables_file()
+        if tables_file.is_file():
+            try:
+                return IDSLYaccParser(tables_file)
+            except Exception as e:
+                logger.debug(f"Discarding invalid idsl parse tables {tables_file}: {e}")
+        try:
+            tables_file.parent.mkdir(parents=True, exist_ok=True)
+        except OSError as e:
+            logger.debug(f"Could not create {tables_file.parent}: {e}")
+            return IDSLYaccParser()
+        # Written to a temporary file and then renamed so other processes never read incomplete tables
+        tmp_file = tables_file.with_name(f"{tables_file.name}.{os.getpid()}.tmp")
+        parser = IDSLYaccParser(tmp_file)
+        try:
+            os.replace(tmp_file, tables_file)
+        except OSError as e:
+            logger.debug(f"Could not write the idsl parse tables {tables_file}: {e}")
+        return parser
+
+    def string_to_struct(self, string, **kwargs):
+        logger.debug("Parsing IDSL with PLY")
+        parsing_result = self.parse_string(string)
+        self.include_directories = kwargs.get("include_directories", [])
+        logger.debug(f"\twith include_directories: {self.include_directories}")
+        name = parsing_result['name']
+        logger.debug(f"\twith name: {name}")
+
+        imports = list(parsing_result['imports'])
+        recursive_imports = []
+        if imports and kwargs.get('resolve_imports', True):
+            logger.debug(f"\twith imports: {imports}")
+            from robocompdsl.dsl_parsers.idslpool import idsl_pool
+            recursive_imports = idsl_pool.update_with_idsls(list(imports))
+            logger.debug(f"\twith recursive_imports: {recursive_imports}")
+
+        # INTERFACES AND TYPES DEFINED IN THE MODULE
+        interfaces = []
+        types = []
+        for content_def in parsing_result['contents']:
+            if content_def['type'] == 'interface':
+                methods = {}
+                for method in sorted(content_def['methods'], key=itemgetter('name')):
+                    methods[method['name']] = IDSLMethod(
+                        name=method['name'],
+                        decorator=method.get('decorator', ''),
+                        return_type=method['ret'],
+                        params=tuple(IDSLParam(param.get('decorator', 'none'), param['type'], param['name'])
+                                     for param in method['params']),
+                        throws=tuple(method['raise']) if 'raise' in method else 'nothing')
+                interfaces.append(IDSLInterface(content_def['name'], methods))
+            elif content_def['type'] == 'struct':
+                members = tuple(IDSLStructMember(member['type'], member['identifier'], member.get('defaultValue'))
+                                for member in content_def['structIdentifiers'])
+                types.append(IDSLStruct(content_def['type'], content_def['name'], members))
+            elif content_def['type'] == 'sequence':
+                types.append(IDSLSequence(content_def['type'], content_def['name'], content_def['typeSequence']))
+            else:
+                types.append(IDSLContentType(content_def['type'], content_def['name'], content_def['content']))
+        logger.debug(f"\twith {len(interfaces)} interfaces")
+
+        result = module_from_contents(name, imports, recursive_imports, interfaces, types)
+        self.release_parse_result()
+        self.struct = result
+        return result
@@ -0,0 +1,226 @@
+import re
+
+import ply.lex as lex
+from pyparsing import ParseException
+
+# Same comments ignored by the pyparsing grammar (cppStyleComment)
+COMMENT = r'/\*(?:[^*]|\*(?!/))*\*/|//(?:\\\n|[^\n])*'
+LEADING_COMMENTS = re.compile(r'(?:\s*(?:%s))+' % COMMENT)
+LEADING_EQUALS = re.compile(r'(?:\s*(?:%s))*\s*=+' % COMMENT)
+
+
+def skip_leading_comments(text):
+    """
+    Remove the comments (and the whitespace before them) at the beginning of text but not the whitespace after them.
+    That's what the pyparsing grammar does before the raw content of enums, exceptions, dictionaries and default
+    values, so the contents are kept identical.
+    """
+    match = LEADING_COMMENTS.match(text)
+    if match:
+        return text[match.end():]
+    return text
+
+
+class IDSLLexer(object):
+    reserved = {
+        'import': 'IMPORT',
+        'module': 'MODULE',
+        'struct': 'STRUCT',
+        'enum': 'ENUM',
+        'exception': 'EXCEPTION',
+        'dictionary': 'DICTIONARY',
+        'sequence': 'SEQUENCE',
+        'interface': 'INTERFACE',
+        'throws': 'THROWS',
+        'idempotent': 'IDEMPOTENT',
+        'out': 'OUT',
+    }
+
+    # As in the pyparsing grammar, the reserved words are only keywords where the grammar expects them and names
+    # anywhere else (void f(int interface);). Keywords expected in each level of braces after each kind of token:
+    # the imports and the module, the module contents and the methods of the interfaces.
+    keywords = {
+        0: {None: {'IMPORT', 'MODULE'}, 'SEMI': {'IMPORT', 'MODULE'}},
+        1: dict.fromkeys(['OBRACE', 'SEMI'], {'STRUCT', 'ENUM', 'EXCEPTION', 'DICTIONARY', 'SEQUENCE', 'INTERFACE'}),
+        2: {'OBRACE': {'IDEMPOTENT', 'OUT'}, 'SEMI': {'IDEMPOTENT', 'OUT'}, 'CPAR': {'THROWS'}},
+    }
+    # Keywords expected in the parameters of the methods
+    params_keywords = dict.fromkeys(['OPAR', 'COMMA'], {'IDEMPOTENT', 'OUT'})
+
+    # List of token names.   This is always required
+    tokens = ("OBRACE",
+              "CBRACE",
+              "SEMI",
+              "COMMA",
+              "OPAR",
+              "CPAR",
+              "LT",
+              "GT",
+              "PATH",
+              "IDENTIFIER",
+              "CONTENT",
+              "DEFAULT") + tuple(reserved.values())
+
+    # The content of enums, exceptions and dictionaries and the default values of the struct members are not parsed
+    # but kept as raw strings, as the pyparsing grammar does. These exclusive states read them.
+    states = (
+        ('block', 'exclusive'),
+        ('template', 'exclusive'),
+        ('members', 'exclusive'),
+        ('default', 'exclusive'),
+    )
+
+    # Regular expression rules for simple tokens
+    t_SEMI = r';'
+    t_COMMA = r','
+    t_GT = r'>'
+
+    # A string containing ignored characters (spaces and tabs)
+    t_ignore = ' \t\r'
+    t_members_ignore = ' \t\r'
+    t_block_ignore = ''
+    t_template_ignore = ''
+    t_default_ignore = ''
+
+    t_ignore_COMMENT = COMMENT
+    t_members_ignore_COMMENT = COMMENT
+
+    def __init__(self):
+        # Build the lexer
+        self.lexer = lex.lex(module=self)
+        self.reset()
+
+    def reset(self):
+        # Keyword of the definition being read. It selects the state used for its braces/angle brackets.
+        self._definition = None
+        self._member_identifiers = 0
+        # Position used to know the keywords expected: braces of the module and the interfaces enclosing the next
+        # token, whether it's in the parameters of a method, and the type of the previous token
+        self._depth = 0
+        self._in_params = False
+        self._last = None
+
+    def input(self, data):
+        self.reset()
+        self.lexer.begin('INITIAL')
+        self.lexer.lineno = 1
+        self.lexer.input(data)
+
+    def token(self):
+        t = self.lexer.token()
+        if t is not None:
+            self._last = t.type
+        return t
+
+    def expected_keywords(self):
+        if self._in_params:
+            return self.params_keywords.get(self._last, set())
+        return self.keywords.get(self._depth, {}).get(self._last, set())
+
+    def t_PATH(self, t):
+        r'"[^";]*"'
+        t.value = t.value[1:-1]
+        return t
+
+    def t_IDENTIFIER(self, t):
+        r'[A-Za-z_][A-Za-z0-9_:]*'
+        keyword = self.reserved.get(t.value)
+        t.type = keyword if keyword in self.expected_keywords() else 'IDENTIFIER'
+        if t.type in ('STRUCT', 'ENUM', 'EXCEPTION', 'DICTIONARY'):
+            self._definition = t.type
+        return t
+
+    def t_OBRACE(self, t):
+        r'\{'
+        if self._definition in ('ENUM', 'EXCEPTION'):
+            t.lexer.begin('block')
+        elif self._definition == 'STRUCT':
+            self._member_identifiers = 0
+            t.lexer.begin('members')
+        else:
+            # module or interface
+            self._depth += 1
+        self._definition = None
+        return t
+
+    def t_CBRACE(self, t):
+        r'\}'
+        self._depth -= 1
+        return t
+
+    def t_OPAR(self, t):
+        r'\('
+        self._in_params = True
+        return t
+
+    def t_CPAR(self, t):
+        r'\)'
+        self._in_params = False
+        return t
+
+    def t_LT(self, t):
+        r'<'
+        if self._definition == 'DICTIONARY':
+            t.lexer.begin('template')
+        self._definition = None
+        return t
+
+    def t_block_CONTENT(self, t):
+        r'[^{}]+'
+        t.lexer.lineno += t.value.count('\n')
+        t.value = skip_leading_comments(t.value)
+        return t
+
+    def t_block_CBRACE(self, t):
+        r'\}'
+        t.lexer.begin('INITIAL')
+        return t
+
+    def t_template_CONTENT(self, t):
+        r'[^<>]+'
+        t.lexer.lineno += t.value.count('\n')
+        t.value = skip_leading_comments(t.value)
+        return t
+
+    def t_template_GT(self, t):
+        r'>'
+        t.lexer.begin('INITIAL')
+        return t
+
+    def t_members_IDENTIFIER(self, t):
+        r'[A-Za-z_][A-Za-z0-9_:]*'
+        # type and name of the member, everything else until the semicolon is the default value
+        self._member_identifiers += 1
+        if self._member_identifiers == 2:
+            t.lexer.begin('default')
+        return t
+
+    def t_members_CBRACE(self, t):
+        r'\}'
+        t.lexer.begin('INITIAL')
+        return t
+
+    def t_default_DEFAULT(self, t):
+        r'[^;]+'
+        t.lexer.lineno += t.value.count('\n')
+        match = LEADING_EQUALS.match(t.value)
+        value = t.value[match.end():] if match else t.value
+        value = skip_leading_comments(value)
+        if value:
+            t.value = value
+            return t
+
+    def t_default_SEMI(self, t):
+        r';'
+        self._member_identifiers = 0
+        t.lexer.begin('members')
+        return t
+
+    # Define a rule so we can track line numbers
+    def t_INITIAL_members_newline(self, t):
+        r'\n+'
+        t.lexer.lineno += len(t.value)
+
+    # Error handling rule
+    def t_ANY_error(self, t):
+        raise ParseException(t.lexer.lexdata, t.lexpos, "Illegal character '%s'" % t.value[0])
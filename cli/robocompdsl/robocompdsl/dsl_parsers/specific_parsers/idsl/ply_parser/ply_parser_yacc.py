@@ -0,0 +1,190 @@
+import ply.yacc as yacc
+from pyparsing import ParseException
+
+from robocompdsl.dsl_parsers.specific_parsers.idsl.ply_parser.ply_parser_lex import IDSLLexer
+from robocompdsl.logger import logger
+
+
+class IDSLYaccParser(object):
+    """
+    LALR grammar for the idsl files. parseString returns a dict with the imports, the name of the module and its
+    contents, each one of them with the same keys pyparsing asDict() returns for the IDSLParser grammar.
+    """
+    tokens = IDSLLexer.tokens
+
+    def p_idsl(self, p):
+        '''idsl : importslist module'''
+        p[0] = {'imports': p[1]}
+        p[0].update(p[2])
+
+    def p_importslist(self, p):
+        '''
+        importslist : importslist idslimport
+                    |
+        '''
+        if len(p) > 1:
+            p[0] = p[1]
+            p[0].append(p[2])
+        else:
+            p[0] = []
+
+    def p_idslimport(self, p):
+        '''idslimport : IMPORT PATH SEMI'''
+        p[0] = p[2]
+
+    def p_module(self, p):
+        '''module : MODULE IDENTIFIER OBRACE contents CBRACE SEMI'''
+        p[0] = {'name': p[2], 'contents': p[4]}
+
+    def p_contents(self, p):
+        '''
+        contents : contents content
+                 |
+        '''
+        if len(p) > 1:
+            p[0] = p[1]
+            p[0].append(p[2])
+        else:
+            p[0] = []
+
+    def p_content(self, p):
+        '''
+        content : struct
+                | enum
+                | exception
+                | dictionary
+                | sequence
+                | interface
+        '''
+        p[0] = p[1]
+
+    def p_struct(self, p):
+        '''struct : STRUCT IDENTIFIER OBRACE members CBRACE SEMI'''
+        p[0] = {'type': p[1], 'name': p[2], 'structIdentifiers': p[4]}
+
+    def p_members(self, p):
+        '''
+        members : members member
+                | member
+        '''
+        if len(p) > 2:
+            p[0] = p[1]
+            p[0].append(p[2])
+        else:
+            p[0] = [p[1]]
+
+    def p_member(self, p):
+        '''
+        member : IDENTIFIER IDENTIFIER DEFAULT SEMI
+               | IDENTIFIER IDENTIFIER SEMI
+        '''
+        p[0] = {'type': p[1], 'identifier': p[2]}
+        if len(p) > 4:
+            p[0]['defaultValue'] = p[3]
+
+    def p_enum(self, p):
+        '''
+        enum : ENUM IDENTIFIER OBRACE CONTENT CBRACE SEMI
+        exception : EXCEPTION IDENTIFIER OBRACE CONTENT CBRACE SEMI
+        '''
+        p[0] = {'type': p[1], 'name': p[2], 'content': p[4]}
+
+    def p_dictionary(self, p):
+        '''dictionary : DICTIONARY LT CONTENT GT IDENTIFIER SEMI'''
+        p[0] = {'type': p[1], 'content': p[3], 'name': p[5]}
+
+    def p_sequence(self, p):
+        '''sequence : SEQUENCE LT IDENTIFIER GT IDENTIFIER SEMI'''
+        p[0] = {'type': p[1], 'typeSequence': p[3], 'name': p[5]}
+
+    def p_interface(self, p):
+        '''interface : INTERFACE IDENTIFIER OBRACE methods CBRACE SEMI'''
+        p[0] = {'type': p[1], 'name': p[2], 'methods': p[4]}
+
+    def p_methods(self, p):
+        '''
+        methods : methods method
+                |
+        '''
+        if len(p) > 1:
+            p[0] = p[1]
+            p[0].append(p[2])
+        else:
+            p[0] = []
+
+    def p_method(self, p):
+        '''method : decorator IDENTIFIER IDENTIFIER OPAR params CPAR raises SEMI'''
+        p[0] = {}
+        if p[1] is not None:
+            p[0]['decorator'] = p[1]
+        p[0].update({'ret': p[2], 'name': p[3], 'params': p[5]})
+        if p[7] is not None:
+            p[0]['raise'] = p[7]
+
+    def p_decorator(self, p):
+        '''
+        decorator : IDEMPOTENT
+                  | OUT
+                  |
+        '''
+        p[0] = p[1] if len(p) > 1 else None
+
+    def p_params(self, p):
+        '''
+        params : paramslist
+               |
+        '''
+        p[0] = p[1] if len(p) > 1 else []
+
+    def p_paramslist(self, p):
+        '''
+        paramslist : paramslist COMMA param
+                   | param
+        '''
+        if len(p) > 2:
+            p[0] = p[1]
+            p[0].append(p[3])
+        else:
+            p[0] = [p[1]]
+
+    def p_param(self, p):
+        '''param : decorator IDENTIFIER IDENTIFIER'''
+        p[0] = {}
+        if p[1] is not None:
+            p[0]['decorator'] = p[1]
+        p[0].update({'type': p[2], 'name': p[3]})
+
+    def p_raises(self, p):
+        '''
+        raises : THROWS raiseslist
+               |
+        '''
+        p[0] = p[2] if len(p) > 1 else None
+
+    def p_raiseslist(self, p):
+        '''
+        raiseslist : raiseslist COMMA IDENTIFIER
+                   | IDENTIFIER
+        '''
+        # The pyparsing grammar keeps the commas in the list of exceptions
+        if len(p) > 2:
+            p[0] = p[1]
+            p[0].extend([p[2], p[3]])
+        else:
+            p[0] = [p[1]]
+
+    def p_error(self, p):
+        data = self.lexer.lexer.lexdata
+        if p is None:
+            raise ParseException(data, len(data), "Unexpected end of file")
+        raise ParseException(data, p.lexpos, "Unexpected '%s'" % p.value)
+
+    def __init__(self, tables_file=None):
+        self.lexer = IDSLLexer()
+        # The LALR tables are read from tables_file when it's given and was generated for this same grammar
+        self.parser = yacc.yacc(module=self, debug=False, write_tables=False, errorlog=logger,
+                                picklefile=str(tables_file) if tables_file is not None else None)
+
+    def parseString(self, string):
+        # pyparsing expands the tabs before parsing and they end in the raw contents
+        return self.parser.parse(string.expandtabs(), lexer=self.lexer)
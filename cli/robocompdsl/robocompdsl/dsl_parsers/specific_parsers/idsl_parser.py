@@ -1,16 +1,32 @@
-from collections import OrderedDict
+import hashlib
+import inspect
+from dataclasses import replace
 from operator import attrgetter
 
 from pyparsing import Suppress, Word, alphas, alphanums, Group, \
     OneOrMore, ZeroOrMore, Optional, cppStyleComment, Literal, CharsNotIn
 
 from robocompdsl.dsl_parsers.dsl_parser_abstract import DSLParserTemplate
+from robocompdsl.dsl_parsers.specific_parsers.idsl import idsl_ast
+from robocompdsl.dsl_parsers.specific_parsers.idsl.idsl_ast import IDSLContentType, IDSLInterface, IDSLMethod, \
+    IDSLParam, IDSLSequence, IDSLStruct, IDSLStructMember, module_from_contents
 from robocompdsl.logger import logger
 
 class IDSLParser(DSLParserTemplate):
     def __init__(self):
         super(IDSLParser, self).__init__()
 
+    @classmethod
+    def version(cls):
+        # The cached structs are pickled instances of the idsl_ast classes, so they are also part of the version
+        if '_version' not in cls.__dict__:
+            hasher = hashlib.sha1()
+            for module in (inspect.getmodule(cls), idsl_ast):
+                with open(inspect.getfile(module), 'rb') as source:
+                    hasher.update(source.read())
+            cls._version = hasher.hexdigest()
+        return cls._version
+
     def _create_parser(self):
 
         semicolon = Suppress(Word(";"))
@@ -70,29 +86,27 @@ class IDSLParser(DSLParserTemplate):
     def string_to_struct(self, string, **kwargs):
         logger.debug("Parsing IDSL")
         parsing_result = self.parse_string(string)
-        result_dict = OrderedDict()
         self.include_directories = []
         if "include_directories" in kwargs:
             self.include_directories = kwargs["include_directories"]
         logger.debug(f"\twith include_directories: {self.include_directories}")
         # Hack to make robocompdsl work with pyparsing > 2.2
         try:
-            result_dict['name'] = parsing_result['module']['name']
+            name = parsing_result['module']['name']
         except KeyError:
-            result_dict['name'] = parsing_result['name']
-        logger.debug(f"\twith name: {result_dict['name']}")
+            name = parsing_result['name']
+        logger.debug(f"\twith name: {name}")
 
-        result_dict['imports'] = []
-        result_dict['recursive_imports'] = []
+        imports = []
+        recursive_imports = []
         if 'imports' in parsing_result:
-            # print result_dict['name'], parsing_result['imports']
-            result_dict['imports'] = parsing_result['imports'].asList()
-            logger.debug(f"\twith imports: {result_dict['imports']}")
-            from robocompdsl.dsl_parsers.idslpool import idsl_pool
-            result_dict['recursive_imports'] = idsl_pool.update_with_idsls(list(parsing_result['imports']))
-            logger.debug(f"\twith recursive_imports: {result_dict['recursive_imports']}")
-        # INTERFACES DEFINED IN THE MODULE
-        result_dict['interfaces'] = []
+            imports = parsing_result['imports'].asList()
+            logger.debug(f"\twith imports: {imports}")
+            # the IDSLPool parses the imported files itself when resolve_imports is False
+            if kwargs.get('resolve_imports', True):
+                from robocompdsl.dsl_parsers.idslpool import idsl_pool
+                recursive_imports = idsl_pool.update_with_idsls(list(imports))
+                logger.debug(f"\twith recursive_imports: {recursive_imports}")
 
         # Hack to make robocompdsl work with pyparsing > 2.2
         try:
@@ -100,76 +114,45 @@ class IDSLParser(DSLParserTemplate):
         except KeyError:
             contents = parsing_result['contents']
 
+        # INTERFACES AND TYPES DEFINED IN THE MODULE
+        interfaces = []
+        types = []
         for contentDef in contents:
             if contentDef[0] == 'interface':
-                interface = {'name': contentDef[1], 'methods': OrderedDict()}
+                methods = {}
                 for method in sorted(contentDef['methods'], key=attrgetter('name')):
-                    interface['methods'][method['name']] = {}
-
-                    interface['methods'][method['name']]['name'] = method['name']
-                    try:
-                        interface['methods'][method['name']]['decorator'] = method['decorator']
-                    except KeyError:
-                        interface['methods'][method['name']]['decorator'] = ''
-
-                    interface['methods'][method['name']]['return'] = method['ret']
-
                     params = []
-                    try:
+                    if 'params' in method:
                         for p in method['params']:
-                            try:
-                                params.append({'decorator': p['decorator'], 'type': p['type'], 'name': p['name']})
-                            except KeyError:
-                                params.append({'decorator': 'none', 'type': p['type'], 'name': p['name']})
-                    except KeyError:
-                        pass
-                    interface['methods'][method['name']]['params'] = params
-
-                    try:
-                        interface['methods'][method['name']]['throws'] = method['raise'].asList()
-                    except KeyError:
-                        interface['methods'][method['name']]['throws'] = 'nothing'
-                result_dict['interfaces'].append(interface)
-        logger.debug(f"\twith {len(result_dict['interfaces'])} interfaces")
-        # TYPES DEFINED IN THE MODULE
-        result_dict['types'] = []
-        # print '---\n---\nPARSE IDSL TYPES'
-        for contentDef in contents:
-            # print contentDef[0]
-            if contentDef[0] in ['enum', 'struct', 'exception']:
-                # typedef = {'name': contentDef[1], 'type': contentDef[0]}
-                typedef = contentDef.asDict()
-
-                # print typedef
-                result_dict['types'].append(typedef)
-            elif contentDef[0] in ['sequence', 'dictionary']:
-                typedef = contentDef.asDict()
-                # print typedef
-                result_dict['types'].append(typedef)
-            elif contentDef[0] in ['interface']:
-                pass
+                            params.append(IDSLParam(p['decorator'] if 'decorator' in p else 'none', p['type'], p['name']))
+                    methods[method['name']] = IDSLMethod(
+                        name=method['name'],
+                        decorator=method['decorator'] if 'decorator' in method else '',
+                        return_type=method['ret'],
+                        params=tuple(params),
+                        throws=tuple(method['raise'].asList()) if 'raise' in method else 'nothing')
+                interfaces.append(IDSLInterface(contentDef[1], methods))
+            elif contentDef[0] == 'struct':
+                members = tuple(IDSLStructMember(member['type'], member['identifier'],
+                                                 member['defaultValue'] if 'defaultValue' in member else None)
+                                for member in contentDef['structIdentifiers'])
+                types.append(IDSLStruct(contentDef['type'], contentDef['name'], members))
+            elif contentDef[0] == 'sequence':
+                types.append(IDSLSequence(contentDef['type'], contentDef['name'], contentDef['typeSequence']))
+            elif contentDef[0] in ['enum', 'exception', 'dictionary']:
+                types.append(IDSLContentType(contentDef['type'], contentDef['name'], contentDef['content']))
             else:
                 print(('Unknown module content', contentDef))
-        # SEQUENCES DEFINED IN THE MODULE
-        result_dict['sequences'] = []
-        result_dict['simpleSequences'] = []
-        for contentDef in contents:
-            if contentDef['type'] == 'sequence':
-                seq_def = {'name': result_dict['name'] + "/" + contentDef['name'], 'type': contentDef['type'], 'typeSequence': contentDef['typeSequence']}
-                simple_seq_def = {'name': result_dict['name'], 'strName': contentDef['name']}
-                # print structdef
-                result_dict['sequences'].append(seq_def)
-                result_dict['simpleSequences'].append(simple_seq_def)
-        # STRUCTS DEFINED IN THE MODULE
-        result_dict['structs'] = []
-        result_dict['simpleStructs'] = []
-        for contentDef in contents:
-            if contentDef['type'] == 'struct':
-                structdef = {'name': result_dict['name'] + "/" + contentDef['name'], 'type': contentDef['type'], 'structIdentifiers': contentDef['structIdentifiers'].asList()}
-                simple_struct_def = {'name': result_dict['name'], 'strName': contentDef['name']}
-                # print structdef
-                result_dict['structs'].append(structdef)
-                result_dict['simpleStructs'].append(simple_struct_def)
-
-        self.struct = result_dict
-        return result_dict
+        logger.debug(f"\twith {len(interfaces)} interfaces")
+
+        result = module_from_contents(name, imports, recursive_imports, interfaces, types)
+        # the pyparsing results are not needed anymore
+        self.release_parse_result()
+        self.struct = result
+        return result
+
+    def struct_from_cache(self, struct, **kwargs):
+        if struct['imports']:
+            from robocompdsl.dsl_parsers.idslpool import idsl_pool
+            struct = replace(struct, recursive_imports=tuple(idsl_pool.update_with_idsls(list(struct['imports']))))
+        return super(IDSLParser, self).struct_from_cache(struct, **kwargs)
@@ -15,6 +15,7 @@ import rich
 from rich.console import Console
 
 from robocompdsl.common.filesgenerator import FilesGenerator
+from robocompdsl.common.profiler import profiler
 from robocompdsl.logger import logger
 
 DESCRIPTION_STR = """\
@@ -22,9 +23,15 @@ This application create components files from cdsl files or .ice from idsl
     a) to generate code from a CDSL file:\t{name}    INPUT_FILE.CDSL    OUTPUT_PATH
     b) to generate a new CDSL file:\t\t{name}    NEW_COMPONENT_DESCRIPTOR.CDSL
     c) to generate .ice from a IDSL file:\t{name}    INPUT_FILE.idsl    OUTPUT_FILE_PATH.ice
+    d) to generate several components:\t{name}    generate-many WORKSPACE_DIR|CDSL_GLOB... [--manifest FILE]
+    e) to index the available IDSL files:\t{name}    interfaces index
+    f) to generate .ice from an IDSL directory:\t{name}    interfaces ice IDSL_DIR OUTPUT_PATH
+    g) to regenerate a component on each change:\t{name}    watch INPUT_FILE.CDSL    OUTPUT_PATH
 """
 
 app = typer.Typer(help=DESCRIPTION_STR)
+interfaces_app = typer.Typer(help="Commands to work with the available IDSL interfaces.")
+app.add_typer(interfaces_app, name="interfaces")
 
 console = Console()
 
@@ -109,6 +116,28 @@ def generate_dummy_SMDSL(path):
         open(path, "w").write(DUMMY_SMDSL_STRING)
 
 
+def _configure_dsl_factory(no_cache, idsl_parser):
+    """
+    Apply the --no-cache and --idsl-parser options of a command to the DSLFactory
+    """
+    from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+    if no_cache:
+        DSLFactory().set_persistent_cache(None)
+    if idsl_parser is not None:
+        try:
+            DSLFactory().set_idsl_parser(idsl_parser)
+        except ValueError as e:
+            console.log(str(e))
+            raise typer.Exit(-1)
+
+
+def _check_include_dirs(include_dirs):
+    for i_dir in include_dirs:
+        if not i_dir.is_dir():
+            console.log(f"{i_dir} directory in -I option  not exists")
+            raise typer.Exit(-1)
+
+
 @app.command()
 def generate(
         input_file: str = typer.Argument(..., help="The input dsl file"),
@@ -118,12 +147,21 @@ def generate(
         test: bool = typer.Option(False, "--test", "-t",  help="Testing option"),
         debug: bool = typer.Option(False, "--debug", help="Debug option in the output"),
         quiet: bool = typer.Option(False, "--quiet", "-q", help="Quiet option in the output"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Don't use the persistent cache of parsed dsl files"),
+        idsl_parser: Optional[str] = typer.Option(None, "--idsl-parser", help="Parser for the IDSL files: pyparsing or ply"),
+        force: bool = typer.Option(False, "--force", "-f", help="Generate all the files even if no input changed since the last generation"),
+        jobs: int = typer.Option(1, "--jobs", "-j", help="Number of processes parsing the idsl files and rendering the templates of the component"),
+        profile: bool = typer.Option(False, "--profile", help="Show the time spent in each stage, plugin and file"),
+        profile_trace: Optional[Path] = typer.Option(None, "--profile-trace", help="Save the profile to this file in the Chrome trace event format"),
 ):
 
+    if profile or profile_trace is not None:
+        profiler.enable()
     if debug:
         logger.setLevel(level=logging.DEBUG)
     if quiet:
         logger.setLevel(level=logging.INFO)
+    _configure_dsl_factory(no_cache, idsl_parser)
     if output_path is None:
         if input_file.endswith(".cdsl"):
             generate_dummy_CDSL(input_file)
@@ -145,17 +183,179 @@ def generate(
             if len(include_dirs) > 0:
                 idsl_pool.update_directories(list(map(Path, include_dirs)))
                 logger.debug(f"Idsl pool: {idsl_pool}")
-            FilesGenerator().generate(Path(input_file), output_path, diff, test)
+            idsl_pool.jobs = jobs
+            with profiler.span("robocompdsl generate", input_file=input_file):
+                FilesGenerator().generate(Path(input_file), output_path, diff, test, force, jobs)
         except pyparsing.ParseException as pe:
             console.log(f"Error generating files for {rich.Text(input_file, style='red')}")
             console.log(pe.line)
             console.log(' ' * (pe.col - 1) + '^')
             console.log(pe)
             exit(-1)
+        finally:
+            if profiler.enabled:
+                show_profile(profile_trace)
     else:
         console.print("Please check the Input file \n" + "Input File should be either .cdsl or .idsl")
         sys.exit(-1)
 
 
-if __name__ == '__main__':
+def show_profile(trace_file=None):
+    profiler.print_table(limit=40)
+    if trace_file is not None:
+        profiler.dump_trace(trace_file)
+        console.print(f"Profile trace saved to {trace_file}")
+
+
+@app.command(name="generate-many")
+def generate_many(
+        inputs: List[str] = typer.Argument(None, help="CDSL files, glob patterns or workspace directories to search for CDSL files"),
+        manifest: Optional[Path] = typer.Option(None, "--manifest", "-m", help="File with a CDSL file and an optional output path per line"),
+        include_dirs: List[Path] = typer.Option([],  "--include_dirs", "-I", help="List of directories to find includes."),
+        jobs: int = typer.Option(1, "--jobs", "-j", help="Number of processes generating components"),
+        test: bool = typer.Option(False, "--test", "-t",  help="Testing option"),
+        debug: bool = typer.Option(False, "--debug", help="Debug option in the output"),
+        quiet: bool = typer.Option(False, "--quiet", "-q", help="Quiet option in the output"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Don't use the persistent cache of parsed dsl files"),
+        idsl_parser: Optional[str] = typer.Option(None, "--idsl-parser", help="Parser for the IDSL files: pyparsing or ply"),
+        force: bool = typer.Option(False, "--force", "-f", help="Generate all the files even if no input changed since the last generation"),
+):
+    """
+    Generate the code of several components sharing the parsers, plugins and loaded IDSLs.
+    Components without an output path in the manifest are generated in the directory of their CDSL file.
+    """
+    import time
+    from robocompdsl.common.batchgenerator import BatchGenerator, find_component_files
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+
+    if debug:
+        logger.setLevel(level=logging.DEBUG)
+    if quiet:
+        logger.setLevel(level=logging.INFO)
+    _configure_dsl_factory(no_cache, idsl_parser)
+    _check_include_dirs(include_dirs)
+    if manifest is not None and not manifest.is_file():
+        console.log(f"Manifest file {manifest} not exists")
+        raise typer.Exit(-1)
+    if len(include_dirs) > 0:
+        idsl_pool.update_directories([i_dir.absolute() for i_dir in include_dirs])
+    components = find_component_files(inputs or [], manifest)
+    if not components:
+        console.print("No component to generate", style='yellow')
+        raise typer.Exit(-1)
+    start = time.perf_counter()
+    results = BatchGenerator(jobs, test, force).generate(components)
+    BatchGenerator.print_summary(results, time.perf_counter() - start)
+    if any(result.error is not None for result in results):
+        raise typer.Exit(1)
+
+
+@app.command()
+def watch(
+        input_file: Path = typer.Argument(..., help="The input cdsl file"),
+        output_path: str = typer.Argument(..., help="The path to put the generated files"),
+        include_dirs: List[Path] = typer.Option([],  "--include_dirs", "-I", help="List of directories to find includes."),
+        debug: bool = typer.Option(False, "--debug", help="Debug option in the output"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Don't use the persistent cache of parsed dsl files"),
+        idsl_parser: Optional[str] = typer.Option(None, "--idsl-parser", help="Parser for the IDSL files: pyparsing or ply"),
+        force: bool = typer.Option(False, "--force", "-f", help="Generate all the files the first time even if no input changed since the last generation"),
+        jobs: int = typer.Option(1, "--jobs", "-j", help="Number of processes parsing the idsl files and rendering the templates of the component"),
+        polling: bool = typer.Option(False, "--polling", help="Check the files periodically instead of using inotify"),
+        interval: float = typer.Option(0.5, "--interval", help="Seconds between checks of the files with --polling"),
+):
+    """
+    Generate a component and generate it again each time its CDSL, its statemachine or the IDSL files it uses change.
+    Everything loaded is kept in memory between generations. Press Ctrl+C to stop.
+    """
+    from robocompdsl.common.watcher import ComponentWatcher, create_watcher
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+
+    if debug:
+        logger.setLevel(level=logging.DEBUG)
+    _configure_dsl_factory(no_cache, idsl_parser)
+    if input_file.suffix not in [".cdsl", ".jcdsl"] or not input_file.is_file():
+        console.print("Please check the Input file \n" + "Input File should be an existing .cdsl file")
+        raise typer.Exit(-1)
+    _check_include_dirs(include_dirs)
+    if len(include_dirs) > 0:
+        idsl_pool.update_directories([i_dir.absolute() for i_dir in include_dirs])
+    idsl_pool.jobs = jobs
+    watcher = create_watcher(polling, interval)
+    console.print(f"Watching {input_file} with {type(watcher).__name__}", style='dim')
+    try:
+        ComponentWatcher(input_file, output_path, watcher, jobs, force).run()
+    except KeyboardInterrupt:
+        console.print("Stopped watching")
+
+
+@interfaces_app.command(name="index")
+def interfaces_index(
+        include_dirs: List[Path] = typer.Option([], "--include_dirs", "-I", help="List of directories to find includes."),
+        output: Optional[Path] = typer.Option(None, "--output", "-o", help="File to write the catalog to"),
+):
+    """
+    Write the catalog of the IDSL files found in the include directories so later executions can reuse it.
+    """
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+    for i_dir in include_dirs:
+        if not i_dir.is_dir():
+            console.log(f"{i_dir} directory in -I option  not exists")
+            raise typer.Exit(-1)
+    if len(include_dirs) > 0:
+        idsl_pool.update_directories(list(include_dirs))
+    catalog_file = idsl_pool.catalog.save(output)
+    idsl_files = idsl_pool.catalog.files()
+    for i_dir in idsl_pool.include_directories:
+        console.print(f"{i_dir}", style='green' if i_dir.is_dir() else 'yellow')
+    console.print(f"{len(idsl_files)} idsl files indexed in {catalog_file}")
+
+
+@interfaces_app.command(name="ice")
+def interfaces_ice(
+        idsl_dir: Path = typer.Argument(..., help="Directory with the IDSL files to translate"),
+        output_path: Path = typer.Argument(..., help="Directory to write the .ice files to"),
+        include_dirs: List[Path] = typer.Option([], "--include_dirs", "-I", help="List of directories to find includes."),
+        jobs: int = typer.Option(1, "--jobs", "-j", help="Number of processes parsing the IDSL files and rendering the .ice files"),
+        no_cache: bool = typer.Option(False, "--no-cache", help="Don't use the persistent cache of parsed dsl files"),
+        idsl_parser: Optional[str] = typer.Option(None, "--idsl-parser", help="Parser for the IDSL files: pyparsing or ply"),
+        force: bool = typer.Option(False, "--force", "-f", help="Translate all the files even if they didn't change since the last translation"),
+):
+    """
+    Translate every IDSL file of a directory to an .ice file in a single execution.
+    Files whose IDSL and .ice files didn't change since the last translation are skipped.
+    """
+    import time
+    from robocompdsl.common.icegenerator import IceGenerator
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+
+    _configure_dsl_factory(no_cache, idsl_parser)
+    for i_dir in [idsl_dir] + include_dirs:
+        if not i_dir.is_dir():
+            console.log(f"{i_dir} directory not exists")
+            raise typer.Exit(-1)
+    if len(include_dirs) > 0:
+        idsl_pool.update_directories([i_dir.absolute() for i_dir in include_dirs])
+    start = time.perf_counter()
+    results = IceGenerator(jobs, force).generate(idsl_dir, output_path)
+    if not results:
+        console.print(f"No IDSL file found in {idsl_dir}", style='yellow')
+        raise typer.Exit(-1)
+    IceGenerator.print_summary(results, time.perf_counter() - start)
+    if any(result.error is not None for result in results):
+        raise typer.Exit(1)
+
+
+def main():
+    """
+    Entry point of robocompdsl. A call without a command name is passed to the generate command so the classic
+    usage "robocompdsl INPUT_FILE [OUTPUT_PATH]" keeps working.
+    """
+    commands = [command.name or command.callback.__name__ for command in app.registered_commands]
+    commands += [group.name for group in app.registered_groups]
+    if len(sys.argv) > 1 and sys.argv[1] not in commands + ["--help", "--install-completion", "--show-completion"]:
+        sys.argv.insert(1, "generate")
     app()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,16 +1,58 @@
+import atexit
+import functools
+import hashlib
 import importlib
+import multiprocessing
 import os
+import pickle
+import tempfile
 from abc import ABC
-from collections import ChainMap
+from collections import ChainMap, namedtuple
+from concurrent.futures import ProcessPoolExecutor
 from string import Template
 import re
 from pathlib import Path
 
+from robocompdsl.common.profiler import profiler
+from robocompdsl.common.robocompdslutils import write_if_changed
+from robocompdsl.dsl_parsers.dsl_cache import DEFAULT_CACHE_DIR
+from robocompdsl.dsl_parsers.idslpool import idsl_pool
 from robocompdsl.dsl_parsers.parsing_utils import communication_is_ice
+from robocompdsl.logger import logger
+from robocompdsl.templates.common.templatedict import TemplateDict, concatenate_values
 import rich
 
 console = rich.console.Console()
 
+LINE_REMOVE_MARKER = "<LINEREMOVE>"
+COMPILED_TEMPLATES_FORMAT_VERSION = 1
+DEFAULT_COMPILED_TEMPLATES_FILE = Path(os.getenv('ROBOCOMPDSL_CACHE_DIR', DEFAULT_CACHE_DIR)) / "templates" / "compiled.pickle"
+
+
+def reindent(previous, string, trimlines=True):
+    """
+    Return the string substituted for a placeholder. If the placeholder only has whitespaces before it in its line,
+    that indentation is added to every line of the string.
+    """
+    if previous.strip() == '':
+        out_lines = []
+        lines = string.splitlines()
+        if len(lines) > 0:
+            if trimlines:
+                if lines and lines[0].strip() == '':
+                    del lines[0]
+                if lines and lines[-1].strip() == '':
+                    del lines[-1]
+            for line in lines:
+                if line.strip() != '':
+                    out_lines.append(previous + line)
+                else:
+                    out_lines.append(line)
+        return '\n'.join(out_lines)
+    else:
+        return previous+string
+
+
 class CustomTemplate(Template):
     delimiter = '$'
     pattern = r'''
@@ -39,36 +81,23 @@ class CustomTemplate(Template):
             mapping = ChainMap(kws, args[0])
         else:
             mapping = args[0]
+        return compile_template(self.template, self.trimlines).render(mapping)
 
-        def reindent(previous, string):
-            if previous.strip() == '':
-                out_lines = []
-                lines = string.splitlines()
-                if len(lines) > 0:
-                    if self.trimlines:
-                        if lines and lines[0].strip() == '':
-                            del lines[0]
-                        if lines and lines[-1].strip() == '':
-                            del lines[-1]
-                    for line in lines:
-                        if line.strip() != '':
-                            out_lines.append(previous + line)
-                        else:
-                            out_lines.append(line)
-                return '\n'.join(out_lines)
-            else:
-                return previous+string
-
+    def substitute_with_regex(self, mapping):
+        """
+        Substitute the placeholders parsing the template. It's only used by CompiledTemplate.render for the cases
+        its render plan can't handle.
+        """
         # Helper function for .sub()
         def convert(mo):
             # Check the most common path first.
             named = mo.group('named') or mo.group('braced')
             if named is not None:
-                converted = reindent(mo.group('previous'), str(mapping[named]))
+                converted = reindent(mo.group('previous'), str(mapping[named]), self.trimlines)
                 if converted != '':
                     return converted
                 else:
-                    return "<LINEREMOVE>"
+                    return LINE_REMOVE_MARKER
             if mo.group('escaped') is not None:
                 return mo.group('previous')+self.delimiter
             if mo.group('invalid') is not None:
@@ -77,7 +106,7 @@ class CustomTemplate(Template):
                              self.pattern)
         substituted = self.pattern.sub(convert, self.template)
         # The only way to remove extra lines that template leaves.
-        return re.sub('<LINEREMOVE>.*\n', '', substituted)
+        return re.sub(LINE_REMOVE_MARKER + '.*\n', '', substituted)
 
     def identifiers(self):
         identifiers = []
@@ -87,6 +116,178 @@ class CustomTemplate(Template):
                 identifiers.append(result[3])
         return identifiers
 
+
+class CompiledTemplate:
+    """
+    Render plan of a CustomTemplate. The template is parsed once into a list of segments, literal strings and
+    (identifier, previous text, is indentation) placeholders, so rendering it is just formatting the placeholders
+    and joining the segments. The lines of the placeholders substituted by an empty string are removed as
+    CustomTemplate always did.
+    """
+    __slots__ = ('template', 'trimlines', 'segments')
+
+    def __init__(self, template, trimlines=True):
+        self.template = template
+        self.trimlines = trimlines
+        self.segments = self._compile(template)
+
+    @staticmethod
+    def _compile(template):
+        segments = []
+        literal = ''
+        position = 0
+        for mo in CustomTemplate.pattern.finditer(template):
+            literal += template[position:mo.start()]
+            position = mo.end()
+            previous = mo.group('previous')
+            named = mo.group('named') or mo.group('braced')
+            if named is not None:
+                if literal:
+                    segments.append(literal)
+                    literal = ''
+                segments.append((named, previous, previous.strip() == ''))
+            elif mo.group('escaped') is not None:
+                literal += previous + CustomTemplate.delimiter
+            else:
+                # Invalid placeholder. The regex substitution will raise the error when it's rendered.
+                return None
+        literal += template[position:]
+        if literal:
+            segments.append(literal)
+        if any(isinstance(segment, str) and LINE_REMOVE_MARKER in segment for segment in segments):
+            return None
+        return tuple(segments)
+
+    def identifiers(self):
+        if self.segments is None:
+            return CustomTemplate(self.template, self.trimlines).identifiers()
+        identifiers = []
+        for segment in self.segments:
+            if not isinstance(segment, str) and segment[0] not in identifiers:
+                identifiers.append(segment[0])
+        return identifiers
+
+    def render(self, mapping):
+        if self.segments is None:
+            return CustomTemplate(self.template, self.trimlines).substitute_with_regex(mapping)
+        parts = []
+        # Pieces of the line being removed after a placeholder substituted by an empty string
+        removed = None
+        for segment in self.segments:
+            if isinstance(segment, str):
+                text = segment
+            else:
+                identifier, previous, indentation = segment
+                value = str(mapping[identifier])
+                if LINE_REMOVE_MARKER in value:
+                    return CustomTemplate(self.template, self.trimlines).substitute_with_regex(mapping)
+                if indentation:
+                    text = reindent(previous, value, self.trimlines)
+                else:
+                    text = previous + value
+                if text == '':
+                    text = LINE_REMOVE_MARKER
+                    if removed is None:
+                        removed = [text]
+                        continue
+            if removed is not None:
+                end = text.find('\n')
+                if end < 0:
+                    removed.append(text)
+                    continue
+                removed = None
+                text = text[end + 1:]
+            parts.append(text)
+        # A line without end is not removed
+        if removed is not None:
+            parts.extend(removed)
+        return ''.join(parts)
+
+
+@functools.lru_cache(maxsize=1024)
+def compile_template(template, trimlines=True):
+    """
+    Return the CompiledTemplate of a template string. Compiled templates are kept in memory for the whole process.
+    """
+    return CompiledTemplate(template, trimlines)
+
+
+class CompiledTemplatesCache:
+    """
+    Cache of the compiled template files. Templates are compiled again only when their mtime or size change, and the
+    compiled templates are also saved to cache_file at exit so later executions don't need to parse them.
+    """
+    def __init__(self, cache_file=None):
+        self.cache_file = Path(cache_file) if cache_file is not None else DEFAULT_COMPILED_TEMPLATES_FILE
+        self._templates = None
+        self._modified = False
+
+    def get(self, template_path, trimlines=True):
+        """
+        Return the CompiledTemplate for the template file in template_path
+        """
+        template_path = os.path.abspath(template_path)
+        stat = os.stat(template_path)
+        if self._templates is None:
+            self._templates = self._load()
+        entry = self._templates.get(template_path)
+        if entry is not None and entry[:3] == (stat.st_mtime_ns, stat.st_size, trimlines):
+            return entry[3]
+        with open(template_path, 'r') as istream:
+            compiled = CompiledTemplate(istream.read(), trimlines)
+        self._templates[template_path] = (stat.st_mtime_ns, stat.st_size, trimlines, compiled)
+        if not self._modified:
+            self._modified = True
+            atexit.register(self.save)
+        return compiled
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'rb') as reader:
+                version, templates = pickle.load(reader)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.debug(f"Discarding invalid compiled templates file {self.cache_file}: {e}")
+            return {}
+        if version != COMPILED_TEMPLATES_FORMAT_VERSION or not isinstance(templates, dict):
+            return {}
+        return templates
+
+    def save(self):
+        """
+        Write the compiled templates to the cache file if any template was compiled. Errors are only logged.
+        """
+        if not self._modified:
+            return
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.cache_file.parent, suffix=".tmp")
+            with os.fdopen(fd, 'wb') as writer:
+                pickle.dump((COMPILED_TEMPLATES_FORMAT_VERSION, self._templates), writer,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.cache_file)
+            self._modified = False
+        except OSError as e:
+            logger.debug(f"Could not write the compiled templates to {self.cache_file}: {e}")
+
+
+compiled_templates = CompiledTemplatesCache()
+
+# Template rendered by generate_files: output_file is written with the result of the template file in template
+RenderJob = namedtuple('RenderJob', ['template_file', 'template', 'output_file', 'interface_name', 'kind'])
+
+# Manager whose render jobs are executed by the processes of the pool. They are forked, so they inherit it.
+_rendering_manager = None
+
+
+def _render_job(job):
+    try:
+        return _rendering_manager._render_template(job.template, job.interface_name), None
+    except Exception as e:
+        return None, e
+
+
 if not (TEMPLATES_DIR := Path('/opt/robocomp/python/robocompdsl/templates/')).exists():
     if not (TEMPLATES_DIR := Path(__file__).absolute().parent.parent).absolute().exists():
         print(f"NO TEMPLATE DIR FOUND FOR ROBOCOMPDSL!!!: {__file__}")
@@ -96,6 +297,15 @@ class AbstractTemplatesManager(ABC):
     def __init__(self, ast, plugins):
         self.ast = ast
         self.plugins = plugins
+        # output files written by the last generate_files and the ones that already had the generated content
+        self.written_files = []
+        self.unchanged_files = []
+        # absolute path of each generated file to its kind, the hash of its content and the idsl files it depends on
+        self.outputs = {}
+        # if not None, only the output files in this set (or their .new version) are generated
+        self.only_outputs = None
+        # number of processes rendering the templates of generate_files
+        self.jobs = 1
         super(AbstractTemplatesManager, self).__init__()
 
     def generate_files(self, output_path):
@@ -110,39 +320,155 @@ class AbstractTemplatesManager(ABC):
     def _post_generation_action(self, template_file, ofile):
         pass
 
-    def _template_to_file(self, template, output_file, interface_name=None):
-        istream = open(template, 'r')
-        content = istream.read()
-        istream.close()
-        template_dict = self._get_template_dict(template, interface_name)
-        template_object = CustomTemplate(content, trimlines=False)
-        try:
-            file_content = template_object.substitute(**template_dict)
-        except KeyError as e:
-            raise KeyError(f"Template keyword {str(e)} not found in {template_dict} for Template file {template}")
+    def _skip_output(self, output_file):
+        if self.only_outputs is None:
+            return False
+        output_file = os.path.abspath(output_file)
+        return output_file not in self.only_outputs and output_file + '.new' not in self.only_outputs
+
+    def _template_to_file(self, template, output_file, interface_name=None, kind='generated'):
+        file_content, idsl_files = self._render_template(template, interface_name)
+        return self._write_output(output_file, file_content, idsl_files, interface_name, kind)
+
+    def _render_template(self, template, interface_name=None):
+        """
+        Return the content generated from the template file and the idsl files it depends on
+        """
+        # The idsl modules read while rendering are the ones this file depends on
+        with profiler.span(self._template_name(template) + (f" ({interface_name})" if interface_name else ""),
+                           'render'), idsl_pool.track_accesses() as accessed_modules:
+            template_dict = self._get_template_dict(template, interface_name)
+            template_object = compiled_templates.get(template, trimlines=False)
+            try:
+                file_content = template_object.render(template_dict)
+            except KeyError as e:
+                raise KeyError(f"Template keyword {str(e)} not found in {template_dict} for Template file {template}")
+        return file_content, self._idsl_files(accessed_modules)
+
+    def _write_output(self, output_file, file_content, idsl_files, interface_name=None, kind='generated'):
+        self.outputs[os.path.abspath(output_file)] = {
+            'kind': kind,
+            'sha256': hashlib.sha256(file_content.encode('utf-8')).hexdigest(),
+            'idsls': idsl_files}
+
+        # Existing files with the same content are not touched to keep their mtime
+        servant_for = f" (servant for {interface_name})" if interface_name else ""
+        with profiler.span(output_file, 'write'):
+            written = write_if_changed(output_file, file_content)
+        if written:
+            self.written_files.append(output_file)
+            console.print(f":thumbs_up: Generating {output_file}{servant_for}", style='green')
+            return True
+        self.unchanged_files.append(output_file)
+        console.print(f":zzz: Unchanged {output_file}{servant_for}", style='dim')
+        return False
 
-        with open(output_file, 'w') as ostream:
-            ostream.write(file_content)
+    def _run_render_jobs(self, render_jobs):
+        """
+        Generate the files of the render jobs in order. With more than one job, the templates are rendered by a pool of
+        processes and the files are written, in the same order, when all of them have finished.
+        """
+        for job, (result, error) in zip(render_jobs, self._render_all(render_jobs)):
+            if error is not None:
+                # Errors in the regular files are only reported, as when they are generated one by one
+                if job.interface_name is None and isinstance(error, ValueError):
+                    console.print(error)
+                    self._post_generation_action(job.template_file, job.output_file)
+                    continue
+                raise error
+            self._write_output(job.output_file, *result, job.interface_name, job.kind)
+            if job.interface_name is None:
+                self._post_generation_action(job.template_file, job.output_file)
+
+    def _render_all(self, render_jobs):
+        if self.jobs > 1 and profiler.enabled:
+            logger.warning("Templates are rendered one by one when profiling")
+        elif self.jobs > 1 and len(render_jobs) > 1 and 'fork' in multiprocessing.get_all_start_methods():
+            global _rendering_manager
+            # Templates are compiled before forking so the processes don't compile them again
+            for job in render_jobs:
+                compiled_templates.get(job.template, trimlines=False)
+            _rendering_manager = self
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.jobs, len(render_jobs)),
+                                         mp_context=multiprocessing.get_context('fork')) as executor:
+                    return list(executor.map(_render_job, render_jobs))
+            finally:
+                _rendering_manager = None
+        elif self.jobs > 1 and len(render_jobs) > 1:
+            logger.debug("Templates can only be rendered in parallel with the fork start method")
+        return self._render_lazily(render_jobs)
+
+    def _render_lazily(self, render_jobs):
+        # One by one, so each file is written before the next one is rendered
+        for job in render_jobs:
+            try:
+                yield self._render_template(job.template, job.interface_name), None
+            except ValueError as e:
+                yield None, e
+
+    @staticmethod
+    def _idsl_files(module_names):
+        """
+        Return the sorted paths of the idsl files of the modules and the modules imported by them
+        """
+        files = set()
+        pending, seen = list(module_names), set()
+        while pending:
+            module_name = pending.pop()
+            module = dict.get(idsl_pool, module_name)
+            if module_name in seen or module is None:
+                continue
+            seen.add(module_name)
+            files.add(str(module['filename']))
+            for imported in list(module['imports']) + list(module.get('recursive_imports') or []):
+                pending.append(imported.split('.')[0])
+        return sorted(files)
+
+    def _template_name(self, template):
+        full_path = os.path.join(TEMPLATES_DIR, self.files['template_path'])
+        return template.replace(str(full_path), "")
 
     def _get_template_dict(self, template, interface_name=None):
-        template_dict = {}
-        full_path = os.path.join(TEMPLATES_DIR, self.files['template_path'])
-        template_name = template.replace(str(full_path), "")
+        template_name = self._template_name(template)
+        # template dicts of the plugins providing each entry
+        entries = {}
         # look for a method in the class with the name of the file
         for plugin in self.plugins:
-            if new_template_dict := plugin.get_template_dict(template_name, self.ast, interface_name):
-                for entry, value in new_template_dict.items():
-                    if entry in template_dict:
-                        template_dict[entry] += new_template_dict[entry]
-                    else:
-                        template_dict[entry] = new_template_dict[entry]
+            with profiler.span(f"{type(plugin).__name__} {template_name}", 'template dict'):
+                new_template_dict = plugin.get_template_dict(template_name, self.ast, interface_name)
+            if new_template_dict:
+                if profiler.enabled:
+                    new_template_dict = self._profiled_template_dict(new_template_dict,
+                                                                     f"{type(plugin).__name__} {template_name}")
+                for entry in new_template_dict:
+                    entries.setdefault(entry, []).append(new_template_dict)
             else:
                 pass
                 # Too much output
                 # console.log(f"Could not get template dict for {template} file in plugin {plugin} - {interface_name}")
+        # Values are computed when the template reads them. Entries in several plugins are concatenated in order.
+        template_dict = TemplateDict()
+        for entry, template_dicts in entries.items():
+            if len(template_dicts) == 1:
+                template_dict[entry] = functools.partial(template_dicts[0].__getitem__, entry)
+            else:
+                template_dict[entry] = functools.partial(concatenate_values, entry, template_dicts)
         return template_dict
 
 
+    @staticmethod
+    def _profiled_template_dict(template_dict, name):
+        """
+        Return a TemplateDict with the values of template_dict computed inside a profiler span, as they are computed
+        while rendering
+        """
+        profiled = TemplateDict()
+        for entry in template_dict:
+            profiled[entry] = functools.partial(profiler.call, name, 'template value', template_dict.__getitem__, entry)
+        return profiled
+
+
 class ComponentTemplatesManager(AbstractTemplatesManager):
     def __init__(self, component, plugins):
         super(ComponentTemplatesManager, self).__init__(component, plugins)
@@ -152,34 +478,37 @@ class ComponentTemplatesManager(AbstractTemplatesManager):
         # Generate regular files
         #
         new_existing_files = {}
+        self.written_files, self.unchanged_files, self.outputs = [], [], {}
+        render_jobs = []
         for template_file in self.files['regular']:
             if self._pre_generation_check(template_file): continue
             if template_file == 'README-RCNODE.txt' and not self._need_storm(): continue
             if template_file == 'src/mainUI.ui' and self.ast.gui is None: continue
 
             ofile = self._output_file_rename(output_path, template_file)
+            if self._skip_output(ofile): continue
 
-            if template_file in self.files['avoid_overwrite'] and os.path.exists(ofile):
-                console.print(':eye:  Not overwriting specific file "' + ofile + '", saving it to ' + ofile + '.new', style='yellow')
-                new_existing_files[os.path.abspath(ofile)] = os.path.abspath(ofile) + '.new'
-                ofile += '.new'
+            kind = 'generated'
+            if template_file in self.files['avoid_overwrite']:
+                kind = 'specific'
+                if os.path.exists(ofile):
+                    console.print(':eye:  Not overwriting specific file "' + ofile + '", saving it to ' + ofile + '.new', style='yellow')
+                    new_existing_files[os.path.abspath(ofile)] = os.path.abspath(ofile) + '.new'
+                    ofile += '.new'
+                    kind = 'new'
 
             ifile = os.path.join(TEMPLATES_DIR, self.files['template_path'], template_file)
-            console.print(f":thumbs_up: Generating {ofile}", style='green')
-            try:
-                self._template_to_file(ifile, ofile)
-            except ValueError as e:
-                console.print(e)
-            self._post_generation_action(template_file, ofile)
+            render_jobs.append(RenderJob(template_file, ifile, ofile, None, kind))
 
         for interface in self.ast.implements + self.ast.subscribesTo:
             if communication_is_ice(interface):
                 for template_file in self.files['servant_files']:
                     ofile = os.path.join(output_path, 'src', interface.name.lower() + 'I.' + template_file.split('.')[
                         -1].lower())
-                    console.print(':thumbs_up: Generating %s (servant for %s)' % (ofile, interface.name), style='green')
+                    if self._skip_output(ofile): continue
                     ifile = os.path.join(TEMPLATES_DIR, self.files['template_path'], template_file)
-                    self._template_to_file(ifile, ofile, interface.name)
+                    render_jobs.append(RenderJob(template_file, ifile, ofile, interface.name, 'generated'))
+        self._run_render_jobs(render_jobs)
         return new_existing_files
 
     def _output_file_rename(self, output_path, template_file):
@@ -205,6 +534,7 @@ class InterfaceTemplateManager(AbstractTemplatesManager):
         # Generate regular files
         #
         new_existing_files = {}
+        self.written_files, self.unchanged_files, self.outputs = [], [], {}
         for template_file in self.files['regular']:
             if output_path.endswith('.ice'):
                 pass
@@ -226,7 +556,6 @@ class InterfaceTemplateManager(AbstractTemplatesManager):
             #     ofile += '.new'
 
             ifile = os.path.join(TEMPLATES_DIR, self.files['template_path'], template_file)
-            console.print(f":thumbs_up: Generating {ofile}", style='green')
             self._template_to_file(ifile, ofile)
 
             self._post_generation_action(template_file, ofile)
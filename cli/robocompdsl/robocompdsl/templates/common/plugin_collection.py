@@ -1,10 +1,178 @@
-import inspect
+import ast
+import atexit
+import importlib
+import importlib.util
+import json
 import os
 import pkgutil
-import importlib.util
 import sys
+import tempfile
+from pathlib import Path
+
+from robocompdsl.common.profiler import profiler
+from robocompdsl.dsl_parsers.dsl_cache import DEFAULT_CACHE_DIR
+from robocompdsl.logger import logger
+
+PLUGIN_MANIFEST_FORMAT_VERSION = 2
+DEFAULT_PLUGIN_MANIFEST_FILE = Path(os.getenv('ROBOCOMPDSL_CACHE_DIR', DEFAULT_CACHE_DIR)) / "plugins" / "manifest.json"
+
+
+def _defined_subclasses(source_path, base_name):
+    """
+    Return the names of the classes defined in the python file source_path that directly inherit from a class named
+    base_name. The file is parsed, not imported.
+    """
+    try:
+        with open(source_path, 'r') as reader:
+            tree = ast.parse(reader.read(), filename=source_path)
+    except (OSError, SyntaxError, ValueError) as e:
+        logger.debug(f"Could not parse {source_path} looking for {base_name} classes: {e}")
+        return []
+    classes = []
+    for node in tree.body:
+        if isinstance(node, ast.ClassDef):
+            for base in node.bases:
+                name = base.id if isinstance(base, ast.Name) else getattr(base, 'attr', None)
+                if name == base_name and node.name != base_name:
+                    classes.append(node.name)
+                    break
+    return classes
+
+
+class PluginManifest:
+    """
+    Index of the plugin classes of each plugin package and of the TemplateDict classes found in the functions
+    directory of each plugin. It's built parsing the source files instead of importing them, kept in memory and saved
+    to manifest_file at exit. An entry is rebuilt only when the mtime of any of the files or directories it was built
+    from changes.
+    """
+    def __init__(self, manifest_file=None):
+        self.manifest_file = Path(manifest_file) if manifest_file is not None else DEFAULT_PLUGIN_MANIFEST_FILE
+        self._manifest = None
+        self._modified = False
+
+    def plugins(self, plugin_package):
+        """
+        Return a list of (module name, class name) for the Plugin subclasses found under plugin_package. The entry
+        is kept by the package name and its absolute directories, so different installs of the package don't share it.
+        """
+        package_paths = [os.path.abspath(path) for path in importlib.import_module(plugin_package).__path__]
+        entry = self._get_entry('packages', os.pathsep.join([plugin_package] + package_paths),
+                                lambda key, mtimes: self._find_plugins(plugin_package, package_paths, mtimes))
+        return [tuple(plugin) for plugin in entry['plugins']]
 
-from robocompdsl.templates.common.templatedict import TemplateDict
+    def template_dicts(self, plugin_path):
+        """
+        Return a dict from the path relative to plugin_path/functions of each functions file to a tuple with the
+        absolute path of the file and the name of the TemplateDict class defined in it.
+        """
+        entry = self._get_entry('functions', os.path.abspath(plugin_path), self._find_template_dicts)
+        return {relative_path: tuple(value) for relative_path, value in entry['files'].items()}
+
+    def _get_entry(self, section, key, builder):
+        if self._manifest is None:
+            self._manifest = self._load()
+        entry = self._manifest[section].get(key)
+        if entry is None or not self._is_valid(entry):
+            mtimes = {}
+            entry = builder(key, mtimes)
+            entry['mtimes'] = mtimes
+            self._manifest[section][key] = entry
+            if not self._modified:
+                self._modified = True
+                atexit.register(self.save)
+        return entry
+
+    @staticmethod
+    def _is_valid(entry):
+        try:
+            return all(os.stat(path).st_mtime_ns == mtime for path, mtime in entry['mtimes'].items())
+        except OSError:
+            return False
+
+    def _find_plugins(self, plugin_package, package_paths, mtimes):
+        """
+        Walk the package_paths directories of plugin_package looking for modules with Plugin subclasses. Packages and
+        modules are visited in the same order the plugins were imported before having this manifest.
+        """
+        plugins = []
+        seen_paths = []
+
+        def walk(package, package_paths):
+            for package_path in package_paths:
+                mtimes[package_path] = os.stat(package_path).st_mtime_ns
+            for module_finder, module_name, ispkg in pkgutil.iter_modules(package_paths, package + '.'):
+                if not ispkg:
+                    source_path = os.path.join(module_finder.path, module_name.rsplit('.', 1)[-1] + ".py")
+                    if not os.path.isfile(source_path):
+                        continue
+                    mtimes[source_path] = os.stat(source_path).st_mtime_ns
+                    for class_name in _defined_subclasses(source_path, 'Plugin'):
+                        plugins.append([module_name, class_name])
+            for package_path in package_paths:
+                if package_path not in seen_paths:
+                    seen_paths.append(package_path)
+                    for child in os.listdir(package_path):
+                        child_path = os.path.join(package_path, child)
+                        if child != '__pycache__' and os.path.isdir(child_path):
+                            walk(package + '.' + child, [child_path])
+
+        walk(plugin_package, package_paths)
+        return {'plugins': plugins}
+
+    @staticmethod
+    def _find_template_dicts(plugin_path, mtimes):
+        files = {}
+        functions_path = os.path.join(plugin_path, "functions")
+        # the plugin directory mtime changes if the functions directory is created or removed
+        mtimes[plugin_path] = os.stat(plugin_path).st_mtime_ns
+        for root, dirs, filenames in os.walk(functions_path):
+            dirs[:] = sorted(d for d in dirs if d != '__pycache__')
+            mtimes[root] = os.stat(root).st_mtime_ns
+            for filename in sorted(filenames):
+                if not filename.endswith(".py"):
+                    continue
+                source_path = os.path.join(root, filename)
+                mtimes[source_path] = os.stat(source_path).st_mtime_ns
+                classes = _defined_subclasses(source_path, 'TemplateDict')
+                if classes:
+                    relative_path = os.path.relpath(source_path, functions_path)
+                    # Same class inspect.getmembers returned last for the module
+                    files[relative_path] = [source_path, max(classes)]
+        return {'files': files}
+
+    def _load(self):
+        empty = {'packages': {}, 'functions': {}}
+        try:
+            with open(self.manifest_file, 'r') as reader:
+                manifest = json.load(reader)
+        except FileNotFoundError:
+            return empty
+        except (OSError, ValueError) as e:
+            logger.debug(f"Discarding invalid plugin manifest {self.manifest_file}: {e}")
+            return empty
+        if not isinstance(manifest, dict) or manifest.get('version') != PLUGIN_MANIFEST_FORMAT_VERSION:
+            return empty
+        return {'packages': manifest.get('packages', {}), 'functions': manifest.get('functions', {})}
+
+    def save(self):
+        """
+        Write the manifest file if any entry was rebuilt. Errors are only logged.
+        """
+        if not self._modified:
+            return
+        try:
+            self.manifest_file.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=self.manifest_file.parent, suffix=".tmp")
+            with os.fdopen(fd, 'w') as writer:
+                json.dump(dict(version=PLUGIN_MANIFEST_FORMAT_VERSION, **self._manifest), writer)
+            os.replace(tmp_path, self.manifest_file)
+            self._modified = False
+        except OSError as e:
+            logger.debug(f"Could not write the plugin manifest to {self.manifest_file}: {e}")
+
+
+plugin_manifest = PluginManifest()
 
 
 class Plugin(object):
@@ -14,6 +182,7 @@ class Plugin(object):
 
     def __init__(self):
         self.classes = {}
+        self.template_dict_files = {}
         self.description = 'UNKNOWN'
 
     def load_module_from_path(self, module_name, path):
@@ -26,33 +195,41 @@ class Plugin(object):
         return module
 
     def load_functions(self):
-        for root, dirs, files in os.walk(self.abs_path + "/functions"):
-            for file in files:
-                relative_path = root.replace(self.abs_path + "/functions", '')
-                if relative_path and relative_path[0] == os.sep: relative_path = relative_path[1:]
-                relative_path = os.path.join(relative_path, file)
-                if relative_path not in self.classes:
-                    try:
-                        module_name = self.__class__.__name__+"_"+relative_path.replace('/','_').split('.')[0]
-                        module = self.load_module_from_path(module_name, os.path.join(root, file))
-                    except AssertionError as e:
-                        print(f"ERROR AssertionError: {e}")
-                    except ValueError as e:
-                        print(f"ERROR ValueError: {e}")
-                        
-                    for _, the_class in inspect.getmembers(module, lambda x: inspect.isclass(x) and issubclass(x, TemplateDict) and x.__name__!="TemplateDict"):
-                        # print(f"Loading plugin: {relative_path}")
-                        self.classes[relative_path] = the_class
-        if len(self.classes) == 0:
+        """Look up in the plugin manifest the TemplateDict classes of the functions directory. Their modules are
+        only loaded when a template requests them with get_template_dict.
+        """
+        self.template_dict_files = plugin_manifest.template_dicts(self.abs_path)
+        if len(self.template_dict_files) == 0:
             raise ValueError(f"Could not find any file for plugin from {self.abs_path} {self.classes}")
 
+    def get_template_dict_class(self, relative_path):
+        """Return the TemplateDict class for the functions file in relative_path, loading its module if needed.
+        """
+        if relative_path not in self.classes:
+            path, class_name = self.template_dict_files[relative_path]
+            try:
+                module_name = self.__class__.__name__+"_"+relative_path.replace('/','_').split('.')[0]
+                with profiler.span(f"{self.__class__.__name__} {relative_path}", 'plugin load'):
+                    module = self.load_module_from_path(module_name, path)
+            except AssertionError as e:
+                print(f"ERROR AssertionError: {e}")
+                return None
+            except ValueError as e:
+                print(f"ERROR ValueError: {e}")
+                return None
+            self.classes[relative_path] = getattr(module, class_name)
+        return self.classes[relative_path]
+
     def get_template_dict(self, file, ast, interface_name=None):
         file = file.replace(".", "_")+".py"
-        if file in self.classes:
+        if file in self.template_dict_files:
+            the_class = self.get_template_dict_class(file)
+            if the_class is None:
+                return {}
             if interface_name:
-                return self.classes[file](ast, interface_name)
+                return the_class(ast, interface_name)
             else:
-                return self.classes[file](ast)
+                return the_class(ast)
         else:
             return {}
 
@@ -64,6 +241,17 @@ class PluginCollection(list):
     Upon creation, this class will read the plugins package for modules
     that contain a class definition that is inheriting from the Plugin class
     """
+    _loaded_collections = {}
+
+    @classmethod
+    def for_package(cls, plugin_package):
+        """Return the collection of plugins of a package, shared by all the
+        templates managers. Plugins are only loaded the first time it's requested.
+        """
+        if plugin_package not in cls._loaded_collections:
+            with profiler.span(plugin_package, 'plugin load'):
+                cls._loaded_collections[plugin_package] = cls(plugin_package)
+        return cls._loaded_collections[plugin_package]
 
     def __init__(self, plugin_package):
         """Constructor that initiates the reading of all available plugins
@@ -77,13 +265,13 @@ class PluginCollection(list):
 
 
     def reload_plugins(self):
-        """Reset the list of all plugins and initiate the walk over the main
-        provided plugin package to load all available plugins
+        """Reset the list of all plugins and instantiate the plugin classes that the plugin manifest lists
+        for the main provided plugin package
         """
-        self.seen_paths = []
-        # print()
-        # print(f'Looking for plugins under package {self.plugin_package}')
-        self.walk_package(self.plugin_package)
+        self.clear()
+        for module_name, class_name in plugin_manifest.plugins(self.plugin_package):
+            plugin_module = importlib.import_module(module_name)
+            self.append(getattr(plugin_module, class_name)())
 
 
     def apply_all_plugins_on_value(self, argument):
@@ -93,36 +281,3 @@ class PluginCollection(list):
         # print(f'Applying all plugins on value {argument}:')
         for plugin in self:
             print(f'    Applying {plugin.description} on value {argument} yields value {plugin.perform_operation(argument)}')
-
-    def walk_package(self, package):
-        """Recursively walk the supplied package to retrieve all plugins
-        """
-        imported_package = __import__(package, fromlist=['blah'])
-        for _, pluginname, ispkg in pkgutil.iter_modules(imported_package.__path__, imported_package.__name__ + '.'):
-            if not ispkg:
-                plugin_module = __import__(pluginname, fromlist=['blah'])
-                clsmembers = inspect.getmembers(plugin_module, inspect.isclass)
-                for (_, c) in clsmembers:
-                    # Only add classes that are a sub class of Plugin, but NOT Plugin itself
-                    if issubclass(c, Plugin) & (c is not Plugin):
-                        # print(f'    Found plugin class: {c.__module__}.{c.__name__}')
-                        self.append(c())
-
-            # Now that we have looked at all the modules in the current package, start looking
-            # recursively for additional modules in sub packages
-        all_current_paths = []
-        if isinstance(imported_package.__path__, str):
-            all_current_paths.append(imported_package.__path__)
-        else:
-            all_current_paths.extend([x for x in imported_package.__path__])
-
-        for pkg_path in all_current_paths:
-            if pkg_path not in self.seen_paths:
-                self.seen_paths.append(pkg_path)
-
-                # Get all sub directory of the current package path directory
-                child_pkgs = [p for p in os.listdir(pkg_path) if os.path.isdir(os.path.join(pkg_path, p))]
-
-                # For each sub directory, apply the walk_package method recursively
-                for child_pkg in child_pkgs:
-                    self.walk_package(package + '.' + child_pkg)
\ No newline at end of file
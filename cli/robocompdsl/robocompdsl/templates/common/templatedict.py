@@ -1,9 +1,50 @@
 
 
 class TemplateDict(dict):
+    """
+    Dict with the values for the identifiers of a template file.
+    A value can be set as a callable without arguments (usually a bound method of the TemplateDict). It's called the
+    first time its key is read and replaced by the result, so only the identifiers used by the template are computed,
+    and only once.
+    """
     def __init__(self):
         super(TemplateDict, self).__init__()
 
+    def __getitem__(self, key):
+        value = super(TemplateDict, self).__getitem__(key)
+        if callable(value):
+            value = value()
+            super(TemplateDict, self).__setitem__(key, value)
+        return value
+
+    def __iter__(self):
+        # Overriding __iter__ makes dict(), update() and ** unpacking read the values through __getitem__
+        return super(TemplateDict, self).__iter__()
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def items(self):
+        return [(key, self[key]) for key in self]
+
+    def values(self):
+        return [self[key] for key in self]
+
+    def __repr__(self):
+        return repr(dict(self.items()))
+
+
+def concatenate_values(key, template_dicts):
+    """
+    Return the value of key in the first template dict concatenated with the values in the others
+    """
+    value = template_dicts[0][key]
+    for template_dict in template_dicts[1:]:
+        value += template_dict[key]
+    return value
+
 class CustomString(str):
 
     def __new__(cls, value, *args, **kwargs):
@@ -86,7 +86,7 @@ int GenericMonitor::timeAwake()
 */
 RoboCompCommonBehavior::ParameterList GenericMonitor::getParameterList()
 {
-	return config_params;
+	${parameter_list}
 }
 /**
 * \brief Change configurations parameters to worker
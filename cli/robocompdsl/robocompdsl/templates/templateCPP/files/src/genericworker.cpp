@@ -100,6 +100,7 @@ int GenericWorker::getPeriod(STATES state)
         std::cerr << "Invalid state parameter." << std::endl << std::flush;
         return -1;
     }
+	${compute_period}
 	return states[state]->getPeriod();
 }
 
@@ -139,3 +140,4 @@ void GenericWorker::hibernationCheck()
 }
 
 ${agm_methods}
+${scheduled_compute_method}
@@ -42,6 +42,9 @@ ${agm_includes}
 ${ice_proxies_map}
 
 ${agm_behaviour_parameter_struct}
+${batch_publisher}
+${compute_scheduler}
+${servant_metrics}
 
 class GenericWorker : ${inherited_object}
 {
@@ -63,6 +66,8 @@ public:
 	${agm_methods}
 
 	${create_proxies}
+	${compute_scheduler_attribute}
+	${servant_metrics_attribute}
 
 	${implements}
 	${subscribes}
@@ -12,7 +12,7 @@ class src_CMakeLists_txt(TemplateDict):
     def __init__(self, component):
         super(src_CMakeLists_txt, self).__init__()
         self.component = component
-        self['agm_includes'] = self.agm_includes()
+        self['agm_includes'] = self.agm_includes
 
 
     def agm_includes(self):
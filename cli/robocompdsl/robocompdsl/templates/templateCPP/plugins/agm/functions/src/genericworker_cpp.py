@@ -118,7 +118,7 @@ class genericworker_cpp(TemplateDict):
     def __init__(self, component):
         super(genericworker_cpp, self).__init__()
         self.component = component
-        self['agm_methods'] = self.agm_methods()
+        self['agm_methods'] = self.agm_methods
 
 
 
@@ -28,10 +28,10 @@ class genericworker_h(TemplateDict):
     def __init__(self, component):
         super(genericworker_h, self).__init__()
         self.component = component
-        self['agm_includes'] = self.agm_includes()
-        self['agm_behaviour_parameter_struct'] = self.agm_behaviour_parameter_struct()
-        self['agm_methods'] = self.agm_methods()
-        self['agm_attributes_creation'] = self.agm_attributes_creation()
+        self['agm_includes'] = self.agm_includes
+        self['agm_behaviour_parameter_struct'] = self.agm_behaviour_parameter_struct
+        self['agm_methods'] = self.agm_methods
+        self['agm_attributes_creation'] = self.agm_attributes_creation
 
     def agm_includes(self):
         result = ""
@@ -93,9 +93,9 @@ class specificworker_cpp(TemplateDict):
     def __init__(self, component):
         super(specificworker_cpp, self).__init__()
         self.component = component
-        self['agmagent_attributes'] = self.agmagent_attributes()
-        self['agm_innermodel_association'] = self.agm_innermodel_association()
-        self['agm_specific_code'] = self.agm_specific_code()
+        self['agmagent_attributes'] = self.agmagent_attributes
+        self['agm_innermodel_association'] = self.agm_innermodel_association
+        self['agm_specific_code'] = self.agm_specific_code
 
 
     def agmagent_attributes(self):
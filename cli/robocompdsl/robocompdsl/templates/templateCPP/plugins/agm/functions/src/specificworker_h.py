@@ -9,8 +9,8 @@ class specificworker_h(TemplateDict):
     def __init__(self, component):
         super(specificworker_h, self).__init__()
         self.component = component
-        self['agmagent_comment'] = self.agmagent_comment()
-        self['agm_attributes'] = self.agm_attributes()
+        self['agmagent_comment'] = self.agmagent_comment
+        self['agm_attributes'] = self.agm_attributes
 
     def agmagent_comment(self):
         result = ""
@@ -12,6 +12,16 @@ ${ret} ${interface_name}I::${method_name}(${input_params})
 }
 """
 
+# With the ServantMetrics option the latency and the errors of the calls are recorded in the servant metrics of the worker
+TIMED_INTERFACE_METHOD_STR = """
+${ret} ${interface_name}I::${method_name}(${input_params})
+{
+	static MethodMetrics &metrics = worker->servantMetrics.method("${interface_name}.${method_name}");
+	MethodTimer timer(metrics);
+	${to_return}worker->${interface_name}_${method_name}(${param_str});
+}
+"""
+
 class SERVANT_H(TemplateDict):
     def __init__(self, component, interface_name):
         super(SERVANT_H, self).__init__()
@@ -49,11 +59,12 @@ class SERVANT_H(TemplateDict):
                             delim = ', '
                         param_str_b += delim + p['name']
 
-                    result += Template(INTERFACE_METHOD_STR).substitute(ret=ret,
-                                                                        interface_name=interface['name'],
-                                                                        method_name=name,
-                                                                        input_params=param_str_a,
-                                                                        to_return="return " if ret != "void" else "",
-                                                                        param_str=param_str_b
-                                                                        )
+                    method_str = TIMED_INTERFACE_METHOD_STR if self.component.options.servantmetrics else INTERFACE_METHOD_STR
+                    result += Template(method_str).substitute(ret=ret,
+                                                              interface_name=interface['name'],
+                                                              method_name=name,
+                                                              input_params=param_str_a,
+                                                              to_return="return " if ret != "void" else "",
+                                                              param_str=param_str_b
+                                                              )
         return result
\ No newline at end of file
@@ -12,10 +12,13 @@ class etc_config(TemplateDict):
     def __init__(self, component):
         super(etc_config, self).__init__()
         self.component = component
-        self['config_implements_endpoints'] = self.config_implements_endpoints()
-        self['config_subscribes_endpoints'] = self.config_subscribes_endpoints()
-        self['config_requires_proxies'] = self.config_requires_proxies()
-        self['storm_topic_manager'] = self.storm_topic_manager()
+        self['config_implements_endpoints'] = self.config_implements_endpoints
+        self['config_subscribes_endpoints'] = self.config_subscribes_endpoints
+        self['config_requires_proxies'] = self.config_requires_proxies
+        self['storm_topic_manager'] = self.storm_topic_manager
+        self['config_batched_topics'] = self.config_batched_topics
+        self['config_compute_scheduler'] = self.config_compute_scheduler
+        self['config_servant_metrics'] = self.config_servant_metrics
 
     def config_implements_endpoints(self):
         result = ""
@@ -48,6 +51,30 @@ class etc_config(TemplateDict):
             result = '# Proxies for required interfaces\n' + result + '\n\n'
         return result
 
+    def config_batched_topics(self):
+        result = ""
+        for name in self.component.batched_publishes:
+            result += f"{name}.BatchFlushPeriod=10\n{name}.BatchFlushSize=100\n"
+        if result != "":
+            result = '\n# Flush period (ms) and size (messages) of the batched topics, 0 disables each of them\n' + result + '\n'
+        return result
+
+    def config_compute_scheduler(self):
+        result = ""
+        if self.component.compute_scheduler:
+            result += '\n# Scheduling of compute(): FixedRate (calls at multiples of the period) or MaxRate (calls as soon\n' \
+                      '# as the previous one ends, up to one per period)\n'
+            result += "Compute.Mode=FixedRate\n"
+        return result
+
+    def config_servant_metrics(self):
+        result = ""
+        if self.component.options.servantmetrics:
+            result += '\n# Period (s) of the dumps of the servant metrics to the file, 0 to disable them\n'
+            result += "ServantMetrics.DumpPeriod=10\n"
+            result += "ServantMetrics.DumpFile=servant_metrics.txt\n"
+        return result
+
     def storm_topic_manager(self):
         result = ""
         if len(self.component.publishes + self.component.subscribesTo) > 0:
@@ -8,8 +8,8 @@ class src_CMakeLists_txt(TemplateDict):
         super().__init__()
         self.component = component
         self['component_name'] = self.component.name
-        self['interface_sources'] = self.interface_sources()
-        self['wrap_ice'] = self.wrap_ice()
+        self['interface_sources'] = self.interface_sources
+        self['wrap_ice'] = self.wrap_ice
 
     def interface_sources(self):
         result = ""
@@ -0,0 +1,16 @@
+from robocompdsl.templates.common.templatedict import TemplateDict
+
+
+class src_genericmonitor_cpp(TemplateDict):
+    def __init__(self, component):
+        super(src_genericmonitor_cpp, self).__init__()
+        self.component = component
+        self['parameter_list'] = self.parameter_list
+
+    def parameter_list(self):
+        if self.component.compute_scheduler:
+            # The statistics are added to a copy, config_params only keeps the parameters of the config file
+            return "RoboCompCommonBehavior::ParameterList params = config_params;\n" \
+                   "worker->scheduler.addStatistics(params);\n" \
+                   "return params;\n"
+        return "return config_params;\n"
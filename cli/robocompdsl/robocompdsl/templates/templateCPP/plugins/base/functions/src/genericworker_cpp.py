@@ -6,18 +6,38 @@ from robocompdsl.templates.common.templatedict import TemplateDict
 
 CPP_TYPES = ['int', 'float', 'bool', 'void']
 
+SCHEDULED_COMPUTE_METHOD_STR = """\
+/**
+* \\brief Run compute() measured by the scheduler, which sets the time to wait in the Compute state for the next call
+*/
+void GenericWorker::scheduledCompute()
+{
+	scheduler.begin(this->period);
+	compute();
+	states[STATES::Compute]->setPeriod(scheduler.end());
+}
+"""
+
+# The Compute state waits the delay given by the scheduler, so its period is kept by the worker
+COMPUTE_PERIOD_STR = """\
+if (state == STATES::Compute)
+	return this->period;
+"""
+
 class genericworker_cpp(TemplateDict):
     def __init__(self, component):
         super(genericworker_cpp, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
-        self['constructor_proxies'] = self.constructor_proxies()
-        self['inherited_constructor'] = self.inherited_constructor()
-        self['require_and_publish_proxies_creation'] = self.require_and_publish_proxies_creation()
-        self['state_statemachine'] = self.state_statemachine()        
-        self['transition_statemachine'] = self.transition_statemachine()
-        self['add_state_statemachine'] = self.add_state_statemachine()
-        self['configure_statemachine'] = self.configure_statemachine()
+        self['constructor_proxies'] = self.constructor_proxies
+        self['inherited_constructor'] = self.inherited_constructor
+        self['require_and_publish_proxies_creation'] = self.require_and_publish_proxies_creation
+        self['state_statemachine'] = self.state_statemachine
+        self['transition_statemachine'] = self.transition_statemachine
+        self['add_state_statemachine'] = self.add_state_statemachine
+        self['configure_statemachine'] = self.configure_statemachine
+        self['compute_period'] = self.compute_period
+        self['scheduled_compute_method'] = self.scheduled_compute_method
 
     def require_and_publish_proxies_creation(self):
         result = ""
@@ -71,7 +91,8 @@ class genericworker_cpp(TemplateDict):
         if self.component.statemachine_path is None:
             result += 'states.resize(STATES::NumberOfStates);\n'
             result += 'states[STATES::Initialize] = new GRAFCETStep("Initialize", BASIC_PERIOD, nullptr, std::bind(&GenericWorker::initialize, this));\n'
-            result += 'states[STATES::Compute] = new GRAFCETStep("Compute", BASIC_PERIOD, std::bind(&GenericWorker::compute, this));\n'
+            compute = "scheduledCompute" if self.component.compute_scheduler else "compute"
+            result += f'states[STATES::Compute] = new GRAFCETStep("Compute", BASIC_PERIOD, std::bind(&GenericWorker::{compute}, this));\n'
             result += 'states[STATES::Emergency] = new GRAFCETStep("Emergency", BASIC_PERIOD, std::bind(&GenericWorker::emergency, this));\n'
             result += 'states[STATES::Restore] = new GRAFCETStep("Restore", BASIC_PERIOD, nullptr, std::bind(&GenericWorker::restore, this));\n'
         return result
@@ -99,4 +120,14 @@ class genericworker_cpp(TemplateDict):
         if self.component.statemachine_path is None:
             result += "statemachine.setChildMode(QState::ExclusiveStates);;\n"
             result += "statemachine.setInitialState(states[STATES::Initialize]);\n"
-        return result
\ No newline at end of file
+        return result
+
+    def compute_period(self):
+        if self.component.compute_scheduler:
+            return COMPUTE_PERIOD_STR
+        return ""
+
+    def scheduled_compute_method(self):
+        if self.component.compute_scheduler:
+            return SCHEDULED_COMPUTE_METHOD_STR
+        return ""
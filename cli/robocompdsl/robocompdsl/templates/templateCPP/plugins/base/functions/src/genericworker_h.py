@@ -5,22 +5,361 @@ from robocompdsl.templates.templateCPP.plugins.base.functions import function_ut
 from robocompdsl.templates.common.templatedict import TemplateDict
 
 
+BATCH_PUBLISHER_STR = """
+#include <atomic>
+#include <chrono>
+#include <condition_variable>
+#include <mutex>
+#include <thread>
+
+// Publisher of a topic sending its messages in batches through an ice_batchOneway proxy, flushed every flushPeriod ms
+// or when flushSize messages are waiting, a period or size of 0 disables that flush. Only the messages sent with publish() are counted and flushed by size, the
+// ones sent directly through the proxy are flushed periodically.
+template <typename P>
+class BatchPublisher
+{
+public:
+	~BatchPublisher()
+	{
+		stop();
+	}
+
+	void start(P batchProxy, int flushPeriod, unsigned int flushSize)
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		proxy = batchProxy;
+		size = flushSize;
+		running = true;
+		flusher = std::thread([this, flushPeriod]
+		{
+			std::unique_lock<std::mutex> lock(mutex);
+			// Without a period the batch is only flushed by size and when stopping
+			if (flushPeriod > 0)
+			{
+				while (!wakeUp.wait_for(lock, std::chrono::milliseconds(flushPeriod), [this] { return !running; }))
+					flushLocked();
+			}
+			else
+				wakeUp.wait(lock, [this] { return !running; });
+			flushLocked();
+		});
+	}
+
+	void stop()
+	{
+		{
+			std::lock_guard<std::mutex> lock(mutex);
+			running = false;
+		}
+		wakeUp.notify_all();
+		if (flusher.joinable())
+			flusher.join();
+	}
+
+	// Publish a message calling the function with the proxy: publish([&](auto prx) { prx->method(data); });
+	template <typename F>
+	void publish(F &&call)
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		call(proxy);
+		batched++;
+		pending++;
+		if (size > 0 and pending >= size)
+			flushLocked();
+	}
+
+	void flush()
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		flushLocked();
+	}
+
+	P proxy;
+	std::atomic<uint64_t> batched{0};
+	std::atomic<uint64_t> flushed{0};
+
+private:
+	void flushLocked()
+	{
+		if (not proxy)
+			return;
+		proxy->ice_flushBatchRequests();
+		if (pending > 0)
+			flushed++;
+		pending = 0;
+	}
+
+	unsigned int size = 0;
+	unsigned int pending = 0;
+	bool running = false;
+	std::mutex mutex;
+	std::condition_variable wakeUp;
+	std::thread flusher;
+};
+"""
+
+COMPUTE_SCHEDULER_STR = """
+#include <algorithm>
+#include <chrono>
+#include <cmath>
+#include <mutex>
+#include <string>
+
+// Scheduler of compute() measuring its duration, the delay of each call from its scheduled time (jitter) and the
+// calls ending after the next one was due (overruns). In FixedRate mode the calls are due at multiples of the period,
+// without drift, and the periods already missed by an overrun are skipped. In MaxRate mode the next call starts as
+// soon as the previous one ends, but no sooner than one period after its start.
+class ComputeScheduler
+{
+public:
+	enum class Mode { FixedRate, MaxRate };
+	using Clock = std::chrono::steady_clock;
+
+	void begin(int period)
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		start = Clock::now();
+		if (calls == 0 or period != currentPeriod)
+		{
+			// first call or new period
+			deadline = start;
+			currentPeriod = period;
+		}
+		totalJitter += std::abs(milliseconds(start - deadline));
+		if (mode == Mode::MaxRate)
+			deadline = start;
+	}
+
+	// Return the delay in ms of the next call
+	int end()
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		auto now = Clock::now();
+		auto period = std::chrono::milliseconds(currentPeriod);
+		lastDuration = milliseconds(now - start);
+		maxDuration = std::max(maxDuration, lastDuration);
+		totalDuration += lastDuration;
+		calls++;
+		Clock::time_point next = deadline + period;
+		if (now > next)
+		{
+			overruns++;
+			if (mode == Mode::FixedRate and currentPeriod > 0)
+			{
+				auto skipped = (now - deadline) / period;
+				missed += skipped;
+				next = deadline + (skipped + 1) * period;
+			}
+			else
+				next = now;
+		}
+		deadline = next;
+		return std::chrono::duration_cast<std::chrono::milliseconds>(next - now).count();
+	}
+
+	// Add the statistics, with the times in ms, to the parameters as read only Compute.* parameters
+	void addStatistics(RoboCompCommonBehavior::ParameterList &params)
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		double count = std::max<uint64_t>(calls, 1);
+		addParameter(params, "mode", mode == Mode::FixedRate ? "FixedRate" : "MaxRate", "string");
+		addParameter(params, "period", std::to_string(currentPeriod), "int");
+		addParameter(params, "calls", std::to_string(calls), "int");
+		addParameter(params, "overruns", std::to_string(overruns), "int");
+		addParameter(params, "missed", std::to_string(missed), "int");
+		addParameter(params, "last_duration", std::to_string(lastDuration), "float");
+		addParameter(params, "mean_duration", std::to_string(totalDuration / count), "float");
+		addParameter(params, "max_duration", std::to_string(maxDuration), "float");
+		addParameter(params, "jitter", std::to_string(totalJitter / count), "float");
+	}
+
+	Mode mode = Mode::FixedRate;
+
+private:
+	static double milliseconds(Clock::duration duration)
+	{
+		return std::chrono::duration<double, std::milli>(duration).count();
+	}
+
+	static void addParameter(RoboCompCommonBehavior::ParameterList &params, const std::string &name,
+							 const std::string &value, const std::string &type)
+	{
+		RoboCompCommonBehavior::Parameter param;
+		param.editable = false;
+		param.value = value;
+		param.type = type;
+		params["Compute." + name] = param;
+	}
+
+	std::mutex mutex;
+	Clock::time_point start, deadline;
+	int currentPeriod = 0;
+	uint64_t calls = 0, overruns = 0, missed = 0;
+	double lastDuration = 0, maxDuration = 0, totalDuration = 0, totalJitter = 0;
+};
+"""
+
+SERVANT_METRICS_STR = """
+#include <array>
+#include <atomic>
+#include <bit>
+#include <chrono>
+#include <condition_variable>
+#include <exception>
+#include <fstream>
+#include <iomanip>
+#include <map>
+#include <mutex>
+#include <sstream>
+#include <string>
+#include <thread>
+
+// Calls, errors and latency histogram of a method of the servants. The latencies are counted in buckets with
+// log-spaced upper bounds of 1, 2, 4 ... 2^(BUCKETS - 2) us, the last bucket counting the slower calls.
+class MethodMetrics
+{
+public:
+	static const int BUCKETS = 25;
+
+	void record(std::chrono::steady_clock::duration latency, bool error)
+	{
+		uint64_t microseconds = std::chrono::duration_cast<std::chrono::microseconds>(latency).count();
+		int bucket = std::min<int>(std::bit_width(std::max<uint64_t>(microseconds, 1) - 1), BUCKETS - 1);
+		calls++;
+		if (error)
+			errors++;
+		total += microseconds;
+		buckets[bucket]++;
+	}
+
+	std::atomic<uint64_t> calls{0}, errors{0}, total{0};
+	std::array<std::atomic<uint64_t>, BUCKETS> buckets{};
+};
+
+// Record the latency of a call when it goes out of scope, as an error if an exception is being thrown
+class MethodTimer
+{
+public:
+	explicit MethodTimer(MethodMetrics &_metrics) : metrics(_metrics), exceptions(std::uncaught_exceptions()) {}
+
+	~MethodTimer()
+	{
+		metrics.record(std::chrono::steady_clock::now() - start, std::uncaught_exceptions() > exceptions);
+	}
+
+private:
+	MethodMetrics &metrics;
+	int exceptions;
+	std::chrono::steady_clock::time_point start = std::chrono::steady_clock::now();
+};
+
+// Metrics of all the methods of the servants, reported on demand or dumped periodically to a file
+class ServantMetrics
+{
+public:
+	~ServantMetrics()
+	{
+		stopDump();
+	}
+
+	MethodMetrics &method(const std::string &name)
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		return methods[name];
+	}
+
+	// One line for each method with its calls, errors, mean latency, upper bounds of the 50 and 99 percentiles and
+	// the non empty buckets of its histogram, all the times in us
+	std::string report()
+	{
+		std::lock_guard<std::mutex> lock(mutex);
+		std::ostringstream result;
+		for (auto &[name, metrics] : methods)
+		{
+			uint64_t calls = metrics.calls;
+			if (calls == 0)
+				continue;
+			std::ostringstream histogram;
+			std::string p50, p99;
+			uint64_t count = 0;
+			for (int bucket = 0; bucket < MethodMetrics::BUCKETS; bucket++)
+			{
+				uint64_t bucketCalls = metrics.buckets[bucket];
+				if (bucketCalls == 0)
+					continue;
+				histogram << (count > 0 ? "," : "") << bucketBound(bucket) << ":" << bucketCalls;
+				count += bucketCalls;
+				if (p50.empty() and count >= 0.5 * calls)
+					p50 = bucketBound(bucket);
+				if (p99.empty() and count >= 0.99 * calls)
+					p99 = bucketBound(bucket);
+			}
+			result << name << " calls=" << calls << " errors=" << metrics.errors << " mean=" << std::fixed
+				   << std::setprecision(1) << double(metrics.total) / calls << " p50<=" << p50 << " p99<=" << p99
+				   << " histogram=" << histogram.str() << "\\n";
+		}
+		return result.str();
+	}
+
+	// Write the report to the file every period seconds
+	void startDump(const std::string &path, int period)
+	{
+		dumping = true;
+		dumper = std::thread([this, path, period]
+		{
+			std::unique_lock<std::mutex> lock(dumpMutex);
+			while (!wakeUp.wait_for(lock, std::chrono::seconds(period), [this] { return !dumping; }))
+				std::ofstream(path) << report();
+		});
+	}
+
+	void stopDump()
+	{
+		{
+			std::lock_guard<std::mutex> lock(dumpMutex);
+			dumping = false;
+		}
+		wakeUp.notify_all();
+		if (dumper.joinable())
+			dumper.join();
+	}
+
+private:
+	static std::string bucketBound(int bucket)
+	{
+		return bucket < MethodMetrics::BUCKETS - 1 ? std::to_string(uint64_t(1) << bucket) : "inf";
+	}
+
+	std::mutex mutex, dumpMutex;
+	std::map<std::string, MethodMetrics> methods;
+	bool dumping = false;
+	std::condition_variable wakeUp;
+	std::thread dumper;
+};
+"""
+
+
 class genericworker_h(TemplateDict):
 
     def __init__(self, component):
         super(genericworker_h, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
-        self['interfaces_includes'] = self.interfaces_includes()
+        self['interfaces_includes'] = self.interfaces_includes
         # self['namespaces'] = self.namespaces()
-        self['ice_proxies_map'] = self.ice_proxies_map()
-        self['inherited_object'] = self.inherited_object()
-        self['constructor_proxies'] = self.constructor_proxies()
-        self['create_proxies'] = self.create_proxies()
-        self['implements'] = self.implements()
-        self['subscribes'] = self.subscribes()
-        self['virtual_statemachine'] = self.virtual_statemachine()
-        self['signal_statemachine'] = self.signal_statemachine()
+        self['ice_proxies_map'] = self.ice_proxies_map
+        self['inherited_object'] = self.inherited_object
+        self['constructor_proxies'] = self.constructor_proxies
+        self['create_proxies'] = self.create_proxies
+        self['batch_publisher'] = self.batch_publisher
+        self['compute_scheduler'] = self.compute_scheduler
+        self['compute_scheduler_attribute'] = self.compute_scheduler_attribute
+        self['servant_metrics'] = self.servant_metrics
+        self['servant_metrics_attribute'] = self.servant_metrics_attribute
+        self['implements'] = self.implements
+        self['subscribes'] = self.subscribes
+        self['virtual_statemachine'] = self.virtual_statemachine
+        self['signal_statemachine'] = self.signal_statemachine
 
 
 
@@ -80,8 +419,36 @@ class genericworker_h(TemplateDict):
                     result += f"{proxy_type}Prx {iface.name.lower()}{num}_pubproxy;\n"
                 else:
                     result += f"{proxy_type}PrxPtr {iface.name.lower()}{num}_pubproxy;\n"
+                if iface.name in self.component.batched_publishes:
+                    prx_suffix = "Prx" if self.component.language.lower() == "cpp" else "PrxPtr"
+                    result += f"BatchPublisher<{proxy_type}{prx_suffix}> {iface.name.lower()}{num}_batch;\n"
         return result
 
+    def batch_publisher(self):
+        if self.component.batched_publishes:
+            return BATCH_PUBLISHER_STR
+        return ""
+
+    def compute_scheduler(self):
+        if self.component.compute_scheduler:
+            return COMPUTE_SCHEDULER_STR
+        return ""
+
+    def compute_scheduler_attribute(self):
+        if self.component.compute_scheduler:
+            return "ComputeScheduler scheduler;\nvoid scheduledCompute();\n"
+        return ""
+
+    def servant_metrics(self):
+        if self.component.options.servantmetrics:
+            return SERVANT_METRICS_STR
+        return ""
+
+    def servant_metrics_attribute(self):
+        if self.component.options.servantmetrics:
+            return "ServantMetrics servantMetrics;\n"
+        return ""
+
     #TODO: check if it can be mixed with the subscribes methodd. Are too similar.
     def implements(self):
         result = ""
@@ -148,6 +148,36 @@ rInfo("<NORMAL>Proxy<PROXYNUMBER> initialized Ok!");
 
 """
 
+BATCH_PUBLISHER_START_STR = """
+// The messages of ${name} are sent in batches flushed every ${name}.BatchFlushPeriod ms or ${name}.BatchFlushSize messages
+{
+	string flushPeriod, flushSize;
+	GenericMonitor::configGetString(communicator(), prefix, "${name}.BatchFlushPeriod", flushPeriod, "10");
+	GenericMonitor::configGetString(communicator(), prefix, "${name}.BatchFlushSize", flushSize, "100");
+	worker->${lower}_batch.start(${lower}_pubproxy, std::stoi(flushPeriod), std::stoul(flushSize));
+}
+"""
+
+COMPUTE_SCHEDULER_MODE_STR = """
+// compute() is scheduled in Compute.Mode: FixedRate or MaxRate
+{
+	string mode;
+	GenericMonitor::configGetString(communicator(), prefix, "Compute.Mode", mode, "FixedRate");
+	worker->scheduler.mode = mode == "MaxRate" ? ComputeScheduler::Mode::MaxRate : ComputeScheduler::Mode::FixedRate;
+}
+"""
+
+SERVANT_METRICS_DUMP_STR = """
+// The servant metrics are written to ServantMetrics.DumpFile every ServantMetrics.DumpPeriod seconds
+{
+	string dumpPeriod, dumpFile;
+	GenericMonitor::configGetString(communicator(), prefix, "ServantMetrics.DumpPeriod", dumpPeriod, "0");
+	GenericMonitor::configGetString(communicator(), prefix, "ServantMetrics.DumpFile", dumpFile, "servant_metrics.txt");
+	if (std::stoi(dumpPeriod) > 0)
+		worker->servantMetrics.startDump(dumpFile, std::stoi(dumpPeriod));
+}
+"""
+
 UNSUBSCRIBE_STR = """
 try
 {
@@ -171,17 +201,17 @@ class src_main_cpp(TemplateDict):
         self['subscribes_interface_includes'] = self.interface_includes(self.component.subscribesTo, 'I', True)
         self['imports_interface_includes'] = self.interface_includes(self.component.recursiveImports)
         self['interface_includes'] = self.interface_includes(self.component.recursiveImports)
-        self['proxies_map_creation'] = self.proxies_map_creation()
+        self['proxies_map_creation'] = self.proxies_map_creation
         self['publishes_proxy_ptr'] = self.proxy_ptr(self.component.publishes, 'pub')
-        self['requires'] = self.requires()
+        self['requires'] = self.requires
         self['requires_proxy_ptr'] = self.proxy_ptr(self.component.requires)
-        self['topic_manager_creation'] = self.topic_manager_creation()
-        self['publish'] = self.publish()
-        self['specificworker_creation'] = self.specificworker_creation()
-        self['commonbehaviorI_creation'] = self.commonbehaviorI_creation()
-        self['implements'] = self.implements()
-        self['subscribes_to'] = self.subscribes_to()
-        self['unsubscribe_code'] = self.unsubscribe_code()
+        self['topic_manager_creation'] = self.topic_manager_creation
+        self['publish'] = self.publish
+        self['specificworker_creation'] = self.specificworker_creation
+        self['commonbehaviorI_creation'] = self.commonbehaviorI_creation
+        self['implements'] = self.implements
+        self['subscribes_to'] = self.subscribes_to
+        self['unsubscribe_code'] = self.unsubscribe_code
 
     @staticmethod
     def interface_includes(interfaces, suffix='', lower=False):
@@ -246,12 +276,13 @@ class src_main_cpp(TemplateDict):
                 result += PUBLISHES_STR.replace("<NORMAL>", pb).replace("<LOWER>", pb.lower())
                 module = self.component.idsl_pool.module_providing_interface(pb)
                 proxy_type = utils.get_type_string(pb, module['name'])
+                oneway = "ice_batchOneway" if pb in self.component.batched_publishes else "ice_oneway"
                 if self.component.language.lower() == "cpp":
-                    result += "Ice::ObjectPrx " + pb.lower() + "_pub = " + pb.lower() + "_topic->getPublisher()->ice_oneway();\n"
+                    result += "Ice::ObjectPrx " + pb.lower() + "_pub = " + pb.lower() + "_topic->getPublisher()->" + oneway + "();\n"
                     result += "" + pb.lower() + "_pubproxy = " + proxy_type + "Prx::uncheckedCast(" + pb.lower() + "_pub);\n"
                     result += "mprx[\"" + pb + "Pub\"] = (::IceProxy::Ice::Object*)(&" + pb.lower() + "_pubproxy);\n"
                 else:
-                    result += "auto " + pb.lower() + "_pub = " + pb.lower() + "_topic->getPublisher()->ice_oneway();\n"
+                    result += "auto " + pb.lower() + "_pub = " + pb.lower() + "_topic->getPublisher()->" + oneway + "();\n"
                     result += "" + pb.lower() + "_pubproxy = Ice::uncheckedCast<RoboComp"+pb+"::" + pb + "Prx>(" + pb.lower() + "_pub);\n"
         return result
 
@@ -328,6 +359,12 @@ class src_main_cpp(TemplateDict):
             else:
                 result += "tprx = std::tuple<>();\n"
         result += "SpecificWorker *worker = new SpecificWorker({}prx, startup_check_flag);\n".format(var_name)
+        for name in self.component.batched_publishes:
+            result += Template(BATCH_PUBLISHER_START_STR).substitute(name=name, lower=name.lower())
+        if self.component.compute_scheduler:
+            result += COMPUTE_SCHEDULER_MODE_STR
+        if self.component.options.servantmetrics:
+            result += SERVANT_METRICS_DUMP_STR
         return result
 
     def unsubscribe_code(self):
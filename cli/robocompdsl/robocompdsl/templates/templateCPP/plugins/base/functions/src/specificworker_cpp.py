@@ -74,14 +74,14 @@ class specificworker_cpp(TemplateDict):
         super(specificworker_cpp, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
-        self['proxy_map_type'] = self.proxy_map_type()
-        self['proxy_map_name'] = self.proxy_map_name()
-        self['compute_method'] = self.compute_method()
-        self['emergency_method'] = self.emergency_method()
-        self['restore_method'] = self.restore_method()
-        self['implements'] = self.implements()
-        self['subscribes'] = self.subscribes()
-        self['interface_specific_comment'] = self.interface_specific_comment()
+        self['proxy_map_type'] = self.proxy_map_type
+        self['proxy_map_name'] = self.proxy_map_name
+        self['compute_method'] = self.compute_method
+        self['emergency_method'] = self.emergency_method
+        self['restore_method'] = self.restore_method
+        self['implements'] = self.implements
+        self['subscribes'] = self.subscribes
+        self['interface_specific_comment'] = self.interface_specific_comment
 
 
 
@@ -9,10 +9,10 @@ class specificworker_h(TemplateDict):
         super(specificworker_h, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
-        self['constructor_proxies'] = self.constructor_proxies()
-        self['implements_method_definitions'] = self.implements_method_definitions()
-        self['subscribes_method_definitions'] = self.subscribes_method_definitions()
-        self['state_machine_method'] = self.state_machine_method()
+        self['constructor_proxies'] = self.constructor_proxies
+        self['implements_method_definitions'] = self.implements_method_definitions
+        self['subscribes_method_definitions'] = self.subscribes_method_definitions
+        self['state_machine_method'] = self.state_machine_method
 
 
     def generate_interface_method_definition(self, interface):
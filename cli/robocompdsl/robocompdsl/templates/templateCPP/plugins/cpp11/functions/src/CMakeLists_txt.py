@@ -12,7 +12,7 @@ class src_CMakeLists_txt(TemplateDict):
     def __init__(self, component):
         super().__init__()
         self.component = component
-        self['cpp11_ice_packages'] = self.cpp11_ice_packages()
+        self['cpp11_ice_packages'] = self.cpp11_ice_packages
 
     def cpp11_ice_packages(self):
         result = ""
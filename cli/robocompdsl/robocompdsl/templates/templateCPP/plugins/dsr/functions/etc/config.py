@@ -18,7 +18,7 @@ class etc_config(TemplateDict):
     def __init__(self, component):
         super(etc_config, self).__init__()
         self.component = component
-        self['dsr_config'] = self.dsr_config()
+        self['dsr_config'] = self.dsr_config
 
     def dsr_config(self):
         result = ""
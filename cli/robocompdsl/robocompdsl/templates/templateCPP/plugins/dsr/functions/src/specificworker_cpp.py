@@ -80,9 +80,9 @@ class specificworker_cpp(TemplateDict):
     def __init__(self, component):
         super(specificworker_cpp, self).__init__()
         self.component = component
-        self['dsr_destructor'] = self.dsr_destructor()
-        self['dsr_set_params'] = self.dsr_set_params()
-        self['dsr_initialize'] = self.dsr_initialize()
+        self['dsr_destructor'] = self.dsr_destructor
+        self['dsr_set_params'] = self.dsr_set_params
+        self['dsr_initialize'] = self.dsr_initialize
 
     def dsr_destructor(self):
         result = ""
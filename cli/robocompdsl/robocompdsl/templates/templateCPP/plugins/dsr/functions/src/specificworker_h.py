@@ -41,9 +41,9 @@ class specificworker_h(TemplateDict):
     def __init__(self, component):
         super(specificworker_h, self).__init__()
         self.component = component
-        self['dsr_includes'] = self.dsr_includes()
-        self['dsr_attributes'] = self.dsr_attributes()
-        self['dsr_slots'] = self.dsr_slots()
+        self['dsr_includes'] = self.dsr_includes
+        self['dsr_attributes'] = self.dsr_attributes
+        self['dsr_slots'] = self.dsr_slots
 
 
     def dsr_includes(self):
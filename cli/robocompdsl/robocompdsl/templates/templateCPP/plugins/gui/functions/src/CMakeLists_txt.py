@@ -7,7 +7,7 @@ class src_CMakeLists_txt(TemplateDict):
     def __init__(self, component):
         super().__init__()
         self.component = component
-        self['wrap_ui'] = self.wrap_ui()
+        self['wrap_ui'] = self.wrap_ui
 
     def wrap_ui(self):
         result = ""
@@ -15,7 +15,7 @@ class genericworker_cpp(TemplateDict):
     def __init__(self, component):
         super(genericworker_cpp, self).__init__()
         self.component = component
-        self['gui_setup'] = self.gui_setup()
+        self['gui_setup'] = self.gui_setup
 
     def gui_setup(self):
         result = ""
@@ -15,7 +15,7 @@ class genericworker_h(TemplateDict):
     def __init__(self, component):
         super(genericworker_h, self).__init__()
         self.component = component
-        self['gui_includes'] = self.gui_includes()
+        self['gui_includes'] = self.gui_includes
 
 
     def gui_includes(self):
@@ -24,8 +24,8 @@ class specificworker_cpp(TemplateDict):
     def __init__(self, component):
         super(specificworker_cpp, self).__init__()
         self.component = component
-        self['innermodelviewer_code'] = self.innermodelviewer_code()
-        self['innermodel_and_viewer_attribute_init'] = self.innermodel_and_viewer_attribute_init()
+        self['innermodelviewer_code'] = self.innermodelviewer_code
+        self['innermodel_and_viewer_attribute_init'] = self.innermodel_and_viewer_attribute_init
 
     def innermodelviewer_code(self):
         result = ""
@@ -31,10 +31,10 @@ class specificworker_h(TemplateDict):
     def __init__(self, component):
         super(specificworker_h, self).__init__()
         self.component = component
-        self['innermodel_include'] = self.innermodel_include()
-        self['innermodelviewer_includes'] = self.innermodelviewer_includes()
-        self['innermodel_attribute'] = self.innermodel_attribute()
-        self['innermodelviewer_attributes'] = self.innermodelviewer_attributes()
+        self['innermodel_include'] = self.innermodel_include
+        self['innermodelviewer_includes'] = self.innermodelviewer_includes
+        self['innermodel_attribute'] = self.innermodel_attribute
+        self['innermodelviewer_attributes'] = self.innermodelviewer_attributes
 
     def innermodel_attribute(self):
         result = ""
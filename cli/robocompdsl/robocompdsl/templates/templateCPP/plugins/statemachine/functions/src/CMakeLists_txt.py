@@ -13,7 +13,7 @@ class src_CMakeLists_txt(TemplateDict):
     def __init__(self, component):
         super().__init__()
         self.component = component
-        self['statemachine_visual_sources'] = self.statemachine_visual_sources()
+        self['statemachine_visual_sources'] = self.statemachine_visual_sources
 
 
     def statemachine_visual_sources(self):
@@ -32,7 +32,7 @@ class genericworker_cpp(TemplateDict):
     def __init__(self, component):
         super(genericworker_cpp, self).__init__()
         self.component = component
-        self['statemachine_initialization'] = self.statemachine_initialization()
+        self['statemachine_initialization'] = self.statemachine_initialization
 
     @staticmethod
     def _statemachine_state_is_parallel(state, substates):
@@ -11,10 +11,10 @@ class genericworker_h(TemplateDict):
     def __init__(self, component):
         super(genericworker_h, self).__init__()
         self.component = component
-        self['statemachine_includes'] = self.statemachine_includes()
-        self['statemachine_creation'] = self.statemachine_creation()
-        self['statemachine_slots'] = self.statemachine_slots()
-        self['statemachine_signals'] = self.statemachine_signals()
+        self['statemachine_includes'] = self.statemachine_includes
+        self['statemachine_creation'] = self.statemachine_creation
+        self['statemachine_slots'] = self.statemachine_slots
+        self['statemachine_signals'] = self.statemachine_signals
 
     def statemachine_includes(self):
         result = ""
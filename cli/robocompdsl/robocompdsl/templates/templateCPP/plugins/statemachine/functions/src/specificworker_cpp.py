@@ -25,10 +25,10 @@ class specificworker_cpp(TemplateDict):
     def __init__(self, component):
         super(specificworker_cpp, self).__init__()
         self.component = component
-        self['statemachine_finalize_emit'] = self.statemachine_finalize_emit()
-        self['state_machine_start'] = self.state_machine_start()
-        self['statemachine_initialize_to_compute'] = self.statemachine_initialize_to_compute()
-        self['statemachine_methods_creation'] = self.statemachine_methods_creation()
+        self['statemachine_finalize_emit'] = self.statemachine_finalize_emit
+        self['state_machine_start'] = self.state_machine_start
+        self['statemachine_initialize_to_compute'] = self.statemachine_initialize_to_compute
+        self['statemachine_methods_creation'] = self.statemachine_methods_creation
 
     def statemachine_methods_creation(self):
         sm_implementation = ""
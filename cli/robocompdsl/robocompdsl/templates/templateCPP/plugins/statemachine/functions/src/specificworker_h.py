@@ -8,7 +8,7 @@ class specificworker_h(TemplateDict):
     def __init__(self, component):
         super(specificworker_h, self).__init__()
         self.component = component
-        self['statemachine_methods_definitions'] = self.statemachine_methods_definitions()
+        self['statemachine_methods_definitions'] = self.statemachine_methods_definitions
 
 
     @staticmethod
@@ -25,7 +25,7 @@ class TemplatesManagerCpp(ComponentTemplatesManager):
             'servant_files': ["SERVANT.H", "SERVANT.CPP"],
             'template_path': "templateCPP/files/"
         }
-        current_plugins = PluginCollection(plugins.__name__)
+        current_plugins = PluginCollection.for_package(plugins.__name__)
         super(TemplatesManagerCpp, self).__init__(component, current_plugins)
 
 
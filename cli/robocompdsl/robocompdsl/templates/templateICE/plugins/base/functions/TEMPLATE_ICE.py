@@ -52,9 +52,9 @@ class TEMPLATE_ICE(TemplateDict):
         self['module_filename'] = os.path.basename(module['filename']).split('.')[0]
         self['module_file'] = os.path.basename(module['filename'])
         self['module_name_upper'] = module['name'].upper()
-        self['ice_imports'] = self.ice_imports()
-        self['ice_types'] = self.ice_types()
-        self['ice_interfaces'] = self.ice_interfaces()
+        self['ice_imports'] = self.ice_imports
+        self['ice_types'] = self.ice_types
+        self['ice_interfaces'] = self.ice_interfaces
 
     def ice_imports(self):
         result = ""
@@ -11,5 +11,5 @@ class TemplateManagerIce(InterfaceTemplateManager):
                 ],
                 'template_path': "templateICE/files/"
         }
-        current_plugins = PluginCollection(plugins.__name__)
+        current_plugins = PluginCollection.for_package(plugins.__name__)
         super(TemplateManagerIce, self).__init__(module, current_plugins)
@@ -28,10 +28,12 @@ except KeyError:
     print('$$ROBOCOMP environment variable not set, using the default value /opt/robocomp')
     ROBOCOMP = '/opt/robocomp'
 
-Ice.loadSlice("-I ./src/ --all ./src/CommonBehavior.ice")
+${common_behavior_slice_loading}
 import RoboCompCommonBehavior
 
 ${ui_import}
+${compute_scheduler}
+${servant_metrics}
 
 
 
@@ -50,6 +52,8 @@ class GenericWorker(${qt_class_type}):
         self.mutex = QtCore.QMutex()
         self.Period = 30
         self.timer = QtCore.QTimer(self)
+        ${compute_scheduler_creation}
+        ${servant_metrics_creation}
 
         ${statemachine_states_creation}
 
@@ -1,3 +1,4 @@
+import threading
 import time
 import Ice
 import IceStorm
@@ -8,6 +9,9 @@ console = Console()
 ${load_slice_and_create_imports}
 
 ${create_lists_classes}
+${numpy_helpers}
+${async_proxies}
+${batch_publisher}
 
 ${implements_and_subscribes_imports}
 
@@ -43,6 +47,7 @@ class Publishes:
 
     def get_proxies_map(self):
         return self.mprx
+    ${create_batch_topic}
 
 
 class Requires:
@@ -74,9 +79,18 @@ class Requires:
 
 
 class Subscribes:
+    # Retry delays (s) of the topics that can't be retrieved or created yet
+    FIRST_RETRY_DELAY = 0.1
+    MAX_RETRY_DELAY = 2.
+
     def __init__(self, ice_connector, topic_manager, default_handler):
         self.ice_connector = ice_connector
         self.topic_manager = topic_manager
+        # Seconds to keep retrying the subscriptions
+        self.deadline = ice_connector.getProperties().getPropertyAsIntWithDefault("Subscribes.Deadline", 30)
+        self.setup_times = {}
+        self.failed = []
+        self.subscriptions = []
         ${subscribes_adapters_creation}
 
     def create_adapter(self, property_name, interface_handler):
@@ -84,24 +98,47 @@ class Subscribes:
         handler = interface_handler
         proxy = adapter.addWithUUID(handler).ice_oneway()
         topic_name = property_name.replace('Topic','')
-        subscribe_done = False
-        while not subscribe_done:
+        # The topics are subscribed in the background, so the worker can start meanwhile
+        subscription = threading.Thread(target=self.subscribe, args=(topic_name, adapter, proxy), daemon=True)
+        subscription.start()
+        self.subscriptions.append(subscription)
+        return adapter
+
+    def subscribe(self, topic_name, adapter, proxy):
+        start = time.monotonic()
+        delay = self.FIRST_RETRY_DELAY
+        while True:
             try:
-                topic = self.topic_manager.retrieve(topic_name)
-                subscribe_done = True
-            except Ice.Exception as e:
-                console.log("Error. Topic does not exist (creating)", style="blue")
-                time.sleep(1)
                 try:
+                    topic = self.topic_manager.retrieve(topic_name)
+                except IceStorm.NoSuchTopic:
+                    console.log(f"Topic {topic_name} does not exist (creating)", style="blue")
                     topic = self.topic_manager.create(topic_name)
-                    subscribe_done = True
-                except:
-                    console.log(f"Error. Topic {Text(topic_name, style='red')} could not be created. Exiting")
-                    status = 0
-        qos = {}
-        topic.subscribeAndGetPublisher(qos, proxy)
+                qos = {}
+                topic.subscribeAndGetPublisher(qos, proxy)
+                break
+            except Ice.CommunicatorDestroyedException:
+                return
+            except Ice.Exception as e:
+                if time.monotonic() - start + delay > self.deadline:
+                    console.log(f"Error. Topic {Text(topic_name, style='red')} could not be subscribed in {self.deadline} s, "
+                                f"the component keeps running without it: {e}")
+                    self.failed.append(topic_name)
+                    return
+                time.sleep(delay)
+                delay = min(delay * 2, self.MAX_RETRY_DELAY)
         adapter.activate()
-        return adapter
+        self.setup_times[topic_name] = time.monotonic() - start
+        console.log(f"Subscribed to {topic_name} in {self.setup_times[topic_name]:.3f} s", style="green")
+
+    def wait(self, timeout=None):
+        """
+        Wait up to timeout seconds for the pending subscriptions, returning True if all of them succeeded
+        """
+        end = None if timeout is None else time.monotonic() + timeout
+        for subscription in self.subscriptions:
+            subscription.join(None if end is None else max(0., end - time.monotonic()))
+        return not self.failed and len(self.setup_times) == len(self.subscriptions)
 
 
 class Implements:
@@ -148,6 +185,16 @@ class InterfaceManager:
         self.implements = Implements(self.ice_connector, handler)
         self.subscribes = Subscribes(self.ice_connector, self.topic_manager, handler)
 
+    def wait_subscriptions(self, timeout=None):
+        """
+        Wait up to timeout seconds for the topics subscribed in the background and return the names of the ones that
+        couldn't be subscribed before the Subscribes.Deadline of the config. The component keeps running without them.
+        """
+        if self.subscribes is None:
+            return []
+        self.subscribes.wait(timeout)
+        return list(self.subscribes.failed)
+
     def get_proxies_map(self):
         result = {}
         result.update(self.requires.get_proxies_map())
@@ -155,6 +202,7 @@ class InterfaceManager:
         return result
 
     def destroy(self):
+        ${close_batch_topics}
         if self.ice_connector:
             self.ice_connector.destroy()
 
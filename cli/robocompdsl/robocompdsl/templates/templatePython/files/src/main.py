@@ -88,6 +88,8 @@ if __name__ == '__main__':
         sys.exit(-1)
 
     interface_manager.set_default_hanlder(worker)
+    ${common_behavior_adapter}
+    ${servant_metrics_dump}
     signal.signal(signal.SIGINT, sigint_handler)
     app.exec_()
     interface_manager.destroy()
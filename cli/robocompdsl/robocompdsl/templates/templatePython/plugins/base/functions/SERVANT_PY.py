@@ -1,9 +1,7 @@
 import datetime
 from string import Template
 from robocompdsl.templates.common.templatedict import TemplateDict
-SLICE_LOAD_STR = """\
-Ice.loadSlice("-I ./src/ --all ./src/${interface_name}.ice")
-"""
+from robocompdsl.templates.templatePython.plugins.base.functions import function_utils as utils
 
 
 INTERFACE_METHOD_STR = """
@@ -11,6 +9,19 @@ def ${method_name}(self, ${params_str_a}c):
     return self.worker.${interface_name}_${method_name}(${params_str_b})
 """
 
+# With the ServantMetrics option the latency and the errors of the calls are recorded in the servant metrics of the worker
+TIMED_INTERFACE_METHOD_STR = """
+def ${method_name}(self, ${params_str_a}c):
+    start = time.perf_counter()
+    try:
+        result = self.worker.${interface_name}_${method_name}(${params_str_b})
+    except Exception:
+        self.worker.servant_metrics.record("${interface_name}.${method_name}", time.perf_counter() - start, error=True)
+        raise
+    self.worker.servant_metrics.record("${interface_name}.${method_name}", time.perf_counter() - start)
+    return result
+"""
+
 
 class SERVANT_PY(TemplateDict):
     def __init__(self, component, interface_name):
@@ -20,18 +31,19 @@ class SERVANT_PY(TemplateDict):
         if module is None:
             raise ValueError(' Can\'t locate %s' % interface_name)
         self['year'] = str(datetime.date.today().year)
-        self['slice_loading'] = self.slice_loading(interface_name)
-        self['interface_methods'] = self.interface_methods(module, interface_name)
+        self['slice_loading'] = self.slice_loading(module, interface_name)
+        self['interface_methods'] = self.interface_methods(module, interface_name, self.component.options.servantmetrics)
+        self['servant_metrics_import'] = "import time" if self.component.options.servantmetrics else ""
         self['module_name'] = module['name']
         self['iface_name'] = interface_name
 
-    @staticmethod
-    def slice_loading(interface_name):
-        result = Template(SLICE_LOAD_STR).substitute(interface_name=interface_name)
+    def slice_loading(self, module, interface_name):
+        result = utils.slices_dir_setup(self.component)
+        result += utils.slice_loading(self.component, interface_name, module['name'])
         return result
 
     @staticmethod
-    def interface_methods(module, interface_name):
+    def interface_methods(module, interface_name, timed=False):
         result = ""
         for interface in module['interfaces']:
             if interface['name'] == interface_name:
@@ -53,8 +65,9 @@ class SERVANT_PY(TemplateDict):
                                 delim = ', '
                             param_str_b += delim + p['name']
 
-                    result += Template(INTERFACE_METHOD_STR).substitute(method_name=name,
-                                                                        params_str_a=param_str_a,
-                                                                        interface_name=interface_name,
-                                                                        params_str_b=param_str_b)
+                    method_str = TIMED_INTERFACE_METHOD_STR if timed else INTERFACE_METHOD_STR
+                    result += Template(method_str).substitute(method_name=name,
+                                                              params_str_a=param_str_a,
+                                                              interface_name=interface_name,
+                                                              params_str_b=param_str_b)
         return result
@@ -27,10 +27,13 @@ class etc_config(TemplateDict):
     def __init__(self, component):
         super(TemplateDict, self).__init__()
         self.component = component
-        self['config_implements_endpoints'] = self.config_implements_endpoints()
-        self['config_subscribes_endpoints'] = self.config_subscribes_endpoints()
-        self['config_requires_proxies'] = self.config_requires_proxies()
-        self['storm_topic_manager'] = self.storm_topic_manager()
+        self['config_implements_endpoints'] = self.config_implements_endpoints
+        self['config_subscribes_endpoints'] = self.config_subscribes_endpoints
+        self['config_requires_proxies'] = self.config_requires_proxies
+        self['storm_topic_manager'] = self.storm_topic_manager
+        self['config_batched_topics'] = self.config_batched_topics
+        self['config_compute_scheduler'] = self.config_compute_scheduler
+        self['config_servant_metrics'] = self.config_servant_metrics
 
     def config_requires_proxies(self):
         result = ""
@@ -49,6 +52,32 @@ class etc_config(TemplateDict):
             result = '# Proxies for required interfaces\n' + result + '\n\n'
         return result
 
+    def config_batched_topics(self):
+        result = ""
+        for name in self.component.batched_publishes:
+            result += f"{name}.BatchFlushPeriod=10\n{name}.BatchFlushSize=100\n"
+        if result != "":
+            result = '\n# Flush period (ms) and size (messages) of the batched topics, 0 disables each of them\n' + result + '\n'
+        return result
+
+    def config_compute_scheduler(self):
+        result = ""
+        if self.component.compute_scheduler:
+            result += '\n# Endpoints of the CommonBehavior interface serving the compute statistics\n'
+            result += f"CommonBehavior.Endpoints=tcp -p {random.randint(10001, 19000)}\n"
+            result += '# Scheduling of compute(): FixedRate (calls at multiples of the period) or MaxRate (calls as soon\n' \
+                      '# as the previous one ends, up to one per period)\n'
+            result += "Compute.Mode=FixedRate\n"
+        return result
+
+    def config_servant_metrics(self):
+        result = ""
+        if self.component.options.servantmetrics:
+            result += '\n# Period (s) of the dumps of the servant metrics to the file, 0 to disable them\n'
+            result += "ServantMetrics.DumpPeriod=10\n"
+            result += "ServantMetrics.DumpFile=servant_metrics.txt\n"
+        return result
+
     def storm_topic_manager(self):
         result = ""
         if len(self.component.publishes + self.component.subscribesTo) > 0:
@@ -78,5 +107,8 @@ class etc_config(TemplateDict):
                     port = random.randint(10001, 19000)
                 result += interface.name + f"Topic.Endpoints=tcp -p {port}\n"
         if result != "":
-            result = '# Endpoints for subscriptions interfaces\n' + result + '\n\n'
+            result = '# Endpoints for subscriptions interfaces\n' + result
+            result += '# Seconds to keep retrying the subscriptions of the topics. The component keeps running without the\n' \
+                      '# ones not subscribed by then, see InterfaceManager.wait_subscriptions\n'
+            result += "Subscribes.Deadline=30\n\n\n"
         return result
@@ -1,7 +1,46 @@
 
 
+from string import Template
+
 PYTHON_TYPES = ['bool', 'float', 'int', 'long', 'str', 'double', 'byte']
 
+SLICE_LOAD_STR = """\
+Ice.loadSlice("-I ./src/ --all ./src/${ice_name}.ice")
+"""
+
+# With the PrecompiledSlices option the modules generated by slice2py at build time are imported, and only the ones
+# not found are loaded from the .ice files
+SLICES_DIR_STR = """\
+import os
+import sys
+# Modules precompiled from the .ice files with slice2py by the slices target of src/CMakeLists.txt
+SLICES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "slices")
+if os.path.isdir(SLICES_DIR) and SLICES_DIR not in sys.path:
+    sys.path.insert(0, SLICES_DIR)
+"""
+
+PRECOMPILED_SLICE_LOAD_STR = """\
+if not os.path.isdir(os.path.join(SLICES_DIR, "${module_name}")):
+    Ice.loadSlice("-I ./src/ --all ./src/${ice_name}.ice")
+"""
+
+
+def slices_dir_setup(component):
+    """
+    Return the code adding the directory of the precompiled slices to the python path, if the component uses them
+    """
+    return SLICES_DIR_STR if component.options.precompiledslices else ""
+
+
+def slice_loading(component, ice_name, module_name):
+    """
+    Return the code loading the module_name defined in the ice_name.ice file
+    """
+    if component.options.precompiledslices:
+        return Template(PRECOMPILED_SLICE_LOAD_STR).substitute(ice_name=ice_name, module_name=module_name)
+    return Template(SLICE_LOAD_STR).substitute(ice_name=ice_name)
+
+
 def get_parameters_string(method, module_name, language):
     param_str = ""
     for p in method['params']:
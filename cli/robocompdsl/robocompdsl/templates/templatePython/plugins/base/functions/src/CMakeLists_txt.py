@@ -1,6 +1,29 @@
+from string import Template
+
 from robocompdsl.dsl_parsers.parsing_utils import communication_is_ice
 from robocompdsl.templates.common.templatedict import TemplateDict
 
+PRECOMPILED_SLICES_STR = """
+# Python modules of the interfaces precompiled with slice2py, imported by the component instead of loading the .ice
+# files every time it starts
+FIND_PROGRAM( SLICE2PY_EXECUTABLE slice2py )
+IF( SLICE2PY_EXECUTABLE )
+  SET( SLICE_FILES ${ice_files} )
+  ADD_CUSTOM_COMMAND(
+    OUTPUT $${CMAKE_CURRENT_SOURCE_DIR}/slices/.stamp
+    COMMAND $${CMAKE_COMMAND} -E make_directory $${CMAKE_CURRENT_SOURCE_DIR}/slices
+    COMMAND $${SLICE2PY_EXECUTABLE} -I$${CMAKE_CURRENT_SOURCE_DIR} --output-dir $${CMAKE_CURRENT_SOURCE_DIR}/slices $${SLICE_FILES}
+    COMMAND $${CMAKE_COMMAND} -E touch $${CMAKE_CURRENT_SOURCE_DIR}/slices/.stamp
+    DEPENDS $${SLICE_FILES}
+    WORKING_DIRECTORY $${CMAKE_CURRENT_SOURCE_DIR}
+    COMMENT "Precompiling the interfaces with slice2py"
+  )
+  ADD_CUSTOM_TARGET( slices ALL DEPENDS $${CMAKE_CURRENT_SOURCE_DIR}/slices/.stamp )
+ELSE()
+  MESSAGE( WARNING "slice2py not found. The component will load the .ice files when it starts" )
+ENDIF()
+"""
+
 
 class src_CMakeLists_txt(TemplateDict):
     def __init__(self, component):
@@ -13,3 +36,10 @@ class src_CMakeLists_txt(TemplateDict):
                 interface_names.append(name)
         self['ifaces_list'] = ' '.join(interface_names)
         self['component_name'] = self.component.name
+        self['precompiled_slices'] = self.precompiled_slices(interface_names)
+
+    def precompiled_slices(self, interface_names):
+        if not self.component.options.precompiledslices:
+            return ""
+        ice_files = ' '.join(name + ".ice" for name in dict.fromkeys(['CommonBehavior'] + interface_names))
+        return Template(PRECOMPILED_SLICES_STR).substitute(ice_files=ice_files)
@@ -2,9 +2,200 @@ import datetime
 
 from robocompdsl.dsl_parsers.parsing_utils import communication_is_ice, get_name_number
 from robocompdsl.templates.common.templatedict import TemplateDict
+from robocompdsl.templates.templatePython.plugins.base.functions import function_utils as utils
 
+# With the ComputeScheduler option compute() is run by a ComputeScheduler and its statistics are served with the
+# CommonBehavior interface
+COMPUTE_SCHEDULER_STR = """
+import time
 
 
+class ComputeScheduler:
+    \"\"\"
+    Run compute() from the single shot timer of the worker, measuring its duration, the delay of each call from its
+    scheduled time (jitter) and the calls ending after the next one was due (overruns). In FixedRate mode the calls
+    are due at multiples of the period, without drift, and the periods already missed by an overrun are skipped. In
+    MaxRate mode the next call starts as soon as the previous one ends, but no sooner than one period after its start.
+    \"\"\"
+    FIXED_RATE = "FixedRate"
+    MAX_RATE = "MaxRate"
+
+    def __init__(self, worker, mode=FIXED_RATE):
+        self.worker = worker
+        self.mode = mode
+        self.compute = None
+        self.worker.timer.setSingleShot(True)
+        self.worker.timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self.reset()
+
+    def reset(self):
+        self.deadline = None
+        self.period = None
+        self.calls = 0
+        self.overruns = 0
+        self.missed = 0
+        self.last_duration = 0.
+        self.max_duration = 0.
+        self.total_duration = 0.
+        self.total_jitter = 0.
+
+    def start(self, compute):
+        self.compute = compute
+        self.worker.timer.timeout.connect(self.run)
+        self.worker.timer.start(self.worker.Period)
+
+    def run(self):
+        period = self.worker.Period / 1000
+        start = time.monotonic()
+        if self.deadline is None or period != self.period:
+            # first call or new period
+            self.deadline, self.period = start, period
+        self.total_jitter += abs(start - self.deadline)
+        if self.mode == self.MAX_RATE:
+            self.deadline = start
+        try:
+            self.compute()
+        finally:
+            end = time.monotonic()
+            self.calls += 1
+            self.last_duration = end - start
+            self.max_duration = max(self.max_duration, self.last_duration)
+            self.total_duration += self.last_duration
+            next_deadline = self.deadline + period
+            if end > next_deadline:
+                self.overruns += 1
+                if self.mode != self.MAX_RATE and period > 0:
+                    missed = int((end - self.deadline) // period)
+                    self.missed += missed
+                    next_deadline = self.deadline + (missed + 1) * period
+                else:
+                    next_deadline = end
+            self.deadline = next_deadline
+            self.worker.timer.start(max(0, round((next_deadline - end) * 1000)))
+
+    def stats(self):
+        \"\"\"
+        Statistics of the calls, with the times in ms
+        \"\"\"
+        calls = max(self.calls, 1)
+        return {'mode': self.mode, 'period': self.worker.Period, 'calls': self.calls, 'overruns': self.overruns,
+                'missed': self.missed, 'last_duration': self.last_duration * 1000,
+                'mean_duration': self.total_duration * 1000 / calls, 'max_duration': self.max_duration * 1000,
+                'jitter': self.total_jitter * 1000 / calls}
+
+
+class CommonBehaviorI(RoboCompCommonBehavior.CommonBehavior):
+    \"\"\"
+    CommonBehavior servant of the worker. The compute statistics are returned as read only Compute.* parameters.
+    \"\"\"
+    def __init__(self, worker, parameters):
+        self.worker = worker
+        self.parameters = parameters
+        self.start_time = time.monotonic()
+
+    def getPeriod(self, c):
+        return self.worker.Period
+
+    def setPeriod(self, period, c):
+        # the timer must be restarted from the thread of the worker
+        QtCore.QMetaObject.invokeMethod(self.worker, "setPeriod", QtCore.Qt.QueuedConnection, QtCore.Q_ARG(int, period))
+
+    def timeAwake(self, c):
+        return int(time.monotonic() - self.start_time)
+
+    def killYourSelf(self, c):
+        QtCore.QMetaObject.invokeMethod(self.worker, "killYourSelf", QtCore.Qt.QueuedConnection)
+
+    def getParameterList(self, c):
+        result = {name: RoboCompCommonBehavior.Parameter(True, value, "string")
+                  for name, value in self.parameters.items()}
+        for name, value in self.worker.scheduler.stats().items():
+            result["Compute." + name] = RoboCompCommonBehavior.Parameter(False, str(value), type(value).__name__)
+        return result
+
+    def setParameterList(self, parameters, c):
+        self.parameters.update({name: parameter.value for name, parameter in parameters.items()})
+        self.worker.setParams(self.parameters)
+
+    def reloadConfig(self, c):
+        pass
+
+    def getState(self, c):
+        return RoboCompCommonBehavior.State.Running
+"""
+
+# With the ServantMetrics option the servants record the calls to their methods in the ServantMetrics of the worker
+SERVANT_METRICS_STR = """
+import threading
+
+
+class ServantMetrics:
+    \"\"\"
+    Calls, errors and latency histogram of each method of the servants. The latencies are counted in buckets with
+    log-spaced upper bounds of 1, 2, 4 ... 2**(BUCKETS - 2) us, the last bucket counting the slower calls.
+    \"\"\"
+    BUCKETS = 25
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.methods = {}
+        self.stopped = threading.Event()
+
+    def record(self, method, latency, error=False):
+        microseconds = int(latency * 1e6)
+        bucket = min((max(microseconds, 1) - 1).bit_length(), self.BUCKETS - 1)
+        with self.lock:
+            metrics = self.methods.get(method)
+            if metrics is None:
+                metrics = self.methods[method] = {'calls': 0, 'errors': 0, 'total': 0, 'buckets': [0] * self.BUCKETS}
+            metrics['calls'] += 1
+            metrics['errors'] += error
+            metrics['total'] += microseconds
+            metrics['buckets'][bucket] += 1
+
+    def stats(self):
+        with self.lock:
+            return {method: dict(metrics, buckets=list(metrics['buckets'])) for method, metrics in self.methods.items()}
+
+    @classmethod
+    def bucket_bound(cls, bucket):
+        return str(2 ** bucket) if bucket < cls.BUCKETS - 1 else "inf"
+
+    @classmethod
+    def percentile_bound(cls, metrics, percentile):
+        count = 0
+        for bucket, calls in enumerate(metrics['buckets']):
+            count += calls
+            if count >= percentile * metrics['calls']:
+                return cls.bucket_bound(bucket)
+
+    def report(self):
+        \"\"\"
+        One line for each method with its calls, errors, mean latency, upper bounds of the 50 and 99 percentiles and
+        the non empty buckets of its histogram, all the times in us
+        \"\"\"
+        lines = []
+        for method, metrics in sorted(self.stats().items()):
+            histogram = ",".join(f"{self.bucket_bound(bucket)}:{calls}"
+                                 for bucket, calls in enumerate(metrics['buckets']) if calls)
+            lines.append(f"{method} calls={metrics['calls']} errors={metrics['errors']} "
+                         f"mean={metrics['total'] / metrics['calls']:.1f} p50<={self.percentile_bound(metrics, 0.5)} "
+                         f"p99<={self.percentile_bound(metrics, 0.99)} histogram={histogram}")
+        return "\\n".join(lines) + "\\n"
+
+    def start_dump(self, path, period):
+        \"\"\"
+        Write the report to the file every period seconds
+        \"\"\"
+        def dump():
+            while not self.stopped.wait(period):
+                with open(path, "w") as dump_file:
+                    dump_file.write(self.report())
+        threading.Thread(target=dump, daemon=True).start()
+
+    def stop_dump(self):
+        self.stopped.set()
+"""
 
 
 class src_genericworker_py(TemplateDict):
@@ -12,8 +203,18 @@ class src_genericworker_py(TemplateDict):
         super(src_genericworker_py, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
-        self['requires_proxies'] = self.requires_proxies()
-        self['publishes_proxies'] = self.publishes_proxies()
+        self['requires_proxies'] = self.requires_proxies
+        self['publishes_proxies'] = self.publishes_proxies
+        self['common_behavior_slice_loading'] = self.common_behavior_slice_loading
+        self['compute_scheduler'] = self.compute_scheduler
+        self['compute_scheduler_creation'] = self.compute_scheduler_creation
+        self['servant_metrics'] = self.servant_metrics
+        self['servant_metrics_creation'] = self.servant_metrics_creation
+
+    def common_behavior_slice_loading(self):
+        result = utils.slices_dir_setup(self.component)
+        result += utils.slice_loading(self.component, "CommonBehavior", "RoboCompCommonBehavior")
+        return result
 
 
     # TODO: Refactor this and publishes with a zip?
@@ -26,6 +227,8 @@ class src_genericworker_py(TemplateDict):
                 rq = req[0]
             if communication_is_ice(req):
                 result += "self." + rq.lower() + num + "_proxy = mprx[\"" + rq + "Proxy" + num + "\"]\n"
+                if self.component.options.asyncproxies:
+                    result += "self." + rq.lower() + num + "_async = mprx[\"" + rq + "Async" + num + "\"]\n"
             else:
                 result += "self." + rq.lower() + "_proxy = ServiceClient" + rq + "()\n"
         return result
@@ -42,3 +245,23 @@ class src_genericworker_py(TemplateDict):
             else:
                 result += "self." + pub.lower() + "_proxy = Publisher" + pub + "()\n"
         return result
+
+    def compute_scheduler(self):
+        if self.component.compute_scheduler:
+            return COMPUTE_SCHEDULER_STR
+        return ""
+
+    def compute_scheduler_creation(self):
+        if self.component.compute_scheduler:
+            return "self.scheduler = ComputeScheduler(self)\n"
+        return ""
+
+    def servant_metrics(self):
+        if self.component.options.servantmetrics:
+            return SERVANT_METRICS_STR
+        return ""
+
+    def servant_metrics_creation(self):
+        if self.component.options.servantmetrics:
+            return "self.servant_metrics = ServantMetrics()\n"
+        return ""
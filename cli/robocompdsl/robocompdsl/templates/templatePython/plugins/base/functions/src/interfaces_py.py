@@ -6,10 +6,6 @@ from robocompdsl.logger import logger
 from robocompdsl.templates.common.templatedict import TemplateDict
 from robocompdsl.templates.templatePython.plugins.base.functions import function_utils as utils
 
-SLICE_LOAD_STR = """\
-Ice.loadSlice("-I ./src/ --all ./src/${interface_name}.ice")
-"""
-
 # TODO: Check if this can be reduced to an abstract class and some inheriting from that.
 LIST_CLASSES_STR = """\
 class ${list_type}(list):
@@ -32,6 +28,309 @@ class ${list_type}(list):
 setattr(${module_name}, "${list_type}", ${list_type})
 """
 
+# numpy is optional in the generated components, only the conversions to arrays need it
+NUMPY_IMPORT_STR = """\
+try:
+    import numpy
+except ImportError:
+    numpy = None
+"""
+
+# With the FastSequences option the sequences are plain lists unless ROBOCOMP_SEQUENCE_CHECKS is set
+FAST_LIST_BASE_STR = "import os\n" + NUMPY_IMPORT_STR + """
+# The type of the items of the sequences is only checked when ROBOCOMP_SEQUENCE_CHECKS is set to N > 0:
+# one of every N items added is checked (1 checks all of them).
+SEQUENCE_CHECKS = int(os.getenv("ROBOCOMP_SEQUENCE_CHECKS", "0"))
+
+
+class TypedList(list):
+    item_type = object
+    # numpy dtype of the numeric sequences
+    dtype = None
+
+    # Build the sequence from the items without checking them
+    @classmethod
+    def from_items(cls, items):
+        sequence = cls.__new__(cls)
+        list.extend(sequence, items)
+        return sequence
+
+    @classmethod
+    def from_numpy(cls, array):
+        return cls.from_items(array.tolist())
+
+    def to_numpy(self):
+        if numpy is None:
+            raise ImportError("numpy is needed to convert the sequences to arrays")
+        if self.dtype is None:
+            raise TypeError(f"{type(self).__name__} is not a numeric sequence")
+        return numpy.array(self, dtype=self.dtype)
+
+
+class CheckedTypedList(TypedList):
+    def __init__(self, iterable=()):
+        super(CheckedTypedList, self).__init__(iterable)
+        self._check(self)
+
+    def _check(self, items):
+        for item in items[::SEQUENCE_CHECKS]:
+            if not isinstance(item, self.item_type):
+                raise TypeError(f"{type(self).__name__} items must be {self.item_type.__name__}, not {type(item).__name__}")
+
+    def append(self, item):
+        if len(self) % SEQUENCE_CHECKS == 0:
+            self._check((item,))
+        super(CheckedTypedList, self).append(item)
+
+    def extend(self, iterable):
+        items = list(iterable)
+        self._check(items)
+        super(CheckedTypedList, self).extend(items)
+
+    def insert(self, index, item):
+        if len(self) % SEQUENCE_CHECKS == 0:
+            self._check((item,))
+        super(CheckedTypedList, self).insert(index, item)
+
+
+SequenceBase = CheckedTypedList if SEQUENCE_CHECKS > 0 else TypedList
+
+"""
+
+FAST_LIST_CLASSES_STR = """\
+class ${list_type}(SequenceBase):
+    item_type = ${item_type}
+    dtype = ${dtype}
+
+setattr(${module_name}, "${list_type}", ${list_type})
+"""
+
+# python type of the items of the sequences of basic types
+FAST_LIST_ITEM_TYPES = {
+    'bool': 'bool',
+    'short': 'int',
+    'int': 'int',
+    'long': 'int',
+    'float': 'float',
+    'double': 'float',
+    'string': 'str',
+}
+
+# With the NumpyHelpers option each module gets a class with functions converting its sequences to numpy arrays
+NUMPY_HELPERS_BASE_STR = """
+def require_numpy():
+    if numpy is None:
+        raise ImportError("numpy is needed to convert the sequences to arrays")
+
+"""
+
+NUMPY_HELPERS_CLASS_STR = """
+class ${module_name}Arrays:
+    \"\"\"
+    Conversions between the sequences of ${module_name} and numpy arrays
+    \"\"\"
+${helpers}
+"""
+
+NUMPY_BYTES_HELPERS_STR = """
+    @staticmethod
+    def ${list_type}_to_numpy(data, shape=None, dtype='uint8'):
+        require_numpy()
+        # Read only view of the received bytes, nothing is copied
+        array = numpy.frombuffer(data, dtype=dtype)
+        return array if shape is None else array.reshape(shape)
+
+    @staticmethod
+    def ${list_type}_from_numpy(array):
+        require_numpy()
+        # Ice sends the objects with the buffer protocol as byte sequences, so the array is not copied if contiguous
+        return memoryview(numpy.ascontiguousarray(array)).cast('B')
+"""
+
+NUMPY_NUMERIC_HELPERS_STR = """
+    @staticmethod
+    def ${list_type}_to_numpy(data, shape=None):
+        require_numpy()
+        # The sequences mapped to lists are converted, the ones received as buffers (python:array.array or
+        # python:numpy.ndarray metadata) are viewed without copying them
+        if isinstance(data, (list, tuple)):
+            array = numpy.array(data, dtype=${dtype})
+        else:
+            array = numpy.frombuffer(data, dtype=${dtype})
+        return array if shape is None else array.reshape(shape)
+
+    @staticmethod
+    def ${list_type}_from_numpy(array):
+        require_numpy()
+        # Ice marshals the memory of the array as is when its type is the one of the sequence
+        return numpy.ascontiguousarray(array, dtype=${dtype})
+"""
+
+NUMPY_STRUCT_HELPERS_STR = """
+    ${list_type}_dtype = numpy.dtype([${fields}]) if numpy is not None else None
+
+    @staticmethod
+    def ${list_type}_to_numpy(data):
+        require_numpy()
+        # One record for each struct, with the fields of the struct
+        return numpy.array([(${members}) for item in data], dtype=${module_name}Arrays.${list_type}_dtype)
+
+    @staticmethod
+    def ${list_type}_from_numpy(array):
+        return [${module_name}.${struct_name}(*fields) for fields in array.tolist()]
+"""
+
+# numpy dtype of the basic types of the sequences and structs
+NUMPY_DTYPES = {
+    'bool': "'bool'",
+    'byte': "'uint8'",
+    'short': "'int16'",
+    'int': "'int32'",
+    'long': "'int64'",
+    'float': "'float32'",
+    'double': "'float64'",
+}
+
+# With the AsyncProxies option the methods of the required interfaces can also be called from asyncio
+ASYNC_PROXIES_BASE_STR = """\
+import asyncio
+
+# Event loop of the calls made with run_calls
+calls_loop = None
+
+
+async def call_async(ice_future, timeout=None):
+    \"\"\"
+    Wait in asyncio for the result of an Ice *Async call, raising asyncio.TimeoutError after timeout seconds
+    \"\"\"
+    future = Ice.wrap_future(ice_future)
+    if timeout is None:
+        return await future
+    return await asyncio.wait_for(future, timeout)
+
+
+async def gather_calls(*calls):
+    \"\"\"
+    Wait for several calls of the Async proxies made concurrently. The result of the calls that failed or timed out
+    is their exception.
+    \"\"\"
+    return await asyncio.gather(*calls, return_exceptions=True)
+
+
+def run_calls(*calls):
+    \"\"\"
+    Make several calls of the Async proxies concurrently from synchronous code, like compute(), and return their
+    results. For example: image, state = run_calls(self.camerasimple_async.getImage(timeout=0.1),
+                                                   self.differentialrobot_async.getBaseState())
+    \"\"\"
+    global calls_loop
+    if calls_loop is None:
+        calls_loop = asyncio.new_event_loop()
+    return calls_loop.run_until_complete(gather_calls(*calls))
+"""
+
+ASYNC_PROXY_CLASS_STR = """
+
+class ${iface_name}Async:
+    \"\"\"
+    Coroutines calling the methods of a ${iface_name} proxy asynchronously. Each one takes a timeout in seconds, by
+    default the one given to the constructor.
+    \"\"\"
+    def __init__(self, proxy, timeout=None):
+        self.proxy = proxy
+        self.timeout = timeout
+${methods}"""
+
+ASYNC_PROXY_METHOD_STR = """
+    async def ${method_name}(self, ${params}timeout=None):
+        return await call_async(self.proxy.${method_name}Async(${args}), self.timeout if timeout is None else timeout)
+"""
+
+REQUIRE_ASYNC_STR = """\
+self.mprx["${iface_name}Async${num}"] = ${iface_name}Async(self.${iface_name}${num}[1])
+"""
+
+# With the BatchPublish option the messages of the batched topics are sent together
+BATCH_PUBLISHER_STR = """
+class BatchPublisher:
+    \"\"\"
+    Publisher of a topic sending its messages in batches through an ice_batchOneway proxy. The batch is flushed every
+    flush_period seconds or when flush_size messages are waiting, a period or size of 0 disables that flush. The
+    methods of the topic are called as with the proxy, and the messages batched and the batches flushed are counted.
+    \"\"\"
+    def __init__(self, proxy, flush_period, flush_size):
+        self.proxy = proxy
+        self.flush_period = flush_period
+        self.flush_size = flush_size
+        self.batched = 0
+        self.flushed = 0
+        self.pending = 0
+        self.lock = threading.Lock()
+        self.stopped = threading.Event()
+        self.flusher = threading.Thread(target=self.flush_periodically, daemon=True)
+        self.flusher.start()
+
+    def __getattr__(self, name):
+        method = getattr(self.proxy, name)
+        if name.startswith('ice_') or not callable(method):
+            return method
+
+        def publish(*args, **kwargs):
+            with self.lock:
+                method(*args, **kwargs)
+                self.batched += 1
+                self.pending += 1
+                if 0 < self.flush_size <= self.pending:
+                    self.flush_locked()
+        # Next calls don't go through __getattr__
+        setattr(self, name, publish)
+        return publish
+
+    def flush_locked(self):
+        if self.pending > 0:
+            self.proxy.ice_flushBatchRequests()
+            self.pending = 0
+            self.flushed += 1
+
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+
+    def flush_periodically(self):
+        # Without a period the batch is only flushed by size and when closing
+        timeout = self.flush_period if self.flush_period > 0 else None
+        while not self.stopped.wait(timeout):
+            self.flush()
+
+    def close(self):
+        self.stopped.set()
+        self.flusher.join()
+        self.flush()
+
+    def stats(self):
+        return {'batched': self.batched, 'flushed': self.flushed, 'pending': self.pending}
+"""
+
+CREATE_BATCH_TOPIC_STR = """
+def create_batch_topic(self, topic_name, ice_proxy):
+    # The flush period (ms) and size (messages) of each topic are read from the config file
+    properties = self.ice_connector.getProperties()
+    proxy = self.create_topic(topic_name, ice_proxy).ice_batchOneway()
+    publisher = BatchPublisher(proxy, properties.getPropertyAsIntWithDefault(f"{topic_name}.BatchFlushPeriod", 10) / 1000,
+                               properties.getPropertyAsIntWithDefault(f"{topic_name}.BatchFlushSize", 100))
+    self.mprx[topic_name] = publisher
+    self.batch_publishers.append(publisher)
+    return publisher
+
+def close_batch_topics(self):
+    for publisher in self.batch_publishers:
+        publisher.close()
+"""
+
+PUBLISHES_BATCH_STR = """
+self.${iface_name_lower} = self.create_batch_topic("${iface_name}", ${module_name}.${iface_name}Prx)
+"""
+
 SUBSCRIBESTO_STR = """
 self.${iface_name} = self.create_adapter("${iface_name}Topic", ${iface_name_lower}I.${iface_name}I(default_handler))
 """
@@ -53,29 +352,34 @@ class src_interfaces_py(TemplateDict):
     def __init__(self, component):
         super(src_interfaces_py, self).__init__()
         self.component = component
-        self['load_slice_and_create_imports'] = self.load_slice_and_create_imports()
-        self['create_lists_classes'] = self.create_lists_classes()
-        self['implements_and_subscribes_imports'] = self.implements_and_subscribes_imports()
-        self['require_proxy_creation'] = self.require_proxy_creation()
-        self['publish_proxy_creation'] = self.publish_proxy_creation()
-        self['implements_adapters_creation'] = self.implements_adapters_creation()
-        self['subscribes_adapters_creation'] = self.subscribes_adapters_creation()
-        self['needs_rcnode'] = self.needs_rcnode()
+        self['load_slice_and_create_imports'] = self.load_slice_and_create_imports
+        self['create_lists_classes'] = self.create_lists_classes
+        self['numpy_helpers'] = self.numpy_helpers
+        self['async_proxies'] = self.async_proxies
+        self['batch_publisher'] = self.batch_publisher
+        self['create_batch_topic'] = self.create_batch_topic
+        self['close_batch_topics'] = self.close_batch_topics
+        self['implements_and_subscribes_imports'] = self.implements_and_subscribes_imports
+        self['require_proxy_creation'] = self.require_proxy_creation
+        self['publish_proxy_creation'] = self.publish_proxy_creation
+        self['implements_adapters_creation'] = self.implements_adapters_creation
+        self['subscribes_adapters_creation'] = self.subscribes_adapters_creation
+        self['needs_rcnode'] = self.needs_rcnode
 
     # TODO: Check if can be merged with SERVANT_PY.py slice_loading function
     def load_slice_and_create_imports(self, includeDirectories=None):
-        result = ""
+        result = utils.slices_dir_setup(self.component)
         import os
         if self.component.recursiveImports is not None and self.component.imports is not None:
             logger.debug(f"Loading slice files: {self.component.recursiveImports + self.component.imports}")
             for imp in sorted(set(self.component.recursiveImports + self.component.imports)):
                 file_name = os.path.basename(imp)
                 name = os.path.splitext(file_name)[0]
-                result += Template(SLICE_LOAD_STR).substitute(interface_name=name)
                 logger.debug(f"Loading slice file: {file_name} ({name})")
                 # module = DSLFactory().from_file(file_name, includeDirectories=includeDirectories)
                 module = self.component.idsl_pool[name]
                 logger.debug(f"Module: {module}")
+                result += utils.slice_loading(self.component, name, module['name'])
                 result += f"import {module['name']}\n"
 
         return result
@@ -92,13 +396,100 @@ class src_interfaces_py(TemplateDict):
 
                 if module is not None:  # For modules without interface
                     for sequence in module['sequences']:
+                        if self.component.options.fastsequences:
+                            result += self.fast_list_class(sequence, module)
+                            continue
                         item_type = utils.get_type_string(sequence['typeSequence'], module['name'])
                         if item_type == 'bytes': continue
                         result += Template(LIST_CLASSES_STR).substitute(list_type=sequence['name'].split('/')[1],
                                                                         item_type=item_type,
                                                                         module_name=module['name'])
+        if result and self.component.options.fastsequences:
+            result = FAST_LIST_BASE_STR + result
         return result
 
+    @staticmethod
+    def fast_list_class(sequence, module):
+        # Ice maps the byte sequences to bytes
+        if sequence['typeSequence'] == 'byte':
+            return ""
+        item_type = FAST_LIST_ITEM_TYPES.get(sequence['typeSequence'],
+                                             utils.get_type_string(sequence['typeSequence'], module['name']))
+        dtype = NUMPY_DTYPES.get(sequence['typeSequence'], 'None')
+        return Template(FAST_LIST_CLASSES_STR).substitute(list_type=sequence['name'].split('/')[1],
+                                                          item_type=item_type,
+                                                          dtype=dtype,
+                                                          module_name=module['name'])
+
+    def numpy_helpers(self):
+        result = ""
+        if self.component.options.numpyhelpers and self.component.recursiveImports is not None and \
+                self.component.imports is not None:
+            modules = {}
+            for idsl in sorted(set(self.component.recursiveImports + self.component.imports)):
+                module = self.component.idsl_pool.module_providing_interface(idsl.split('.')[0])
+                if module is not None:
+                    modules[module['name']] = module
+            for module_name, module in modules.items():
+                helpers = "".join(self.sequence_helpers(sequence, module) for sequence in module['sequences'])
+                if helpers:
+                    result += Template(NUMPY_HELPERS_CLASS_STR).substitute(module_name=module_name, helpers=helpers)
+        if result:
+            # With FastSequences numpy is already imported before the sequence classes
+            numpy_import = "" if self.create_lists_classes().startswith(FAST_LIST_BASE_STR) else \
+                "\n" + NUMPY_IMPORT_STR + "\n"
+            result = "\n" + numpy_import + NUMPY_HELPERS_BASE_STR + result
+        return result
+
+    @staticmethod
+    def sequence_helpers(sequence, module):
+        """
+        Return the conversion functions of a sequence of numbers or of structs of numbers, empty for the rest
+        """
+        list_type = sequence['name'].split('/')[1]
+        item_type = sequence['typeSequence']
+        if item_type == 'byte':
+            return Template(NUMPY_BYTES_HELPERS_STR).substitute(list_type=list_type)
+        if item_type in NUMPY_DTYPES:
+            return Template(NUMPY_NUMERIC_HELPERS_STR).substitute(list_type=list_type, dtype=NUMPY_DTYPES[item_type])
+        struct = next((struct for struct in module['structs'] if struct['name'] == f"{module['name']}/{item_type}"),
+                      None)
+        if struct is None or not all(member['type'] in NUMPY_DTYPES for member in struct['structIdentifiers']):
+            return ""
+        members = struct['structIdentifiers']
+        fields = ", ".join(f"('{member['identifier']}', {NUMPY_DTYPES[member['type']]})" for member in members)
+        item_members = ", ".join(f"item.{member['identifier']}" for member in members)
+        if len(members) == 1:
+            item_members += ","
+        return Template(NUMPY_STRUCT_HELPERS_STR).substitute(list_type=list_type, fields=fields, members=item_members,
+                                                            module_name=module['name'], struct_name=item_type)
+
+    def async_proxies(self):
+        result = ""
+        if self.component.options.asyncproxies:
+            interfaces = sorted({iface.name for iface, _ in get_name_number(self.component.requires)
+                                 if communication_is_ice(iface)})
+            for iface_name in interfaces:
+                module = self.component.idsl_pool.module_providing_interface(iface_name)
+                result += self.async_proxy_class(module, iface_name)
+        if result:
+            # The numpy helpers already end with a blank line
+            separator = "\n" if self.numpy_helpers() else "\n\n"
+            result = separator + ASYNC_PROXIES_BASE_STR + result + "\n"
+        return result
+
+    @staticmethod
+    def async_proxy_class(module, interface_name):
+        methods = ""
+        for interface in module['interfaces']:
+            if interface['name'] == interface_name:
+                for method in interface['methods'].values():
+                    params = [p['name'] for p in method['params'] if p['decorator'] != 'out']
+                    methods += Template(ASYNC_PROXY_METHOD_STR).substitute(method_name=method['name'],
+                                                                          params="".join(f"{p}, " for p in params),
+                                                                          args=", ".join(params))
+        return Template(ASYNC_PROXY_CLASS_STR).substitute(iface_name=interface_name, methods=methods)
+
     def implements_and_subscribes_imports(self):
         result = ""
         for im in self.component.implements + self.component.subscribesTo:
@@ -114,6 +505,8 @@ class src_interfaces_py(TemplateDict):
                 module = self.component.idsl_pool.module_providing_interface(iface.name)
                 result += Template(REQUIRE_STR).substitute(iface_name=name, module_name=module['name'],
                                                            iface_name_lower=name.lower(), num=num)
+                if self.component.options.asyncproxies:
+                    result += Template(REQUIRE_ASYNC_STR).substitute(iface_name=name, num=num)
         return result
 
     def publish_proxy_creation(self):
@@ -122,11 +515,29 @@ class src_interfaces_py(TemplateDict):
             if communication_is_ice(iface):
                 name = iface.name
                 module = self.component.idsl_pool.module_providing_interface(iface.name)
-                result += Template(PUBLISHES_STR).substitute(iface_name=name,
+                publishes_str = PUBLISHES_BATCH_STR if name in self.component.batched_publishes else PUBLISHES_STR
+                result += Template(publishes_str).substitute(iface_name=name,
                                                              iface_name_lower=name.lower(),
                                                              module_name=module['name'])
+        if self.component.batched_publishes:
+            result = "self.batch_publishers = []\n" + result
         return result
 
+    def batch_publisher(self):
+        if self.component.batched_publishes:
+            return BATCH_PUBLISHER_STR
+        return ""
+
+    def create_batch_topic(self):
+        if self.component.batched_publishes:
+            return CREATE_BATCH_TOPIC_STR
+        return ""
+
+    def close_batch_topics(self):
+        if self.component.batched_publishes:
+            return "self.publishes.close_batch_topics()"
+        return ""
+
     def implements_adapters_creation(self):
         result = ""
         for iface in self.component.implements:
@@ -2,10 +2,37 @@ import datetime
 
 from robocompdsl.templates.common.templatedict import TemplateDict
 
+COMMON_BEHAVIOR_ADAPTER_STR = """
+worker.scheduler.mode = interface_manager.parameters.get("Compute.Mode", worker.scheduler.mode)
+common_behavior_adapter = interface_manager.ice_connector.createObjectAdapter("CommonBehavior")
+common_behavior_adapter.add(CommonBehaviorI(worker, interface_manager.parameters),
+                            interface_manager.ice_connector.stringToIdentity("commonbehavior"))
+common_behavior_adapter.activate()
+"""
+
+SERVANT_METRICS_DUMP_STR = """
+servant_metrics_period = float(interface_manager.parameters.get("ServantMetrics.DumpPeriod", 0))
+if servant_metrics_period > 0:
+    worker.servant_metrics.start_dump(interface_manager.parameters.get("ServantMetrics.DumpFile", "servant_metrics.txt"),
+                                      servant_metrics_period)
+"""
+
+
 class src_main_py(TemplateDict):
     def __init__(self, component):
         super(src_main_py, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
         self['component_name'] = self.component.name
+        self['common_behavior_adapter'] = self.common_behavior_adapter
+        self['servant_metrics_dump'] = self.servant_metrics_dump
+
+    def common_behavior_adapter(self):
+        if self.component.compute_scheduler:
+            return COMMON_BEHAVIOR_ADAPTER_STR
+        return ""
 
+    def servant_metrics_dump(self):
+        if self.component.options.servantmetrics:
+            return SERVANT_METRICS_DUMP_STR
+        return ""
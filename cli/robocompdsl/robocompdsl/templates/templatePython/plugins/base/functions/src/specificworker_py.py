@@ -62,12 +62,12 @@ class src_specificworker_py(TemplateDict):
         super(TemplateDict, self).__init__()
         self.component = component
         self['year'] = str(datetime.date.today().year)
-        self['timeout_compute_connect'] = self.timeout_compute_connect()
-        self['compute_creation'] = self.compute_creation()
-        self['subscription_methods'] = self.subscription_methods()
-        self['implements_methods'] = self.implements_methods()
-        self['interface_specific_comment'] = self.interface_specific_comment()
-        self['startup_check_ice'] = self.startup_check_ice()
+        self['timeout_compute_connect'] = self.timeout_compute_connect
+        self['compute_creation'] = self.compute_creation
+        self['subscription_methods'] = self.subscription_methods
+        self['implements_methods'] = self.implements_methods
+        self['interface_specific_comment'] = self.interface_specific_comment
+        self['startup_check_ice'] = self.startup_check_ice
 
     @staticmethod
     def replace_type_cpp_to_python(t):
@@ -157,7 +157,9 @@ class src_specificworker_py(TemplateDict):
 
     def timeout_compute_connect(self):
         result = ""
-        if self.component.statemachine is None:
+        if self.component.compute_scheduler:
+            result += "self.scheduler.start(self.compute)\n"
+        elif self.component.statemachine is None:
             result += "self.timer.timeout.connect(self.compute)\n"
             result += "self.timer.start(self.Period)\n"
         return result
@@ -57,9 +57,9 @@ class src_specificworker_py(TemplateDict):
     def __init__(self, component):
         super(TemplateDict, self).__init__()
         self.component = component
-        self['dsr_slots'] = self.dsr_slots()
-        self['dsr_import'] = self.dsr_import()
-        self['dsr_init'] = self.dsr_init()
+        self['dsr_slots'] = self.dsr_slots
+        self['dsr_import'] = self.dsr_import
+        self['dsr_init'] = self.dsr_init
 
     def dsr_slots(self):
         result = ""
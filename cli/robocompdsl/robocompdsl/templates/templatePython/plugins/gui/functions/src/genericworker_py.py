@@ -19,9 +19,9 @@ class src_genericworker_py(TemplateDict):
     def __init__(self, component):
         super(src_genericworker_py, self).__init__()
         self.component = component
-        self['ui_import'] = self.ui_import()
-        self['qt_class_type'] = self.qt_class_type()
-        self['gui_setup'] = self.gui_setup()
+        self['ui_import'] = self.ui_import
+        self['qt_class_type'] = self.qt_class_type
+        self['gui_setup'] = self.gui_setup
 
 
     def qt_class_type(self):
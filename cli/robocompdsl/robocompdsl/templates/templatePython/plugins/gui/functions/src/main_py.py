@@ -9,8 +9,8 @@ class src_main_py(TemplateDict):
     def __init__(self, component):
         super(src_main_py, self).__init__()
         self.component = component
-        self['import_qtwidgets'] = self.import_qtwidgets()
-        self['app_creation'] = self.app_creation()
+        self['import_qtwidgets'] = self.import_qtwidgets
+        self['app_creation'] = self.app_creation
 
     def import_qtwidgets(self):
         result = ""
@@ -15,9 +15,9 @@ class src_genericworker_py(TemplateDict):
     def __init__(self, component):
         super(src_genericworker_py, self).__init__()
         self.component = component
-        self['statemachine_signals'] = self.statemachine_signals()
-        self['statemachine_states_creation'] = self.statemachine_states_creation()
-        self['statemachine_slots_creation'] = self.statemachine_slots_creation()
+        self['statemachine_signals'] = self.statemachine_signals
+        self['statemachine_states_creation'] = self.statemachine_states_creation
+        self['statemachine_slots_creation'] = self.statemachine_slots_creation
 
     # TODO: refactor
     def statemachine_slots_creation(self):
@@ -47,8 +47,8 @@ class src_specificworker_py(TemplateDict):
     def __init__(self, component):
         super(TemplateDict, self).__init__()
         self.component = component
-        self['statemachine_start_and_destroy'] = self.statemachine_start_and_destroy()
-        self['statemachine_slots'] = self.statemachine_slots()
+        self['statemachine_start_and_destroy'] = self.statemachine_start_and_destroy
+        self['statemachine_slots'] = self.statemachine_slots
 
     # TODO: Refactor main states and substates
     def statemachine_slots(self):
@@ -18,7 +18,7 @@ class TemplatesManagerPython(ComponentTemplatesManager):
                 'servant_files': ["SERVANT.PY"],
                 'template_path': "templatePython/files/"
         }
-        current_plugins = PluginCollection(plugins.__name__)
+        current_plugins = PluginCollection.for_package(plugins.__name__)
         super(TemplatesManagerPython, self).__init__(component, current_plugins)
 
 
@@ -10,5 +10,5 @@ setup(
     author='Esteban Martinena',
     author_email='emartinena@unex.es',
     description='Robocompdsl application',
-    entry_points={'console_scripts': ['robocompdsl = robocompdsl.main:app']}
+    entry_points={'console_scripts': ['robocompdsl = robocompdsl.main:main']}
 )
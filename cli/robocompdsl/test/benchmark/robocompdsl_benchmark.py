@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+Benchmark of the parsing and generation of robocompdsl.
+
+Every iteration regenerates the reference components of test/resources/reference_components and parses again the
+cdsl, smdsl and idsl files of the corpus. Cold iterations run in a new process with an empty cache directory, so
+they include imports, plugin loading, template compilation and parsing without the persistent cache. Warm iterations
+run in the same process, with everything already loaded, as a long running tool would do.
+The median and p95 of each phase are shown and can be saved to a json file and compared with a previous one to find
+performance regressions.
+"""
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from pathlib import Path
+
+from rich.console import Console
+from rich.table import Table
+
+CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROBOCOMPDSL_DIR = os.path.abspath(os.path.join(CURRENT_DIR, "..", ".."))
+RESOURCES_DIR = os.path.join(CURRENT_DIR, "..", "resources")
+REF_COMPONENTS_PATH = os.path.join(RESOURCES_DIR, "reference_components")
+sys.path.append(ROBOCOMPDSL_DIR)
+
+BENCHMARK_FORMAT_VERSION = 1
+MODES = ['cold', 'warm']
+# categories of the profiler spans summed for the generation of all the components
+GENERATION_CATEGORIES = ['parse', 'idsl pool', 'plugin load', 'template dict', 'render', 'write']
+
+console = Console()
+
+
+class MyParser(argparse.ArgumentParser):
+    """
+    Convenience class for the ArgParse parser.
+    """
+
+    def error(self, message):
+        console.print('error: %s' % message, style='red')
+        self.print_help()
+        sys.exit(2)
+
+
+def reference_components(filters=None, ignore=None):
+    """
+    Return the directories of the reference components whose name contains any of the filters
+    """
+    components = []
+    for name in sorted(os.listdir(REF_COMPONENTS_PATH)):
+        path = os.path.join(REF_COMPONENTS_PATH, name)
+        if not os.path.isfile(os.path.join(path, 'testcomp.cdsl')):
+            continue
+        if filters and not any(f in name for f in filters):
+            continue
+        if ignore and any(i in name for i in ignore):
+            continue
+        components.append(path)
+    return components
+
+
+def percentile(samples, percent):
+    """
+    Return the percentile of the samples with the nearest rank method
+    """
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(percent / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def merged_duration(events):
+    """
+    Return the time covered by the events without counting twice the nested or overlapping ones
+    """
+    total = 0
+    end = None
+    for event in sorted(events, key=lambda e: e.start):
+        event_end = event.start + event.duration
+        if end is None or event.start >= end:
+            total += event.duration
+            end = event_end
+        elif event_end > end:
+            total += event_end - end
+            end = event_end
+    return total
+
+
+def prepare_components(components, work_dir):
+    """
+    Copy the dsl files of the components to work_dir and return the list of (name, cdsl file, output dir)
+    """
+    prepared = []
+    for component in components:
+        name = os.path.basename(component)
+        output_dir = os.path.join(work_dir, name)
+        os.makedirs(output_dir, exist_ok=True)
+        for dsl_file in Path(component).glob('*.*dsl'):
+            shutil.copy(dsl_file, output_dir)
+        prepared.append((name, os.path.join(output_dir, 'testcomp.cdsl'), output_dir))
+    return prepared
+
+
+def corpus_files(prepared):
+    """
+    Return the cdsl, smdsl and idsl files of the corpus: the files of the components, the idsl files in the resources
+    directory and the ones loaded in the idsl pool while generating them.
+    """
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+    files = []
+    for _, cdsl_file, output_dir in prepared:
+        files.append(cdsl_file)
+        files.extend(sorted(str(path) for path in Path(output_dir).glob('*.smdsl')))
+    idsl_files = {str(path) for path in Path(RESOURCES_DIR).glob('*.idsl')}
+    idsl_files.update(str(module['filename']) for module in idsl_pool.values())
+    return files + sorted(idsl_files)
+
+
+@contextlib.contextmanager
+def component_directory(output_dir):
+    """
+    Run the generation from the directory of the component, as the smdsl files are relative to it, hiding its output
+    """
+    current_dir = os.getcwd()
+    os.chdir(output_dir)
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.chdir(current_dir)
+
+
+def run_iteration(prepared, include_directories):
+    """
+    Generate all the components and parse the corpus, returning the milliseconds spent in each phase.
+    """
+    start = time.perf_counter()
+    from robocompdsl.common.filesgenerator import FilesGenerator
+    from robocompdsl.common.profiler import profiler
+    from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+    from robocompdsl.logger import logger
+    logger.disabled = True
+    if include_directories:
+        idsl_pool.update_directories([Path(directory).absolute() for directory in include_directories])
+    phases = {'import': (time.perf_counter() - start) * 1000}
+
+    profiler.enable()
+    start = time.perf_counter()
+    for _, cdsl_file, output_dir in prepared:
+        with component_directory(output_dir):
+            FilesGenerator().generate(Path(cdsl_file), output_dir, force=True)
+    phases['generate'] = (time.perf_counter() - start) * 1000
+    for category in GENERATION_CATEGORIES:
+        events = [event for event in profiler.events if event.category == category]
+        phases[f"generate: {category}"] = merged_duration(events) / 1e6
+    profiler.disable()
+
+    parse_times = {}
+    start = time.perf_counter()
+    for dsl_file in corpus_files(prepared):
+        file_start = time.perf_counter()
+        DSLFactory().from_file(dsl_file, update=True)
+        dsl_type = os.path.splitext(dsl_file)[1][1:]
+        parse_times[dsl_type] = parse_times.get(dsl_type, 0) + (time.perf_counter() - file_start) * 1000
+    phases['corpus parse'] = (time.perf_counter() - start) * 1000
+    for dsl_type, parse_time in sorted(parse_times.items()):
+        phases[f"corpus parse: {dsl_type}"] = parse_time
+    phases['total'] = sum(value for key, value in phases.items() if key in ['import', 'generate', 'corpus parse'])
+    return phases
+
+
+def _cold_iteration(args):
+    """
+    Run an iteration in a new process. The robocompdsl modules are imported here and the cache directory is empty.
+    """
+    prepared, include_directories = args
+    return run_iteration(prepared, include_directories)
+
+
+class Benchmark:
+    """
+    Run the cold and warm iterations and keep the samples of each phase.
+    """
+
+    def __init__(self, components, iterations=5, include_directories=None, work_dir=None):
+        self.components = components
+        self.iterations = iterations
+        self.include_directories = include_directories or []
+        self.work_dir = work_dir
+        self.samples = {mode: {} for mode in MODES}
+        self.failed = {}
+
+    def run(self, modes=None):
+        work_dir = self.work_dir or tempfile.mkdtemp(prefix='robocompdsl_benchmark_')
+        os.makedirs(work_dir, exist_ok=True)
+        os.environ['ROBOCOMPDSL_CACHE_DIR'] = os.path.join(work_dir, 'cache')
+        try:
+            prepared = self._check_components(prepare_components(self.components, os.path.join(work_dir, 'components')))
+            for mode in modes or MODES:
+                if mode == 'warm':
+                    # the first iteration loads everything in this process
+                    run_iteration(prepared, self.include_directories)
+                for iteration in range(self.iterations):
+                    console.print(f"{mode} iteration {iteration + 1}/{self.iterations}", style='dim')
+                    if mode == 'cold':
+                        shutil.rmtree(os.environ['ROBOCOMPDSL_CACHE_DIR'], ignore_errors=True)
+                        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+                            phases = executor.submit(_cold_iteration, (prepared, self.include_directories)).result()
+                    else:
+                        phases = run_iteration(prepared, self.include_directories)
+                    for phase, value in phases.items():
+                        self.samples[mode].setdefault(phase, []).append(value)
+        finally:
+            if self.work_dir is None:
+                shutil.rmtree(work_dir, ignore_errors=True)
+        return self.results()
+
+    def _check_components(self, prepared):
+        """
+        Generate each component once in a new process and remove the ones failing from the benchmark.
+        """
+        with ProcessPoolExecutor(max_workers=1, mp_context=get_context('spawn')) as executor:
+            errors = executor.submit(_generation_errors, (prepared, self.include_directories)).result()
+        for name, error in errors.items():
+            console.print(f"Ignoring {name}: {error}", style='yellow')
+        self.failed = errors
+        return [component for component in prepared if component[0] not in errors]
+
+    def results(self):
+        results = {}
+        for mode, phases in self.samples.items():
+            if not phases:
+                continue
+            results[mode] = {phase: {'median': statistics.median(samples), 'p95': percentile(samples, 95),
+                                     'samples': samples}
+                             for phase, samples in phases.items()}
+        return {
+            'version': BENCHMARK_FORMAT_VERSION,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'iterations': self.iterations,
+            'components': [os.path.basename(component) for component in self.components
+                           if os.path.basename(component) not in self.failed],
+            'results': results,
+        }
+
+
+def _generation_errors(args):
+    prepared, include_directories = args
+    from robocompdsl.common.filesgenerator import FilesGenerator
+    from robocompdsl.dsl_parsers.idslpool import idsl_pool
+    from robocompdsl.logger import logger
+    logger.disabled = True
+    if include_directories:
+        idsl_pool.update_directories([Path(directory).absolute() for directory in include_directories])
+    errors = {}
+    for name, cdsl_file, output_dir in prepared:
+        try:
+            with component_directory(output_dir):
+                FilesGenerator().generate(Path(cdsl_file), output_dir, force=True)
+        except Exception as e:
+            errors[name] = f"{type(e).__name__}: {e}"
+    return errors
+
+
+def compare_results(results, baseline, threshold=0.1, min_delta=1.0):
+    """
+    Compare the medians of the results with the ones of the baseline.
+    :param threshold: relative increase of the median considered a regression
+    :param min_delta: minimum increase in milliseconds considered a regression, to ignore the noise of short phases
+    :return: list of (mode, phase, baseline median, median, relative change, is regression)
+    """
+    comparison = []
+    for mode, phases in results['results'].items():
+        for phase, values in phases.items():
+            base = baseline.get('results', {}).get(mode, {}).get(phase)
+            if base is None:
+                continue
+            change = (values['median'] - base['median']) / base['median'] if base['median'] > 0 else 0.0
+            regression = change > threshold and values['median'] - base['median'] > min_delta
+            comparison.append((mode, phase, base['median'], values['median'], change, regression))
+    return comparison
+
+
+def print_results(results, comparison=None):
+    changes = {(mode, phase): (change, regression) for mode, phase, _, _, change, regression in comparison or []}
+    for mode, phases in results['results'].items():
+        table = Table(title=f"{mode.capitalize()} runs ({results['iterations']} iterations, "
+                            f"{len(results['components'])} components)")
+        table.add_column("Phase")
+        table.add_column("Median (ms)", justify="right")
+        table.add_column("p95 (ms)", justify="right")
+        if comparison is not None:
+            table.add_column("vs baseline", justify="right")
+        for phase, values in phases.items():
+            row = [phase, f"{values['median']:.1f}", f"{values['p95']:.1f}"]
+            if comparison is not None:
+                if (mode, phase) in changes:
+                    change, regression = changes[(mode, phase)]
+                    row.append(f"[{'red' if regression else 'green'}]{change:+.1%}")
+                else:
+                    row.append("-")
+            table.add_row(*row)
+        console.print(table)
+
+
+def main():
+    parser = MyParser(description="Measure the time robocompdsl takes to parse the reference dsl files and to "
+                                  "generate the reference components")
+    parser.add_argument("-n", "--iterations", type=int, default=5, help="Number of cold and warm iterations")
+    parser.add_argument("-m", "--mode", choices=MODES, action='append', help="Run only cold or warm iterations")
+    parser.add_argument("-f", "--filter", action='append', help="Only the components containing this string")
+    parser.add_argument("-i", "--ignore", action='append', default=[], help="Ignore components containing this string")
+    parser.add_argument("-I", "--include_dirs", action='append', default=[], help="Directories to find the idsl files")
+    parser.add_argument("-o", "--output", help="Save the results to this json file")
+    parser.add_argument("-b", "--baseline", help="Compare the results with the ones saved in this json file")
+    parser.add_argument("-t", "--threshold", type=float, default=0.1,
+                        help="Relative increase of the median reported as a regression (default 0.1)")
+    parser.add_argument("--min-delta", type=float, default=1.0,
+                        help="Minimum increase of the median in ms reported as a regression (default 1.0)")
+    parser.add_argument("-w", "--work-dir", help="Directory for the generated components. It's kept after the run")
+    args = parser.parse_args()
+
+    components = reference_components(args.filter, args.ignore)
+    if not components:
+        console.print("No reference component selected", style='red')
+        sys.exit(2)
+    benchmark = Benchmark(components, args.iterations, args.include_dirs, args.work_dir)
+    results = benchmark.run(args.mode)
+
+    comparison = None
+    if args.baseline:
+        with open(args.baseline, 'r') as reader:
+            baseline = json.load(reader)
+        if baseline.get('components') != results['components']:
+            console.print("The baseline was measured with different components, the times are not comparable",
+                          style='yellow')
+        comparison = compare_results(results, baseline, args.threshold, args.min_delta)
+    print_results(results, comparison)
+    if args.output:
+        with open(args.output, 'w') as writer:
+            json.dump(results, writer, indent=1)
+        console.print(f"Results saved to {args.output}")
+    regressions = [entry for entry in comparison or [] if entry[5]]
+    for mode, phase, base, median, change, _ in regressions:
+        console.print(f"Regression in {mode} {phase}: {base:.1f} ms -> {median:.1f} ms ({change:+.1%})", style='red')
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == '__main__':
+    main()
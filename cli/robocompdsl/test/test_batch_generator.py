@@ -0,0 +1,127 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import config_tests
+from robocompdsl.common.batchgenerator import BatchGenerator, find_component_files
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idslpool import IDSLPool
+
+CDSL_STRING = """import "{interface}.idsl";
+Component {name}
+{{
+\tCommunications
+\t{{
+\t\timplements {interface};
+\t}};
+\tlanguage Cpp11;
+}};
+"""
+
+
+class FindComponentFilesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_batch_'))
+        self.first = self._write("workspace/first/first.cdsl")
+        self.second = self._write("workspace/second/etc/second.jcdsl")
+        self._write("workspace/second/other.idsl")
+        self.third = self._write("other/third.cdsl")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, relative_path, content=""):
+        path = self.tmp_dir / relative_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(content)
+        return path
+
+    def test_workspace(self):
+        self.assertEqual(find_component_files([str(self.tmp_dir / "workspace")]),
+                         [(self.first, self.first.parent), (self.second, self.second.parent)])
+
+    def test_globs(self):
+        pattern = str(self.tmp_dir / "**" / "*.cdsl")
+        self.assertEqual(find_component_files([pattern]),
+                         [(self.third, self.third.parent), (self.first, self.first.parent)])
+        # the same component is only generated once
+        self.assertEqual(find_component_files([str(self.first), pattern, str(self.tmp_dir / "other")]),
+                         [(self.first, self.first.parent), (self.third, self.third.parent)])
+        self.assertEqual(find_component_files([str(self.tmp_dir / "missing*.cdsl")]), [])
+
+    def test_manifest(self):
+        manifest = self._write("components.txt", "# components of the workspace\n\n"
+                                                 "workspace/first/first.cdsl\n"
+                                                 "other/third.cdsl   generated/third\n")
+        self.assertEqual(find_component_files([], manifest),
+                         [(self.first, self.first.parent), (self.third, self.tmp_dir / "generated" / "third")])
+        self._write("components.txt", "other/third.cdsl generated/third extra\n")
+        with self.assertRaises(ValueError):
+            find_component_files([], manifest)
+
+
+class BatchGeneratorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_batch_'))
+        self.persistent_cache = DSLFactory().persistent_cache
+        DSLFactory().set_persistent_cache(None)
+        idsl_dir = self.tmp_dir / "idsls"
+        idsl_dir.mkdir()
+        (idsl_dir / "CommonBehavior.idsl").write_text(
+            "module RoboCompCommonBehavior{ interface CommonBehavior{ int getPeriod(); void setPeriod(int p); }; };")
+        (idsl_dir / "BatchFirst.idsl").write_text("module RoboCompBatchFirst{ interface BatchFirst{ void f(); }; };")
+        (idsl_dir / "BatchSecond.idsl").write_text("module RoboCompBatchSecond{ interface BatchSecond{ int g(); }; };")
+        pool = IDSLPool()
+        pool.update_directories([idsl_dir])
+        for module in ['robocompdsl.dsl_parsers.idslpool', 'robocompdsl.common.icegenerator',
+                       'robocompdsl.templates.common.abstracttemplatesmanager']:
+            pool_patcher = mock.patch(module + '.idsl_pool', pool)
+            pool_patcher.start()
+            self.addCleanup(pool_patcher.stop)
+        self.components = []
+        for name, interface in [("batchfirst", "BatchFirst"), ("batchsecond", "BatchSecond")]:
+            component_dir = self.tmp_dir / name
+            component_dir.mkdir()
+            cdsl_file = component_dir / f"{name}.cdsl"
+            cdsl_file.write_text(CDSL_STRING.format(name=name, interface=interface))
+            self.components.append((cdsl_file, component_dir))
+
+    def tearDown(self):
+        DSLFactory().set_persistent_cache(self.persistent_cache)
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_generate(self):
+        current_dir = os.getcwd()
+        with mock.patch('robocompdsl.common.filesgenerator.console'):
+            results = BatchGenerator().generate(self.components)
+            self.assertEqual(os.getcwd(), current_dir)
+            self.assertEqual([result.dsl_file for result in results], [cdsl for cdsl, _ in self.components])
+            for result, (_, component_dir) in zip(results, self.components):
+                self.assertIsNone(result.error)
+                self.assertFalse(result.up_to_date)
+                self.assertGreater(result.written_files, 0)
+                self.assertTrue((component_dir / "src" / "CMakeLists.txt").is_file())
+            self.assertIn("BatchFirst", (self.tmp_dir / "batchfirst" / "src" / "CMakeLists.txt").read_text())
+            self.assertIn("BatchSecond", (self.tmp_dir / "batchsecond" / "src" / "CMakeLists.txt").read_text())
+            # nothing changed, so the second pass doesn't write anything
+            results = BatchGenerator().generate(self.components)
+        for result in results:
+            self.assertIsNone(result.error)
+            self.assertTrue(result.up_to_date)
+            self.assertEqual(result.written_files, 0)
+
+    def test_error(self):
+        self.components[1][0].write_text("Component broken{")
+        with mock.patch('robocompdsl.common.filesgenerator.console'):
+            results = BatchGenerator().generate(self.components)
+        self.assertIsNone(results[0].error)
+        self.assertIsNotNone(results[1].error)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+
+from config_tests import CURRENT_DIR
+sys.path.append(os.path.join(CURRENT_DIR, "benchmark"))
+from robocompdsl.common.profiler import ProfileEvent
+from robocompdsl_benchmark import compare_results, merged_duration, percentile, reference_components
+
+
+def event(start, duration):
+    return ProfileEvent('name', 'render', start, duration, 0, 0, {})
+
+
+class BenchmarkTestCase(unittest.TestCase):
+
+    def test_percentile(self):
+        samples = [5, 1, 4, 2, 3]
+        self.assertEqual(percentile(samples, 50), 3)
+        self.assertEqual(percentile(samples, 95), 5)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_merged_duration(self):
+        # nested and overlapping events are only counted once
+        self.assertEqual(merged_duration([event(0, 10), event(2, 3), event(8, 4), event(20, 5)]), 17)
+        self.assertEqual(merged_duration([]), 0)
+
+    def test_compare_results(self):
+        baseline = {'results': {'warm': {'render': {'median': 10.0}, 'write': {'median': 1.0}}}}
+        results = {'results': {'warm': {'render': {'median': 12.0}, 'write': {'median': 1.5},
+                                        'new phase': {'median': 3.0}}}}
+        comparison = {(mode, phase): regression for mode, phase, _, _, _, regression in
+                      compare_results(results, baseline, threshold=0.1, min_delta=1.0)}
+        # write grows 50% but less than min_delta
+        self.assertEqual(comparison, {('warm', 'render'): True, ('warm', 'write'): False})
+
+    def test_reference_components(self):
+        components = [os.path.basename(c) for c in reference_components(['Python'], ['dsr'])]
+        self.assertIn('test_allCommunicationsPython', components)
+        self.assertTrue(all('Python' in c and 'dsr' not in c for c in components))
+
+
+if __name__ == '__main__':
+    unittest.main()
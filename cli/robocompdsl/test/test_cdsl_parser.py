@@ -113,6 +113,86 @@ Component TheComponentName
         self.assertTrue(component.is_agm_agent())
         self.assertIn(['CameraSimple', 'ice'], component.implements)
 
+    def test_string_to_struct_valid_inputs_precompiled_slices(self):
+
+        valid_cdsl_string = """
+        Component TheComponentName
+        {
+                Communications
+                {
+                };
+                language Python;
+                options dsr, PrecompiledSlices;
+        };
+        """
+        component = self.cdsl_parser.string_to_struct(valid_cdsl_string)
+
+        self.assertTrue(component.options.precompiledslices)
+        self.assertTrue(component.dsr)
+        self.assertFalse(component.options.innermodelviewer)
+        self.assertFalse(component.options.fastsequences)
+
+    def test_string_to_struct_valid_inputs_python_sequences(self):
+
+        valid_cdsl_string = """
+        Component TheComponentName
+        {
+                Communications
+                {
+                };
+                language Python;
+                options FastSequences, NumpyHelpers, AsyncProxies, ComputeScheduler, ServantMetrics;
+        };
+        """
+        component = self.cdsl_parser.string_to_struct(valid_cdsl_string)
+
+        self.assertTrue(component.options.fastsequences)
+        self.assertTrue(component.options.numpyhelpers)
+        self.assertTrue(component.options.asyncproxies)
+        self.assertTrue(component.compute_scheduler)
+        self.assertTrue(component.options.servantmetrics)
+        self.assertFalse(component.options.precompiledslices)
+
+    def test_string_to_struct_valid_inputs_batch_publish(self):
+
+        cdsl_string = """
+        Component TheComponentName
+        {
+                Communications
+                {
+                        publishes AprilBasedLocalization, CameraSimple;
+                };
+                language Cpp11;
+                options BatchPublish(CameraSimple);
+        };
+        """
+        component = self.cdsl_parser.string_to_struct(cdsl_string)
+        self.assertTrue(component.options.batchpublish)
+        self.assertEqual(component.batched_publishes, ['CameraSimple'])
+
+        component = self.cdsl_parser.string_to_struct(cdsl_string.replace("BatchPublish(CameraSimple)", "BatchPublish"))
+        self.assertEqual(component.batched_publishes, ['AprilBasedLocalization', 'CameraSimple'])
+
+        self.assertRaises(ValueError, self.cdsl_parser.string_to_struct,
+                          cdsl_string.replace("BatchPublish(CameraSimple)", "BatchPublish(RGBD)"))
+
+    def test_string_to_struct_compute_scheduler_statemachine(self):
+
+        cdsl_string = """
+        Component TheComponentName
+        {
+                Communications
+                {
+                };
+                language Python;
+                options ComputeScheduler;
+                statemachine "statemachine.smdsl";
+        };
+        """
+        self.assertRaises(ValueError, self.cdsl_parser.string_to_struct, cdsl_string)
+        component = self.cdsl_parser.string_to_struct(cdsl_string.replace('statemachine "statemachine.smdsl";', ''))
+        self.assertTrue(component.compute_scheduler)
+
     def test_string_to_struct_valid_inputs_ros_comm(self):
 
         valid_cdsl_ros_string = """      
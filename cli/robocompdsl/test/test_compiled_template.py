@@ -0,0 +1,77 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import config_tests
+from robocompdsl.templates.common.abstracttemplatesmanager import CompiledTemplate, CompiledTemplatesCache, \
+    CustomTemplate
+
+TEMPLATE = """\
+class ${name}:
+    def __init__(self):
+        ${body}
+        ${empty}
+        self.value = ${value} # $$ not a placeholder
+    ${empty}${name}
+end${empty}"""
+
+MAPPINGS = [
+    {'name': 'Foo', 'body': 'a = 1\n\nb = 2\n', 'empty': '', 'value': '3'},
+    {'name': 'Foo', 'body': '\n  \nc = 1\n  \n', 'empty': '', 'value': 'x\ny'},
+    {'name': '', 'body': '', 'empty': 'not empty', 'value': ''},
+    {'name': 'Foo', 'body': 'x', 'empty': 'a<LINEREMOVE>b\nc', 'value': '3'},
+]
+
+
+class CompiledTemplateTestCase(unittest.TestCase):
+
+    def test_same_result(self):
+        for trimlines in [True, False]:
+            for mapping in MAPPINGS:
+                with self.subTest(trimlines=trimlines, mapping=mapping):
+                    expected = CustomTemplate(TEMPLATE, trimlines).substitute_with_regex(mapping)
+                    self.assertEqual(CompiledTemplate(TEMPLATE, trimlines).render(mapping), expected)
+                    self.assertEqual(CustomTemplate(TEMPLATE, trimlines).substitute(**mapping), expected)
+
+    def test_identifiers(self):
+        self.assertEqual(CompiledTemplate(TEMPLATE).identifiers(), ['name', 'body', 'empty', 'value'])
+
+    def test_errors(self):
+        with self.assertRaises(KeyError):
+            CompiledTemplate(TEMPLATE).render({'name': 'Foo'})
+        with self.assertRaises(ValueError):
+            CompiledTemplate("invalid $ placeholder").render({})
+
+
+class CompiledTemplatesCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='testrobocompdsl_templates_')
+        self.template_file = os.path.join(self.tmp_dir, "file.txt")
+        with open(self.template_file, 'w') as writer:
+            writer.write("Hello ${name}\n")
+        self.cache = CompiledTemplatesCache(os.path.join(self.tmp_dir, "compiled.pickle"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_get(self):
+        compiled = self.cache.get(self.template_file)
+        self.assertIs(self.cache.get(self.template_file), compiled)
+        self.assertEqual(compiled.render({'name': 'world'}), "Hello world\n")
+        with open(self.template_file, 'w') as writer:
+            writer.write("Bye ${name}!\n")
+        self.assertEqual(self.cache.get(self.template_file).render({'name': 'world'}), "Bye world!\n")
+
+    def test_save(self):
+        self.cache.get(self.template_file)
+        self.cache.save()
+        cache = CompiledTemplatesCache(self.cache.cache_file)
+        cache.get(self.template_file)
+        # loaded from the cache file, nothing new to save
+        self.assertFalse(cache._modified)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,129 @@
+import inspect
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from config_tests import CURRENT_DIR
+from robocompdsl.dsl_parsers.dsl_cache import DSLCache
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idslpool import IDSLPool
+from robocompdsl.dsl_parsers.specific_parsers.cdsl import componentfacade
+from robocompdsl.dsl_parsers.specific_parsers.cdsl.cdsl_parser import CDSLParser
+from robocompdsl.dsl_parsers.specific_parsers.smdsl_parser import SMDSLParser
+
+RESOURCES_DIR = os.path.join(CURRENT_DIR, "resources")
+
+
+class DSLCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp(prefix='testrobocompdsl_cache_')
+        self.cache = DSLCache(self.cache_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_key(self):
+        key = DSLCache.key("content", "idsl", "1")
+        self.assertEqual(key, DSLCache.key("content", "idsl", "1"))
+        self.assertNotEqual(key, DSLCache.key("content2", "idsl", "1"))
+        self.assertNotEqual(key, DSLCache.key("content", "cdsl", "1"))
+        self.assertNotEqual(key, DSLCache.key("content", "idsl", "2"))
+
+    def test_put_get(self):
+        struct = {'name': 'RoboCompTest', 'imports': ['A.idsl'], 'interfaces': []}
+        key = DSLCache.key("module Test{};", "idsl", "1")
+        self.assertIsNone(self.cache.get(key))
+        self.assertTrue(self.cache.put(key, struct))
+        self.assertEqual(self.cache.get(key), struct)
+
+    def test_invalid_entry(self):
+        key = DSLCache.key("module Test{};", "idsl", "1")
+        with open(os.path.join(self.cache_dir, key + ".pickle"), 'w') as writer:
+            writer.write("not a pickle")
+        self.assertIsNone(self.cache.get(key))
+        self.assertEqual(len(self.cache.entries()), 0)
+
+    def test_eviction(self):
+        self.cache.max_size = 0
+        self.cache.put("a", {'name': 'a'})
+        self.assertEqual(len(self.cache.entries()), 0)
+        self.cache.max_size = 10 ** 6
+        self.cache.put("a", {'name': 'a'})
+        self.cache.put("b", {'name': 'b'})
+        os.utime(os.path.join(self.cache_dir, "a.pickle"), (0, 0))
+        self.cache.max_size = self.cache.size() - 1
+        self.cache.evict()
+        self.assertIsNone(self.cache.get("a"))
+        self.assertIsNotNone(self.cache.get("b"))
+
+    def test_factory_uses_cache(self):
+        factory = DSLFactory()
+        previous_cache = factory.persistent_cache
+        factory.set_persistent_cache(self.cache)
+        try:
+            smdsl_path = os.path.join(RESOURCES_DIR, "gamestatemachine.smdsl")
+            parsed = factory.from_file(smdsl_path, update=True)
+            with open(smdsl_path) as reader:
+                key = DSLCache.key(reader.read(), "smdsl", SMDSLParser.version())
+            cached = self.cache.get(key)
+            self.assertIsNotNone(cached)
+            self.assertEqual(cached['machine'], parsed['machine'])
+        finally:
+            factory.set_persistent_cache(previous_cache)
+
+    def test_cdsl_parser_version(self):
+        # the cached components are pickled ComponentFacade instances, so a change in the facade invalidates them
+        facade_file = os.path.join(self.cache_dir, "componentfacade.py")
+        with open(facade_file, 'w') as writer:
+            writer.write("changed facade")
+        getfile = inspect.getfile
+        version = CDSLParser.version()
+        try:
+            del CDSLParser._version
+            with mock.patch('inspect.getfile', lambda obj: facade_file if obj is componentfacade else getfile(obj)):
+                changed_version = CDSLParser.version()
+        finally:
+            CDSLParser._version = version
+        self.assertNotEqual(changed_version, version)
+
+    def test_cached_component_recursive_imports(self):
+        # a component restored from the cache must see the current imports of the idsl files it imports
+        idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        self.addCleanup(shutil.rmtree, idsl_dir, ignore_errors=True)
+        for name in ["CacheY", "CacheZ"]:
+            (idsl_dir / f"{name}.idsl").write_text(f"module RoboComp{name}{{ interface {name} {{ void f(); }}; }};")
+        top_idsl = idsl_dir / "CacheX.idsl"
+        top_idsl.write_text('import "CacheY.idsl"; module RoboCompCacheX{ interface CacheX { void f(); }; };')
+        cdsl_path = idsl_dir / "component.cdsl"
+        cdsl_path.write_text('import "CacheX.idsl";\nComponent cached\n{\n\tCommunications\n\t{\n'
+                             '\t\trequires CacheX;\n\t};\n\tlanguage Cpp11;\n};\n')
+        factory = DSLFactory()
+        previous_cache = factory.persistent_cache
+        factory.set_persistent_cache(self.cache)
+
+        def parse_component():
+            # as a new run, with an empty pool and nothing cached in memory
+            for path in [cdsl_path, top_idsl]:
+                factory.invalidate(path)
+            pool = IDSLPool()
+            pool.update_directories([idsl_dir])
+            with mock.patch('robocompdsl.dsl_parsers.idslpool.idsl_pool', pool):
+                return factory.from_file(cdsl_path), pool
+
+        try:
+            component, _ = parse_component()
+            self.assertEqual(component.recursiveImports, ["CacheY.idsl"])
+            top_idsl.write_text('import "CacheZ.idsl"; module RoboCompCacheX{ interface CacheX { void f(); }; };')
+            component, pool = parse_component()
+            self.assertEqual(component.recursiveImports, ["CacheZ.idsl"])
+            self.assertNotIn("CacheY", pool)
+        finally:
+            factory.set_persistent_cache(previous_cache)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -346,7 +346,7 @@ class DSLFactoryTestCase(unittest.TestCase):
             ],
             'filename': '/opt/robocomp/interfaces/IDSLs/JointMotor.idsl'
         })
-        self.assertNestedDictEqual(c, ref, ignored_keys=['filename'])
+        self.assertNestedDictEqual(c.to_dict(), ref, ignored_keys=['filename'])
         # test for cached query
         d = self.factory.from_file("JointMotor.idsl")
         self.assertIs(c, d)
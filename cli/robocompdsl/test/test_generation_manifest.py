@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import config_tests
+from robocompdsl.common.generationmanifest import GenerationManifest, file_hash
+
+
+class GenerationManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='testrobocompdsl_manifest_')
+        self.cdsl_file = self._write("testcomp.cdsl", "Component testcomp{};")
+        self.idsl_file = self._write("Interface.idsl", "module RoboCompInterface{};")
+        self.servant_file = self._write("src/interfaceI.py", "servant")
+        self.main_file = self._write("src/main.py", "main")
+        self.options = {'test': False}
+        # the -I directory is searched before the directory of the idsl
+        self.include_dir = os.path.join(self.tmp_dir, "include")
+        os.makedirs(self.include_dir)
+        self.search_path = [self.include_dir, self.tmp_dir]
+        manifest = GenerationManifest(self.tmp_dir)
+        outputs = {
+            self.servant_file: {'kind': 'generated', 'sha256': file_hash(self.servant_file), 'idsls': [self.idsl_file]},
+            self.main_file: {'kind': 'generated', 'sha256': file_hash(self.main_file), 'idsls': []},
+        }
+        manifest.update(self.cdsl_file, None, ['Interface.idsl'], [self.idsl_file], self.options, outputs,
+                        search_path=self.search_path)
+        manifest.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def _write(self, relative_path, content):
+        path = os.path.join(self.tmp_dir, relative_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as writer:
+            writer.write(content)
+        return path
+
+    def test_up_to_date(self):
+        manifest = GenerationManifest(self.tmp_dir)
+        self.assertTrue(manifest.check(self.cdsl_file, self.options, self.search_path).up_to_date)
+        self.assertFalse(manifest.check(self.cdsl_file, {'test': True}, self.search_path).up_to_date)
+        self.assertFalse(manifest.imports_changed(['Interface.idsl']))
+
+    def test_changed_inputs(self):
+        self._write("Interface.idsl", "module RoboCompInterface{ interface Interface{}; };")
+        manifest = GenerationManifest(self.tmp_dir)
+        check = manifest.check(self.cdsl_file, self.options, self.search_path)
+        self.assertFalse(check.up_to_date)
+        self.assertFalse(check.full)
+        self.assertEqual(check.changed_idsls, {self.idsl_file})
+        self.assertEqual(manifest.outputs_depending_on(check.changed_idsls), {self.servant_file})
+        self._write("testcomp.cdsl", "Component othercomp{};")
+        self.assertTrue(GenerationManifest(self.tmp_dir).check(self.cdsl_file, self.options, self.search_path).full)
+
+    def test_modified_output(self):
+        self._write("src/main.py", "modified main")
+        check = GenerationManifest(self.tmp_dir).check(self.cdsl_file, self.options, self.search_path)
+        self.assertFalse(check.full)
+        self.assertEqual(check.outdated_outputs, {self.main_file})
+
+    def test_changed_search_path(self):
+        check = GenerationManifest(self.tmp_dir).check(self.cdsl_file, self.options, [self.tmp_dir])
+        self.assertTrue(check.full)
+        self.assertEqual(check.reason, "idsl search path changed")
+
+    def test_shadowing_idsl(self):
+        # a file with the same name in a directory searched before is used instead of the recorded one
+        self._write("include/Other.idsl", "module RoboCompOther{};")
+        self.assertTrue(GenerationManifest(self.tmp_dir).check(self.cdsl_file, self.options, self.search_path).up_to_date)
+        shadowing = self._write("include/Interface.idsl", "module RoboCompInterface{};")
+        check = GenerationManifest(self.tmp_dir).check(self.cdsl_file, self.options, self.search_path)
+        self.assertTrue(check.full)
+        self.assertEqual(check.reason, f"new idsl file {shadowing}")
+
+
+if __name__ == '__main__':
+    unittest.main()
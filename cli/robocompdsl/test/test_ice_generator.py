@@ -0,0 +1,83 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import config_tests
+from robocompdsl.common.icegenerator import IceGenerator
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idslpool import IDSLPool
+
+BASE_IDSL = """
+module RoboCompIceBase
+{
+    struct Point { float x; float y; };
+};
+"""
+
+TEST_IDSL = """
+import "IceBase.idsl";
+module RoboCompIceTest
+{
+    interface IceTest
+    {
+        RoboCompIceBase::Point getPoint();
+    };
+};
+"""
+
+
+class IceGeneratorTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.persistent_cache = DSLFactory().persistent_cache
+        DSLFactory().set_persistent_cache(None)
+        self.idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        self.output_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_ice_'))
+        (self.idsl_dir / "IceBase.idsl").write_text(BASE_IDSL)
+        (self.idsl_dir / "IceTest.idsl").write_text(TEST_IDSL)
+        (self.idsl_dir / "IceBroken.idsl").write_text("module RoboCompIceBroken { interface A { void f( }; };")
+        pool_patcher = mock.patch('robocompdsl.common.icegenerator.idsl_pool', IDSLPool())
+        pool_patcher.start()
+        self.addCleanup(pool_patcher.stop)
+
+    def tearDown(self):
+        DSLFactory().set_persistent_cache(self.persistent_cache)
+        shutil.rmtree(self.idsl_dir, ignore_errors=True)
+        shutil.rmtree(self.output_dir, ignore_errors=True)
+
+    def generate(self):
+        results = IceGenerator().generate(self.idsl_dir, self.output_dir)
+        return {result.idsl_file.name: result for result in results}
+
+    def test_generate(self):
+        results = self.generate()
+        self.assertEqual(sorted(results), ["IceBase.idsl", "IceBroken.idsl", "IceTest.idsl"])
+        self.assertIsNotNone(results["IceBroken.idsl"].error)
+        self.assertFalse((self.output_dir / "IceBroken.ice").exists())
+        for name in ["IceBase", "IceTest"]:
+            self.assertIsNone(results[name + ".idsl"].error)
+            self.assertTrue(results[name + ".idsl"].written)
+        ice = (self.output_dir / "IceTest.ice").read_text()
+        self.assertIn("#include <IceBase.ice>", ice)
+        self.assertIn("module RoboCompIceTest", ice)
+
+    def test_skip_unchanged(self):
+        self.generate()
+        results = self.generate()
+        self.assertTrue(results["IceBase.idsl"].up_to_date)
+        self.assertTrue(results["IceTest.idsl"].up_to_date)
+        # failed files are always tried again
+        self.assertFalse(results["IceBroken.idsl"].up_to_date)
+        (self.idsl_dir / "IceBase.idsl").write_text(BASE_IDSL.replace("float y;", "float y; float z;"))
+        (self.output_dir / "IceTest.ice").write_text("modified")
+        results = self.generate()
+        self.assertTrue(results["IceBase.idsl"].written)
+        self.assertIn("float z;", (self.output_dir / "IceBase.ice").read_text())
+        self.assertTrue(results["IceTest.idsl"].written)
+        self.assertIn("module RoboCompIceTest", (self.output_dir / "IceTest.ice").read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import copy
+import pickle
+import unittest
+from dataclasses import FrozenInstanceError
+
+import config_tests
+from robocompdsl.dsl_parsers.specific_parsers.idsl.idsl_ast import IDSLMethod, IDSLModule, IDSLParam, \
+    IDSLStructMember
+from robocompdsl.dsl_parsers.specific_parsers.idsl_parser import IDSLParser
+
+TEST_IDSL = """
+module RoboCompAstTest
+{
+	sequence<float> FloatSeq;
+	struct Pose
+	{
+		float x = 1.5;
+		FloatSeq values;
+	};
+	interface AstTest
+	{
+		void setPose(Pose p, out int code) throws Failed;
+		idempotent Pose getPose();
+	};
+};
+"""
+
+
+class IDSLAstTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.module = IDSLParser().string_to_struct(TEST_IDSL)
+
+    def test_mapping_view(self):
+        module = self.module
+        self.assertIsInstance(module, IDSLModule)
+        self.assertEqual(module['name'], "RoboCompAstTest")
+        interface = module['interfaces'][0]
+        self.assertEqual(list(interface['methods']), ['getPose', 'setPose'])
+        method = interface['methods']['setPose']
+        self.assertIsInstance(method, IDSLMethod)
+        self.assertEqual(method['return'], method.return_type)
+        self.assertEqual(list(method.keys()), ['name', 'decorator', 'return', 'params', 'throws'])
+        self.assertEqual([dict(p) for p in method['params']],
+                         [{'decorator': 'none', 'type': 'Pose', 'name': 'p'},
+                          {'decorator': 'out', 'type': 'int', 'name': 'code'}])
+        self.assertEqual(interface['methods']['getPose']['throws'], 'nothing')
+        self.assertEqual([s['name'] for s in module['structs'] + module['sequences']],
+                         ["RoboCompAstTest/Pose", "RoboCompAstTest/FloatSeq"])
+        self.assertEqual(module['simpleStructs'][0]['strName'], "Pose")
+        with self.assertRaises(KeyError):
+            method['return_type']
+
+    def test_optional_values_are_missing_keys(self):
+        members = self.module['types'][1]['structIdentifiers']
+        self.assertEqual(members[0]['defaultValue'].strip(), "1.5")
+        self.assertNotIn('defaultValue', members[1])
+        with self.assertRaises(KeyError):
+            members[1]['defaultValue']
+        self.assertEqual(self.module['structs'][0].to_dict()['structIdentifiers'][1], {'type': 'FloatSeq', 'identifier': 'values'})
+        self.assertEqual(self.module.to_dict()['structs'][0]['structIdentifiers'][1], ['FloatSeq', 'values'])
+
+    def test_frozen_and_picklable(self):
+        with self.assertRaises(FrozenInstanceError):
+            self.module.name = "Other"
+        self.assertFalse(hasattr(IDSLParam('none', 'int', 'a'), '__dict__'))
+        self.assertEqual(pickle.loads(pickle.dumps(self.module)), self.module)
+        self.assertEqual(copy.deepcopy(self.module), self.module)
+        self.assertEqual(IDSLStructMember('int', 'a', None).to_list(), ['int', 'a'])
+
+    def test_parse_result_released(self):
+        parser = IDSLParser()
+        parser.string_to_struct(TEST_IDSL)
+        self.assertIsNone(parser.pyparsing_result)
+        self.assertIsNone(parser.string)
+
+
+if __name__ == '__main__':
+    unittest.main()
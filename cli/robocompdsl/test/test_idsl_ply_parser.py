@@ -0,0 +1,96 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from pyparsing import ParseException
+
+from config_tests import CURRENT_DIR
+from robocompdsl.dsl_parsers.idslpool import idsl_pool
+from robocompdsl.dsl_parsers.specific_parsers.idsl.ply_parser.idsl_ply_parser import IDSLPlyParser
+from robocompdsl.dsl_parsers.specific_parsers.idsl_parser import IDSLParser
+
+RESOURCES_DIR = os.path.join(CURRENT_DIR, "resources")
+
+TEST_IDSL = """
+// Comment before the module
+module RoboCompPlyTest
+{
+	exception Failed { string what; int code; };
+	enum Mode { Slow, /* in the enum */ Fast = 3 };
+	sequence<byte> Bytes;
+	dictionary<string, float> FloatMap;
+	struct Pose
+	{
+		float x = 1.5;
+		float y=2;
+		string name = "abc"; // trailing comment
+		Mode m;
+	};
+	interface PlyTest
+	{
+		idempotent Pose getPose();
+		void setPose(Pose p, out Mode m) throws Failed, RoboCompOther::Failed;
+		bool check(int a, out FloatMap b);
+	};
+};
+"""
+
+
+class IDSLPlyParserTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.maxDiff = None
+        self.tables_dir = tempfile.mkdtemp(prefix='testrobocompdsl_parsetab_')
+        self.ply_parser = IDSLPlyParser(tables_dir=self.tables_dir)
+        self.pyparsing_parser = IDSLParser()
+
+    def tearDown(self):
+        shutil.rmtree(self.tables_dir, ignore_errors=True)
+
+    def assertSameStruct(self, string):
+        expected = self.pyparsing_parser.string_to_struct(string)
+        result = self.ply_parser.string_to_struct(string)
+        self.assertEqual(result, expected)
+        # dumped without sorting the keys, so the order of the keys is also compared
+        self.assertEqual(json.dumps(result.to_dict(), indent=4), json.dumps(expected.to_dict(), indent=4))
+
+    def test_same_struct(self):
+        self.assertSameStruct(TEST_IDSL)
+
+    def test_same_struct_reference_idsls(self):
+        idsl_files = sorted(map(str, Path(RESOURCES_DIR).rglob("*.idsl")))
+        self.assertIn(os.path.join(RESOURCES_DIR, "KeywordNames.idsl"), idsl_files)
+        for directory in idsl_pool.include_directories:
+            idsl_files += sorted(map(str, Path(directory).glob("*.idsl")))
+        for idsl_file in idsl_files:
+            with self.subTest(idsl_file=idsl_file):
+                with open(idsl_file) as reader:
+                    self.assertSameStruct(reader.read())
+
+    def test_keywords_as_names(self):
+        self.assertSameStruct("module A\n{\n\tinterface B { void f(int interface); };\n};")
+        with self.assertRaises(ParseException):
+            self.ply_parser.string_to_struct("module A\n{\n\tinterface B { void f(int a) out; };\n};")
+
+    def test_parse_error(self):
+        with self.assertRaises(ParseException) as context:
+            self.ply_parser.string_to_struct("module A\n{\n\tinterface B { void f(int a int b); };\n};")
+        self.assertEqual(context.exception.lineno, 3)
+
+    def test_tables_file(self):
+        self.ply_parser.string_to_struct(TEST_IDSL)
+        tables_file = self.ply_parser.tables_file()
+        self.assertTrue(tables_file.is_file())
+        self.assertEqual(os.listdir(self.tables_dir), [tables_file.name])
+        # invalid tables are discarded and generated again
+        tables_file.write_bytes(b"invalid")
+        parser = IDSLPlyParser(tables_dir=self.tables_dir)
+        self.assertEqual(parser.string_to_struct(TEST_IDSL)['name'], "RoboCompPlyTest")
+        self.assertGreater(tables_file.stat().st_size, len(b"invalid"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,219 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import config_tests
+from robocompdsl.dsl_parsers import parsing_utils
+from robocompdsl.dsl_parsers.dsl_cache import DSLCache
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idsl_catalog import IDSLCatalog
+from robocompdsl.dsl_parsers.idslpool import IDSLPool
+
+COMMON_BEHAVIOR_IDSL = """
+module RoboCompCommonBehavior
+{
+    interface CommonBehavior
+    {
+        int getPeriod();
+        void setPeriod(int period);
+    };
+};
+"""
+
+TEST_IDSL = """
+module RoboCompPoolTest
+{
+    sequence<float> FloatSeq;
+    struct Point { float x; float y; };
+    enum Mode { Slow, Fast };
+    interface PoolTest
+    {
+        FloatSeq getValues(Mode m);
+    };
+    interface PoolTestPub
+    {
+        void newPoint(Point p);
+    };
+};
+"""
+
+
+class IDSLPoolTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        (self.idsl_dir / "CommonBehavior.idsl").write_text(COMMON_BEHAVIOR_IDSL)
+        (self.idsl_dir / "PoolTest.idsl").write_text(TEST_IDSL)
+        self.pool = IDSLPool()
+        self.pool.update_directories([self.idsl_dir])
+
+    def tearDown(self):
+        shutil.rmtree(self.idsl_dir, ignore_errors=True)
+
+    def test_module_providing_interface(self):
+        # mandatory modules are loaded on the first query of an empty pool
+        self.assertEqual(self.pool.module_providing_interface("CommonBehavior")['name'], "RoboCompCommonBehavior")
+        self.pool.update_with_idsls(["PoolTest.idsl"])
+        self.assertEqual(self.pool.module_providing_interface("PoolTest")['name'], "RoboCompPoolTest")
+        self.assertEqual(self.pool.module_providing_interface("PoolTestPub")['name'], "RoboCompPoolTest")
+        self.assertIsNone(self.pool.module_providing_interface("NotExisting"))
+
+    def test_kind_of_type(self):
+        self.pool.update_with_idsls(["PoolTest.idsl"])
+        self.assertEqual(self.pool.kind_of_type("FloatSeq"), "sequence")
+        self.assertEqual(self.pool.kind_of_type("Point", "PoolTest"), "struct")
+        self.assertIsNone(self.pool.kind_of_type("Point", "CommonBehavior"))
+        self.assertEqual(parsing_utils.get_kind_from_pool("Mode", self.pool), "enum")
+        self.assertEqual(parsing_utils.get_kind_from_pool("RoboCompPoolTest::Point", self.pool), "struct")
+        self.assertIsNone(parsing_utils.get_kind_from_pool("RoboCompPoolTest::Unknown", self.pool))
+
+    def test_index_updated_on_replace(self):
+        self.pool.update_with_idsls(["PoolTest.idsl"])
+        module = dict(self.pool["PoolTest"])
+        module['interfaces'] = []
+        self.pool["PoolTest"] = module
+        self.assertIsNone(self.pool.module_providing_interface("PoolTest"))
+        self.assertEqual(self.pool.kind_of_type("Point"), "struct")
+
+    def test_index_updated_on_removal(self):
+        self.pool.update_with_idsls(["PoolTest.idsl"])
+        module = self.pool.pop("PoolTest")
+        self.assertIsNone(self.pool.kind_of_type("Point"))
+        self.pool.update(PoolTest=module)
+        self.assertEqual(self.pool.kind_of_type("Point"), "struct")
+        self.assertEqual(self.pool.popitem()[0], "PoolTest")
+        self.assertIsNone(self.pool.kind_of_type("FloatSeq"))
+        self.pool.update([("PoolTest", module)])
+        self.pool.clear()
+        self.assertIsNone(self.pool.kind_of_type("Mode"))
+        # the mandatory modules are loaded again in the empty pool
+        self.assertIsNone(self.pool.module_providing_interface("PoolTest"))
+
+
+# name -> imported files, with several files in the same level of imports
+IMPORTS_GRAPH = {
+    'Top': ['Left', 'Right', 'Shared', 'Extra'],
+    'Left': ['Leaf1', 'Shared'],
+    'Right': ['Leaf2', 'Leaf1'],
+    'Shared': ['Leaf2'],
+    'Extra': [],
+    'Leaf1': [],
+    'Leaf2': [],
+}
+
+
+class IDSLPoolImportsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.persistent_cache = DSLFactory().persistent_cache
+        DSLFactory().set_persistent_cache(None)
+
+    def tearDown(self):
+        DSLFactory().set_persistent_cache(self.persistent_cache)
+
+    def load_graph(self, jobs):
+        idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        self.addCleanup(shutil.rmtree, idsl_dir, ignore_errors=True)
+        (idsl_dir / "CommonBehavior.idsl").write_text(COMMON_BEHAVIOR_IDSL)
+        for name, imports in IMPORTS_GRAPH.items():
+            content = "".join(f'import "{imported}.idsl";\n' for imported in imports)
+            content += f"module RoboComp{name}\n{{\n\tinterface {name}\n\t{{\n\t\tvoid f{name}();\n\t}};\n}};\n"
+            (idsl_dir / f"{name}.idsl").write_text(content)
+        pool = IDSLPool()
+        pool.update_directories([idsl_dir])
+        pool.jobs = jobs
+        result = pool.update_with_idsls(["Top.idsl"])
+        return result, [(name, list(module['recursive_imports'])) for name, module in pool.items()]
+
+    def test_imports_order(self):
+        result, modules = self.load_graph(jobs=1)
+        self.assertEqual(result, ["Left.idsl", "Right.idsl", "Shared.idsl", "Extra.idsl"])
+        # imported modules are stored before the ones importing them
+        self.assertEqual([name for name, _ in modules], ["Leaf1", "Leaf2", "Shared", "Left", "Right", "Extra", "Top"])
+        self.assertEqual(dict(modules)["Top"], ["Leaf1.idsl", "Shared.idsl", "Leaf2.idsl", "Leaf1.idsl", "Leaf2.idsl"])
+        self.assertEqual(dict(modules)["Left"], ["Leaf2.idsl"])
+
+    def test_parallel_imports(self):
+        with mock.patch.object(IDSLPool, '_parse_idsl', wraps=IDSLPool._parse_idsl) as serial_parse:
+            parallel = self.load_graph(jobs=3)
+        # only Top and the leaves, the 4 files of the second level are parsed in worker processes
+        self.assertEqual(serial_parse.call_count, 3)
+        self.assertEqual(parallel, self.load_graph(jobs=1))
+
+    def test_cached_recursive_imports(self):
+        idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        cache_dir = tempfile.mkdtemp(prefix='testrobocompdsl_cache_')
+        self.addCleanup(shutil.rmtree, idsl_dir, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        DSLFactory().set_persistent_cache(DSLCache(cache_dir))
+
+        def write(name, imports):
+            content = "".join(f'import "{imported}.idsl";\n' for imported in imports)
+            (idsl_dir / f"{name}.idsl").write_text(content + f"module RoboComp{name}{{ interface {name} {{ void f(); }}; }};")
+
+        def load():
+            # as a new run, with an empty pool and nothing cached in memory
+            for path in idsl_dir.iterdir():
+                DSLFactory().invalidate(path)
+            pool = IDSLPool()
+            pool.update_directories([idsl_dir])
+            pool.update_with_idsls(["Top.idsl"])
+            return {name: list(module['recursive_imports']) for name, module in pool.items()}
+
+        for name, imports in [("Top", ["Middle"]), ("Middle", ["Bottom"]), ("Bottom", ["Old"]), ("Old", []), ("New", [])]:
+            write(name, imports)
+        self.assertEqual(load()["Middle"], ["Old.idsl"])
+        # Top and Middle are restored from the persistent cache, Bottom is parsed again
+        write("Bottom", ["New"])
+        modules = load()
+        self.assertEqual(modules["Middle"], ["New.idsl"])
+        self.assertEqual(modules["Top"], ["Bottom.idsl"])
+        self.assertNotIn("Old", modules)
+
+    def test_missing_import(self):
+        idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        self.addCleanup(shutil.rmtree, idsl_dir, ignore_errors=True)
+        (idsl_dir / "Broken.idsl").write_text('import "Missing.idsl";\n' + TEST_IDSL)
+        pool = IDSLPool()
+        pool.update_directories([idsl_dir])
+        with self.assertRaises(ValueError):
+            pool.update_with_idsls(["Broken.idsl"])
+
+
+class IDSLCatalogTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.first_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        self.second_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        (self.first_dir / "A.idsl").write_text(TEST_IDSL)
+        (self.second_dir / "A.idsl").write_text(TEST_IDSL)
+        (self.second_dir / "B.idsl").write_text(TEST_IDSL)
+        self.catalog_file = self.first_dir / "catalog.json"
+        self.catalog = IDSLCatalog([self.first_dir, self.second_dir], catalog_file=self.catalog_file)
+
+    def tearDown(self):
+        shutil.rmtree(self.first_dir, ignore_errors=True)
+        shutil.rmtree(self.second_dir, ignore_errors=True)
+
+    def test_precedence(self):
+        self.assertEqual(self.catalog.find("A.idsl"), (self.first_dir / "A.idsl").absolute())
+        self.assertEqual(self.catalog.find("B.idsl"), (self.second_dir / "B.idsl").absolute())
+        self.assertIsNone(self.catalog.find("C.idsl"))
+
+    def test_refresh(self):
+        self.assertIsNone(self.catalog.find("C.idsl"))
+        (self.second_dir / "C.idsl").write_text(TEST_IDSL)
+        self.assertEqual(self.catalog.find("C.idsl"), (self.second_dir / "C.idsl").absolute())
+        (self.first_dir / "A.idsl").unlink()
+        self.assertEqual(self.catalog.find("A.idsl"), (self.second_dir / "A.idsl").absolute())
+
+    def test_save(self):
+        self.catalog.save()
+        catalog = IDSLCatalog([self.second_dir], catalog_file=self.catalog_file)
+        self.assertEqual(set(catalog.files()), {"A.idsl", "B.idsl"})
+
+
+if __name__ == '__main__':
+    unittest.main()
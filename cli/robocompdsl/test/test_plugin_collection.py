@@ -0,0 +1,100 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import config_tests
+from robocompdsl.templates.common.plugin_collection import PluginCollection, PluginManifest
+
+FUNCTIONS_FILE = """\
+from robocompdsl.templates.common.templatedict import TemplateDict
+
+
+class file_txt(TemplateDict):
+    def __init__(self, component):
+        super(file_txt, self).__init__()
+        self['name'] = component
+"""
+
+
+class PluginManifestTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='testrobocompdsl_plugins_')
+        self.plugin_path = os.path.join(self.tmp_dir, "plugin")
+        os.makedirs(os.path.join(self.plugin_path, "functions", "src"))
+        with open(os.path.join(self.plugin_path, "functions", "src", "file_txt.py"), 'w') as writer:
+            writer.write(FUNCTIONS_FILE)
+        self.manifest = PluginManifest(os.path.join(self.tmp_dir, "manifest.json"))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_template_dicts(self):
+        functions_file = os.path.join(self.plugin_path, "functions", "src", "file_txt.py")
+        self.assertEqual(self.manifest.template_dicts(self.plugin_path),
+                         {"src/file_txt.py": (functions_file, "file_txt")})
+        with open(os.path.join(self.plugin_path, "functions", "other_txt.py"), 'w') as writer:
+            writer.write(FUNCTIONS_FILE.replace("file_txt", "other_txt"))
+        self.assertIn("other_txt.py", self.manifest.template_dicts(self.plugin_path))
+
+    def test_save(self):
+        self.manifest.template_dicts(self.plugin_path)
+        self.manifest.save()
+        manifest = PluginManifest(self.manifest.manifest_file)
+        manifest.template_dicts(self.plugin_path)
+        # loaded from the manifest file, nothing new to save
+        self.assertFalse(manifest._modified)
+
+    def test_plugins(self):
+        plugins = self.manifest.plugins('robocompdsl.templates.templatePython.plugins')
+        self.assertIn(('robocompdsl.templates.templatePython.plugins.base.base', 'Base'), plugins)
+
+    def _install_plugins(self, install_dir, modules):
+        package_path = os.path.join(self.tmp_dir, install_dir, "testrobocompdsl_plugins")
+        os.makedirs(package_path)
+        open(os.path.join(package_path, "__init__.py"), 'w').close()
+        for module in modules:
+            with open(os.path.join(package_path, module.lower() + ".py"), 'w') as writer:
+                writer.write(f"from robocompdsl.templates.common.plugin_collection import Plugin\n\n\n"
+                             f"class {module}(Plugin):\n    pass\n")
+        return os.path.dirname(package_path)
+
+    def _plugins_installed_in(self, install_path):
+        sys.modules.pop('testrobocompdsl_plugins', None)
+        sys.path.insert(0, install_path)
+        try:
+            manifest = PluginManifest(self.manifest.manifest_file)
+            plugins = manifest.plugins('testrobocompdsl_plugins')
+            manifest.save()
+        finally:
+            sys.path.remove(install_path)
+            sys.modules.pop('testrobocompdsl_plugins', None)
+        return plugins
+
+    def test_plugins_of_each_install(self):
+        # two installs of the same package sharing the manifest file
+        first = self._install_plugins("first", ["First"])
+        second = self._install_plugins("second", ["First", "Second"])
+        self.assertEqual(self._plugins_installed_in(first), [('testrobocompdsl_plugins.first', 'First')])
+        self.assertEqual(self._plugins_installed_in(second), [('testrobocompdsl_plugins.first', 'First'),
+                                                              ('testrobocompdsl_plugins.second', 'Second')])
+        self.assertEqual(self._plugins_installed_in(first), [('testrobocompdsl_plugins.first', 'First')])
+
+
+class PluginCollectionTestCase(unittest.TestCase):
+
+    def test_lazy_template_dicts(self):
+        plugins = PluginCollection('robocompdsl.templates.templateICE.plugins')
+        plugin = plugins[0]
+        self.assertEqual(plugin.classes, {})
+        self.assertEqual(plugin.get_template_dict("not_a_template.txt", None), {})
+        self.assertEqual(plugin.classes, {})
+        relative_path = next(iter(plugin.template_dict_files))
+        the_class = plugin.get_template_dict_class(relative_path)
+        self.assertEqual(plugin.classes, {relative_path: the_class})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+
+import config_tests
+from robocompdsl.common.profiler import Profiler
+
+
+class ProfilerTestCase(unittest.TestCase):
+
+    def test_disabled(self):
+        profiler = Profiler()
+        with profiler.span("stage"):
+            pass
+        self.assertEqual(profiler.call("value", "template value", max, 1, 2), 2)
+        self.assertEqual(profiler.events, [])
+
+    def test_summary_and_trace(self):
+        profiler = Profiler()
+        profiler.enable()
+        with profiler.span("generate", output_path="."):
+            for _ in range(3):
+                profiler.call("render", "file", sum, [1, 2])
+        summary = profiler.summary()
+        self.assertEqual([(row[0], row[1], row[2]) for row in summary], [("stage", "generate", 1), ("file", "render", 3)])
+        trace = profiler.trace()
+        self.assertEqual(len(trace['traceEvents']), 4)
+        first = trace['traceEvents'][0]
+        self.assertEqual((first['name'], first['ph'], first['args']), ("generate", "X", {'output_path': "."}))
+        self.assertTrue(all(event['dur'] >= 0 for event in trace['traceEvents']))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,249 @@
+import asyncio
+import concurrent.futures
+import os
+import threading
+import types
+import unittest
+from string import Template
+
+import config_tests
+import robocompdsl
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.templates.templatePython.plugins.base.functions.src.interfaces_py import ASYNC_PROXIES_BASE_STR, \
+    BATCH_PUBLISHER_STR, src_interfaces_py
+
+SERVICES_IDSL = """
+module RoboCompServices
+{
+    sequence<float> Values;
+    interface Services
+    {
+        float sum(Values values, float offset);
+        void getState(out int state, out string name);
+        void slow();
+    };
+};
+"""
+
+
+class FakeProxy:
+    """
+    Proxy with the *Async methods returning concurrent futures, completed from another thread like Ice does
+    """
+    def _completed(self, function, *args):
+        future = concurrent.futures.Future()
+        threading.Thread(target=lambda: future.set_result(function(*args))).start()
+        return future
+
+    def sumAsync(self, values, offset):
+        return self._completed(lambda: sum(values) + offset)
+
+    def getStateAsync(self):
+        return self._completed(lambda: (1, "ready"))
+
+    def slowAsync(self):
+        # never completed
+        return concurrent.futures.Future()
+
+
+class AsyncProxiesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        module, _ = DSLFactory().from_string(SERVICES_IDSL, 'idsl')
+        self.code = src_interfaces_py.async_proxy_class(module, "Services")
+        # Ice.wrap_future turns the Ice futures into asyncio ones
+        self.namespace = {'Ice': types.SimpleNamespace(wrap_future=asyncio.wrap_future)}
+        exec(compile(ASYNC_PROXIES_BASE_STR + self.code, "interfaces.py", "exec"), self.namespace)
+
+    def test_methods(self):
+        self.assertIn("async def sum(self, values, offset, timeout=None):", self.code)
+        self.assertIn("self.proxy.sumAsync(values, offset)", self.code)
+        self.assertIn("async def getState(self, timeout=None):", self.code)
+
+    def test_run_calls(self):
+        services = self.namespace['ServicesAsync'](FakeProxy())
+        total, state = self.namespace['run_calls'](services.sum([1., 2.], 3.), services.getState())
+        self.assertEqual(total, 6.)
+        self.assertEqual(state, (1, "ready"))
+
+    def test_timeouts(self):
+        services = self.namespace['ServicesAsync'](FakeProxy(), timeout=5)
+        slow, state = self.namespace['run_calls'](services.slow(timeout=0.05), services.getState())
+        self.assertIsInstance(slow, asyncio.TimeoutError)
+        self.assertEqual(state, (1, "ready"))
+
+
+class FakeBatchProxy:
+    def __init__(self):
+        self.queued = []
+        self.sent = []
+
+    def newData(self, data):
+        self.queued.append(data)
+
+    def ice_flushBatchRequests(self):
+        self.sent.append(self.queued)
+        self.queued = []
+
+
+class BatchPublisherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        namespace = {'threading': threading}
+        exec(compile(BATCH_PUBLISHER_STR, "interfaces.py", "exec"), namespace)
+        self.proxy = FakeBatchProxy()
+        self.batch_publisher = namespace['BatchPublisher']
+
+    def test_flush_size(self):
+        publisher = self.batch_publisher(self.proxy, 60, 2)
+        for data in range(5):
+            publisher.newData(data)
+        self.assertEqual(self.proxy.sent, [[0, 1], [2, 3]])
+        self.assertEqual(publisher.stats(), {'batched': 5, 'flushed': 2, 'pending': 1})
+        # the rest are sent when closing
+        publisher.close()
+        self.assertEqual(self.proxy.sent, [[0, 1], [2, 3], [4]])
+
+    def test_flush_period(self):
+        publisher = self.batch_publisher(self.proxy, 0.01, 100)
+        publisher.newData(0)
+        publisher.newData(1)
+        for _ in range(100):
+            if self.proxy.sent:
+                break
+            threading.Event().wait(0.01)
+        publisher.close()
+        self.assertEqual(self.proxy.sent, [[0, 1]])
+        self.assertEqual(publisher.stats(), {'batched': 2, 'flushed': 1, 'pending': 0})
+
+    def test_flush_period_disabled(self):
+        publisher = self.batch_publisher(self.proxy, 0, 100)
+        publisher.newData(0)
+        publisher.newData(1)
+        # the flusher waits for the close instead of flushing all the time
+        threading.Event().wait(0.05)
+        self.assertEqual(self.proxy.sent, [])
+        self.assertTrue(publisher.flusher.is_alive())
+        publisher.close()
+        self.assertEqual(self.proxy.sent, [[0, 1]])
+        self.assertEqual(publisher.stats(), {'batched': 2, 'flushed': 1, 'pending': 0})
+
+
+class FakeIce:
+    class Exception(Exception):
+        pass
+
+    class ConnectionRefusedException(Exception):
+        pass
+
+    class CommunicatorDestroyedException(Exception):
+        pass
+
+
+class FakeIceStorm:
+    class NoSuchTopic(FakeIce.Exception):
+        pass
+
+
+class FakeTopic:
+    def __init__(self):
+        self.subscribers = []
+
+    def subscribeAndGetPublisher(self, qos, proxy):
+        self.subscribers.append(proxy)
+
+
+class FakeTopicManager:
+    """
+    Topic manager refusing the connections the given number of times for each topic
+    """
+    def __init__(self, failures):
+        self.failures = dict(failures)
+        self.topics = {}
+
+    def retrieve(self, name):
+        if self.failures.get(name, 0) > 0:
+            self.failures[name] -= 1
+            raise FakeIce.ConnectionRefusedException()
+        if name not in self.topics:
+            raise FakeIceStorm.NoSuchTopic()
+        return self.topics[name]
+
+    def create(self, name):
+        return self.topics.setdefault(name, FakeTopic())
+
+
+class FakeAdapter:
+    def __init__(self):
+        self.active = False
+
+    def addWithUUID(self, handler):
+        return types.SimpleNamespace(ice_oneway=lambda: handler)
+
+    def activate(self):
+        self.active = True
+
+
+class FakeConnector:
+    def __init__(self, deadline):
+        self.properties = types.SimpleNamespace(getPropertyAsIntWithDefault=lambda name, default: deadline)
+
+    def getProperties(self):
+        return self.properties
+
+    def createObjectAdapter(self, name):
+        return FakeAdapter()
+
+
+class SubscribesTestCase(unittest.TestCase):
+
+    def setUp(self):
+        template_path = os.path.join(os.path.dirname(robocompdsl.__file__), "templates", "templatePython", "files",
+                                     "src", "interfaces.py")
+        with open(template_path) as template_file:
+            template = template_file.read()
+        code = template[template.index("class Subscribes:"):template.index("class Implements:")]
+        code = Template(code).substitute(subscribes_adapters_creation="")
+        manager_code = template[template.index("class InterfaceManager:"):]
+        code += Template(manager_code).safe_substitute(needs_rcnode="False", close_batch_topics="")
+        self.namespace = {'threading': threading, 'time': __import__('time'), 'Ice': FakeIce,
+                          'IceStorm': FakeIceStorm, 'Text': lambda text, style=None: text,
+                          'console': types.SimpleNamespace(log=lambda *args, **kwargs: None)}
+        exec(compile(code, "interfaces.py", "exec"), self.namespace)
+
+    def subscribes(self, topic_manager, deadline=30):
+        subscribes = self.namespace['Subscribes'](FakeConnector(deadline), topic_manager, None)
+        subscribes.FIRST_RETRY_DELAY = 0.001
+        return subscribes
+
+    def test_concurrent_subscriptions(self):
+        topic_manager = FakeTopicManager({'IMUPub': 3})
+        subscribes = self.subscribes(topic_manager)
+        imu_adapter = subscribes.create_adapter("IMUPubTopic", "imu handler")
+        camera_adapter = subscribes.create_adapter("CameraSimpleTopic", "camera handler")
+        self.assertTrue(subscribes.wait(5))
+        self.assertTrue(imu_adapter.active and camera_adapter.active)
+        self.assertEqual(topic_manager.topics['IMUPub'].subscribers, ["imu handler"])
+        self.assertEqual(set(subscribes.setup_times), {'IMUPub', 'CameraSimple'})
+        # the retries of a topic don't delay the rest
+        self.assertLess(subscribes.setup_times['CameraSimple'], subscribes.setup_times['IMUPub'])
+
+    def test_deadline(self):
+        subscribes = self.subscribes(FakeTopicManager({'IMUPub': 1000}), deadline=0)
+        adapter = subscribes.create_adapter("IMUPubTopic", "imu handler")
+        self.assertFalse(subscribes.wait(5))
+        self.assertEqual(subscribes.failed, ['IMUPub'])
+        self.assertFalse(adapter.active)
+
+    def test_wait_subscriptions(self):
+        interface_manager = object.__new__(self.namespace['InterfaceManager'])
+        interface_manager.subscribes = None
+        self.assertEqual(interface_manager.wait_subscriptions(5), [])
+        interface_manager.subscribes = self.subscribes(FakeTopicManager({'IMUPub': 1000}), deadline=0)
+        interface_manager.subscribes.create_adapter("IMUPubTopic", "imu handler")
+        interface_manager.subscribes.create_adapter("CameraSimpleTopic", "camera handler")
+        self.assertEqual(interface_manager.wait_subscriptions(5), ['IMUPub'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,142 @@
+import os
+import sys
+import types
+import unittest
+from string import Template
+from unittest import mock
+
+import config_tests
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.templates.templatePython.plugins.base.functions.src.interfaces_py import FAST_LIST_BASE_STR, \
+    FAST_LIST_CLASSES_STR, src_interfaces_py
+
+SENSORS_IDSL = """
+module RoboCompSensors
+{
+    sequence<byte> Image;
+    sequence<float> Depth;
+    struct Point { float x; float y; byte label; };
+    sequence<Point> Points;
+    struct Named { string name; float value; };
+    sequence<Named> NamedValues;
+    sequence<string> Names;
+    interface Sensors { void getImage(out Image image); };
+};
+"""
+
+
+def load_sequences(checks):
+    """
+    Execute the code generated for a float sequence with the FastSequences option
+    """
+    code = FAST_LIST_BASE_STR + Template(FAST_LIST_CLASSES_STR).substitute(
+        list_type="FloatSeq", item_type="float", dtype="'float32'", module_name="RoboCompTest")
+    namespace = {'RoboCompTest': types.SimpleNamespace()}
+    with mock.patch.dict(os.environ, {'ROBOCOMP_SEQUENCE_CHECKS': str(checks)}):
+        exec(compile(code, "interfaces.py", "exec"), namespace)
+    return namespace
+
+
+class FastSequencesTestCase(unittest.TestCase):
+
+    def test_unchecked(self):
+        namespace = load_sequences(0)
+        float_seq = namespace['FloatSeq']
+        self.assertIs(namespace['RoboCompTest'].FloatSeq, float_seq)
+        # plain list methods
+        self.assertIs(float_seq.append, list.append)
+        sequence = float_seq([1.0, 2.0])
+        sequence.append("not checked")
+        self.assertEqual(sequence, [1.0, 2.0, "not checked"])
+
+    def test_checked(self):
+        namespace = load_sequences(1)
+        float_seq = namespace['FloatSeq']
+        sequence = float_seq([1.0])
+        sequence.append(2.0)
+        sequence.extend([3.0, 4.0])
+        sequence.insert(0, 0.0)
+        self.assertEqual(sequence, [0.0, 1.0, 2.0, 3.0, 4.0])
+        for call in [lambda: float_seq([1.0, "a"]), lambda: sequence.append("a"),
+                     lambda: sequence.extend([5.0, "a"]), lambda: sequence.insert(0, "a")]:
+            with self.assertRaises(TypeError):
+                call()
+        # bulk construction doesn't check the items
+        self.assertEqual(float_seq.from_items([1.0, "a"]), [1.0, "a"])
+        self.assertIsInstance(float_seq.from_items([1.0]), float_seq)
+
+    def test_sampled(self):
+        float_seq = load_sequences(2)['FloatSeq']
+        # only one of every two items is checked
+        self.assertEqual(float_seq([1.0, "a", 2.0]), [1.0, "a", 2.0])
+        with self.assertRaises(TypeError):
+            float_seq(["a", 1.0])
+
+    def test_numpy(self):
+        namespace = load_sequences(0)
+        if namespace['numpy'] is None:
+            with self.assertRaises(ImportError):
+                namespace['FloatSeq']([1.0]).to_numpy()
+            return
+        array = namespace['FloatSeq']([1.0, 2.0]).to_numpy()
+        self.assertEqual(str(array.dtype), 'float32')
+        self.assertEqual(namespace['FloatSeq'].from_numpy(array), [1.0, 2.0])
+
+
+class NumpyHelpersTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.module, _ = DSLFactory().from_string(SENSORS_IDSL, 'idsl')
+        self.sequences = {sequence['name'].split('/')[1]: sequence for sequence in self.module['sequences']}
+
+    def helpers(self, name):
+        return src_interfaces_py.sequence_helpers(self.sequences[name], self.module)
+
+    def test_bytes(self):
+        helpers = self.helpers('Image')
+        self.assertIn("def Image_to_numpy(data, shape=None, dtype='uint8')", helpers)
+        self.assertIn("numpy.frombuffer(data, dtype=dtype)", helpers)
+        self.assertIn("def Image_from_numpy(array)", helpers)
+
+    def test_numbers(self):
+        helpers = self.helpers('Depth')
+        self.assertIn("numpy.frombuffer(data, dtype='float32')", helpers)
+        self.assertIn("numpy.ascontiguousarray(array, dtype='float32')", helpers)
+
+    def test_structs(self):
+        helpers = self.helpers('Points')
+        self.assertIn("Points_dtype = numpy.dtype([('x', 'float32'), ('y', 'float32'), ('label', 'uint8')])", helpers)
+        self.assertIn("[(item.x, item.y, item.label) for item in data]", helpers)
+        self.assertIn("RoboCompSensors.Point(*fields)", helpers)
+        compile("class RoboCompSensorsArrays:" + helpers, "interfaces.py", "exec")
+
+    def test_not_numeric(self):
+        self.assertEqual(self.helpers('NamedValues'), "")
+        self.assertEqual(self.helpers('Names'), "")
+
+    def test_without_numpy(self):
+        for fast_sequences in [False, True]:
+            with self.subTest(fast_sequences=fast_sequences):
+                component = types.SimpleNamespace(
+                    imports=['Sensors.idsl'], recursiveImports=[],
+                    idsl_pool=types.SimpleNamespace(module_providing_interface=lambda name: self.module),
+                    options=types.SimpleNamespace(numpyhelpers=True, fastsequences=fast_sequences))
+                interfaces = src_interfaces_py(component)
+                code = interfaces.create_lists_classes() + interfaces.numpy_helpers()
+                self.assertEqual(code.count("import numpy"), 1)
+                namespace = {'RoboCompSensors': types.SimpleNamespace(Point=object, Named=object)}
+                # the component can be loaded without numpy, only the conversions fail
+                with mock.patch.dict(sys.modules, {'numpy': None}):
+                    exec(compile(code, "interfaces.py", "exec"), namespace)
+                self.assertIsNone(namespace['numpy'])
+                arrays = namespace['RoboCompSensorsArrays']
+                for convert in [arrays.Image_to_numpy, arrays.Depth_to_numpy, arrays.Points_to_numpy]:
+                    with self.assertRaisesRegex(ImportError, "numpy is needed to convert the sequences to arrays"):
+                        convert([])
+                if fast_sequences:
+                    with self.assertRaisesRegex(ImportError, "numpy is needed to convert the sequences to arrays"):
+                        namespace['Depth']([1.0]).to_numpy()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+import os
+import shutil
+import stat
+import subprocess
+import sys
+import tempfile
+import types
+import unittest
+from pathlib import Path
+from string import Template
+
+import config_tests
+from robocompdsl.templates.templatePython import files as python_files
+from robocompdsl.templates.templatePython.plugins.base.functions import function_utils as utils
+from robocompdsl.templates.templatePython.plugins.base.functions.src.CMakeLists_txt import src_CMakeLists_txt
+
+FAKE_SLICE2PY = """\
+#!/bin/sh
+# records the arguments of each call in the output directory
+while [ "$1" != "--output-dir" ]; do shift; done
+shift
+echo "$@" >> "$1/calls.txt"
+"""
+
+
+def fake_component(precompiled_slices):
+    return types.SimpleNamespace(name="slicescomp", imports=['Sensors.idsl'], recursiveImports=['Base.idsl'],
+                                 ice_interfaces_names=['Sensors'],
+                                 options=types.SimpleNamespace(precompiledslices=precompiled_slices))
+
+
+class FakeIce:
+    def __init__(self):
+        self.loaded = []
+
+    def loadSlice(self, arguments):
+        self.loaded.append(arguments)
+
+
+class SliceLoadingTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.src_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_slices_')) / "src"
+        self.src_dir.mkdir()
+        self.slices_dir = str(self.src_dir / "slices")
+        self.addCleanup(shutil.rmtree, self.src_dir.parent, ignore_errors=True)
+        self.sys_path = list(sys.path)
+        self.addCleanup(setattr, sys, 'path', self.sys_path)
+
+    def load_slices(self, component):
+        """
+        Execute the code generated to load the slices of the Sensors and Base modules, as interfaces.py would
+        """
+        code = utils.slices_dir_setup(component)
+        for ice_name in ['Sensors', 'Base']:
+            code += utils.slice_loading(component, ice_name, "RoboComp" + ice_name)
+        ice = FakeIce()
+        exec(compile(code, "interfaces.py", "exec"), {'Ice': ice, '__file__': str(self.src_dir / "interfaces.py")})
+        return ice.loaded
+
+    def test_precompiled(self):
+        os.makedirs(os.path.join(self.slices_dir, "RoboCompSensors"))
+        # only the modules not precompiled are loaded from the .ice files
+        self.assertEqual(self.load_slices(fake_component(True)), ["-I ./src/ --all ./src/Base.ice"])
+        self.assertEqual(sys.path[0], self.slices_dir)
+        self.load_slices(fake_component(True))
+        self.assertEqual(sys.path.count(self.slices_dir), 1)
+
+    def test_not_precompiled(self):
+        # without the slices directory everything is loaded from the .ice files
+        self.assertEqual(self.load_slices(fake_component(True)),
+                         ["-I ./src/ --all ./src/Sensors.ice", "-I ./src/ --all ./src/Base.ice"])
+        self.assertNotIn(self.slices_dir, sys.path)
+
+    def test_without_option(self):
+        os.makedirs(os.path.join(self.slices_dir, "RoboCompSensors"))
+        self.assertEqual(utils.slices_dir_setup(fake_component(False)), "")
+        self.assertEqual(self.load_slices(fake_component(False)),
+                         ["-I ./src/ --all ./src/Sensors.ice", "-I ./src/ --all ./src/Base.ice"])
+        self.assertNotIn(self.slices_dir, sys.path)
+
+
+class PrecompiledSlicesCMakeTestCase(unittest.TestCase):
+
+    def render(self, component):
+        with open(os.path.join(os.path.dirname(python_files.__file__), "src", "CMakeLists.txt")) as reader:
+            return Template(reader.read()).substitute(src_CMakeLists_txt(component))
+
+    def test_cmake_lists(self):
+        cmake_lists = self.render(fake_component(True))
+        self.assertIn("ROBOCOMP_IDSL_TO_ICE( CommonBehavior Base Sensors )", cmake_lists)
+        self.assertIn("SET( SLICE_FILES CommonBehavior.ice Base.ice Sensors.ice )", cmake_lists)
+        self.assertIn("--output-dir ${CMAKE_CURRENT_SOURCE_DIR}/slices ${SLICE_FILES}", cmake_lists)
+        self.assertNotIn("slice2py", self.render(fake_component(False)))
+
+    @unittest.skipUnless(shutil.which("cmake") and shutil.which("make") and sys.platform.startswith('linux'),
+                         "cmake and make are needed to build the slices target")
+    def test_slices_target(self):
+        build_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_slices_build_'))
+        self.addCleanup(shutil.rmtree, build_dir, ignore_errors=True)
+        src_dir = build_dir / "src"
+        src_dir.mkdir()
+        for ice_name in ['CommonBehavior', 'Base', 'Sensors']:
+            (src_dir / f"{ice_name}.ice").write_text(f"module RoboComp{ice_name}{{}};")
+        # the robocomp cmake macros are not needed to build the slices
+        (src_dir / "CMakeLists.txt").write_text("cmake_minimum_required(VERSION 3.5)\nPROJECT( slicescomp NONE )\n"
+                                                + src_CMakeLists_txt(fake_component(True))['precompiled_slices'])
+        slice2py = build_dir / "slice2py"
+        slice2py.write_text(FAKE_SLICE2PY)
+        slice2py.chmod(slice2py.stat().st_mode | stat.S_IEXEC)
+        binary_dir = build_dir / "build"
+        subprocess.run(["cmake", "-S", str(src_dir), "-B", str(binary_dir), f"-DSLICE2PY_EXECUTABLE={slice2py}"],
+                       check=True, stdout=subprocess.DEVNULL)
+        for _ in range(2):
+            subprocess.run(["cmake", "--build", str(binary_dir)], check=True, stdout=subprocess.DEVNULL)
+        self.assertTrue((src_dir / "slices" / ".stamp").is_file())
+        # compiled once, the second build finds the slices up to date
+        self.assertEqual((src_dir / "slices" / "calls.txt").read_text().splitlines(),
+                         [f"{src_dir}/slices CommonBehavior.ice Base.ice Sensors.ice"])
+
+
+if __name__ == '__main__':
+    unittest.main()
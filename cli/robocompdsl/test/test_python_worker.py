@@ -0,0 +1,138 @@
+import os
+import tempfile
+import textwrap
+import time
+import types
+import unittest
+from unittest import mock
+
+import config_tests
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.templates.templatePython.plugins.base.functions.SERVANT_PY import SERVANT_PY
+from robocompdsl.templates.templatePython.plugins.base.functions.src.genericworker_py import COMPUTE_SCHEDULER_STR, \
+    SERVANT_METRICS_STR
+
+COUNTER_IDSL = """
+module RoboCompCounter
+{
+    interface Counter
+    {
+        int add(int value);
+    };
+};
+"""
+
+
+class FakeTimer:
+    def __init__(self):
+        self.timeout = types.SimpleNamespace(connect=lambda slot: None)
+        self.intervals = []
+
+    def setSingleShot(self, single_shot):
+        pass
+
+    def setTimerType(self, timer_type):
+        pass
+
+    def start(self, interval):
+        self.intervals.append(interval)
+
+
+class ComputeSchedulerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        namespace = {'QtCore': types.SimpleNamespace(Qt=types.SimpleNamespace(PreciseTimer=0)),
+                     'RoboCompCommonBehavior': types.SimpleNamespace(CommonBehavior=object)}
+        exec(compile(COMPUTE_SCHEDULER_STR, "genericworker.py", "exec"), namespace)
+        self.worker = types.SimpleNamespace(Period=100, timer=FakeTimer())
+        self.scheduler = namespace['ComputeScheduler'](self.worker)
+        self.now = 0.
+
+    def run_computes(self, durations, mode):
+        """
+        Run compute() as the timer would, taking the given durations in seconds
+        """
+        self.scheduler.mode = mode
+        self.worker.timer.start(self.worker.Period)
+        with mock.patch('time.monotonic', lambda: self.now):
+            for duration in durations:
+                self.now += self.worker.timer.intervals[-1] / 1000
+                self.scheduler.compute = lambda: setattr(self, 'now', self.now + duration)
+                self.scheduler.run()
+        return self.worker.timer.intervals[1:]
+
+    def test_fixed_rate(self):
+        # the call lasting 0.25 s misses the next two periods
+        self.assertEqual(self.run_computes([0.01, 0.25, 0.01], "FixedRate"), [90, 50, 90])
+        stats = self.scheduler.stats()
+        self.assertEqual((stats['calls'], stats['overruns'], stats['missed']), (3, 1, 2))
+        self.assertAlmostEqual(stats['max_duration'], 250)
+        self.assertAlmostEqual(stats['mean_duration'], 90)
+
+    def test_max_rate(self):
+        self.assertEqual(self.run_computes([0.01, 0.25, 0.01], "MaxRate"), [90, 0, 90])
+        stats = self.scheduler.stats()
+        self.assertEqual((stats['overruns'], stats['missed']), (1, 0))
+
+    def test_new_period(self):
+        self.run_computes([0.01], "FixedRate")
+        self.worker.Period = 50
+        # setPeriod restarts the timer with the new period
+        self.assertEqual(self.run_computes([0.01], "FixedRate"), [90, 50, 40])
+        self.assertAlmostEqual(self.scheduler.stats()['jitter'], 0)
+
+
+class ServantMetricsTestCase(unittest.TestCase):
+
+    def setUp(self):
+        namespace = {}
+        exec(compile(SERVANT_METRICS_STR, "genericworker.py", "exec"), namespace)
+        self.metrics = namespace['ServantMetrics']()
+
+    def test_histogram(self):
+        for latency in [0.0000005, 0.000003, 0.000003, 0.0001]:
+            self.metrics.record("Counter.add", latency)
+        self.metrics.record("Counter.add", 100., error=True)
+        stats = self.metrics.stats()["Counter.add"]
+        self.assertEqual((stats['calls'], stats['errors']), (5, 1))
+        # buckets up to 1, 4, 128 us and the last one
+        self.assertEqual([(bucket, calls) for bucket, calls in enumerate(stats['buckets']) if calls],
+                         [(0, 1), (2, 2), (7, 1), (24, 1)])
+        self.assertEqual(self.metrics.report(),
+                         "Counter.add calls=5 errors=1 mean=20000021.2 p50<=4 p99<=inf "
+                         "histogram=1:1,4:2,128:1,inf:1\n")
+
+    def test_dump(self):
+        self.metrics.record("Counter.add", 0.001)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "servant_metrics.txt")
+            self.metrics.start_dump(path, 0.01)
+            for _ in range(100):
+                if os.path.exists(path) and os.path.getsize(path):
+                    break
+                time.sleep(0.01)
+            self.metrics.stop_dump()
+            with open(path) as dump_file:
+                self.assertTrue(dump_file.read().startswith("Counter.add calls=1 errors=0"))
+
+    def test_servant(self):
+        module, _ = DSLFactory().from_string(COUNTER_IDSL, 'idsl')
+        code = SERVANT_PY.interface_methods(module, "Counter", timed=True)
+        namespace = {'time': time}
+        exec(compile("class CounterI:" + textwrap.indent(code, "    "), "counterI.py", "exec"), namespace)
+        servant = namespace['CounterI']()
+
+        def add(value):
+            if value < 0:
+                raise ValueError(value)
+            return value + 1
+        servant.worker = types.SimpleNamespace(Counter_add=add, servant_metrics=self.metrics)
+        self.assertEqual(servant.add(1, None), 2)
+        with self.assertRaises(ValueError):
+            servant.add(-1, None)
+        stats = self.metrics.stats()["Counter.add"]
+        self.assertEqual((stats['calls'], stats['errors']), (2, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
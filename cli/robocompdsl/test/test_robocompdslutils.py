@@ -0,0 +1,34 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import config_tests
+from robocompdsl.common.robocompdslutils import write_if_changed
+
+
+class WriteIfChangedTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='testrobocompdsl_write_')
+        self.file_path = os.path.join(self.tmp_dir, "file.txt")
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_write_if_changed(self):
+        self.assertTrue(write_if_changed(self.file_path, "content\n"))
+        os.chmod(self.file_path, 0o755)
+        os.utime(self.file_path, ns=(1000000000, 1000000000))
+        self.assertFalse(write_if_changed(self.file_path, "content\n"))
+        self.assertEqual(os.stat(self.file_path).st_mtime_ns, 1000000000)
+        self.assertTrue(write_if_changed(self.file_path, "new content\n"))
+        with open(self.file_path) as reader:
+            self.assertEqual(reader.read(), "new content\n")
+        self.assertEqual(os.stat(self.file_path).st_mode & 0o777, 0o755)
+        # no temporary files left
+        self.assertEqual(os.listdir(self.tmp_dir), ["file.txt"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+import unittest
+
+import config_tests
+from robocompdsl.templates.common.abstracttemplatesmanager import CompiledTemplate
+from robocompdsl.templates.common.templatedict import TemplateDict, concatenate_values
+
+
+class CountingTemplateDict(TemplateDict):
+    def __init__(self):
+        super(CountingTemplateDict, self).__init__()
+        self.calls = []
+        self['used'] = self.used
+        self['unused'] = self.unused
+        self['constant'] = "constant"
+
+    def used(self):
+        self.calls.append('used')
+        return "used value"
+
+    def unused(self):
+        self.calls.append('unused')
+        return "unused value"
+
+
+class TemplateDictTestCase(unittest.TestCase):
+
+    def test_lazy_values(self):
+        template_dict = CountingTemplateDict()
+        result = CompiledTemplate("${used} ${constant}\n${used}\n").render(template_dict)
+        self.assertEqual(result, "used value constant\nused value\n")
+        # only the identifiers in the template are computed, and only once
+        self.assertEqual(template_dict.calls, ['used'])
+
+    def test_dict_conversion(self):
+        template_dict = CountingTemplateDict()
+        self.assertEqual(dict(template_dict), {'used': "used value", 'unused': "unused value", 'constant': "constant"})
+        self.assertEqual(dict(**template_dict), dict(template_dict.items()))
+        self.assertEqual(sorted(template_dict.calls), ['unused', 'used'])
+
+    def test_concatenate_values(self):
+        first, second = CountingTemplateDict(), CountingTemplateDict()
+        self.assertEqual(concatenate_values('used', [first, second]), "used valueused value")
+
+
+if __name__ == '__main__':
+    unittest.main()
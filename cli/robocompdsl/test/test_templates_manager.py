@@ -0,0 +1,50 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import config_tests
+from robocompdsl.templates.common.abstracttemplatesmanager import AbstractTemplatesManager, RenderJob
+
+
+class FakeTemplatesManager(AbstractTemplatesManager):
+    def __init__(self):
+        super(FakeTemplatesManager, self).__init__(None, [])
+
+    def _render_template(self, template, interface_name=None):
+        if template.endswith("invalid"):
+            raise ValueError("invalid template")
+        return f"{os.path.basename(template)} {interface_name}\n", []
+
+
+class TemplatesManagerTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.mkdtemp(prefix='testrobocompdsl_manager_')
+        self.jobs = []
+        for name in [f"template{i}" for i in range(8)] + ["invalid"]:
+            template = os.path.join(self.tmp_dir, name)
+            with open(template, 'w') as writer:
+                writer.write("${value}\n")
+            interface_name = f"Interface{name[-1]}" if name[-1] in "02468" else None
+            self.jobs.append(RenderJob(name, template, template + ".txt", interface_name, 'generated'))
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_parallel_rendering(self):
+        for jobs in [1, 3]:
+            with self.subTest(jobs=jobs):
+                manager = FakeTemplatesManager()
+                manager.jobs = jobs
+                manager._run_render_jobs(self.jobs)
+                written = [job.output_file for job in self.jobs[:-1]]
+                self.assertEqual(manager.written_files if jobs == 1 else manager.unchanged_files, written)
+                for job in self.jobs[:-1]:
+                    with open(job.output_file) as reader:
+                        self.assertEqual(reader.read(), f"{job.template_file} {job.interface_name}\n")
+                self.assertFalse(os.path.exists(self.jobs[-1].output_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
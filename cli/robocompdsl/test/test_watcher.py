@@ -0,0 +1,131 @@
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import config_tests
+from robocompdsl.common.watcher import ComponentWatcher, InotifyWatcher, PollingWatcher
+from robocompdsl.dsl_parsers.dsl_cache import DSLCache
+from robocompdsl.dsl_parsers.dsl_factory import DSLFactory
+from robocompdsl.dsl_parsers.idslpool import IDSLPool
+
+
+class FileWatcherTestMixin:
+
+    def create_watcher(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.tmp_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_watch_'))
+        self.watched = self.tmp_dir / "watched.idsl"
+        self.other = self.tmp_dir / "other.idsl"
+        self.watched.write_text("module A{};")
+        self.other.write_text("module B{};")
+        self.watcher = self.create_watcher()
+        self.watcher.set_files([self.watched])
+
+    def tearDown(self):
+        self.watcher.close()
+        shutil.rmtree(self.tmp_dir, ignore_errors=True)
+
+    def test_timeout(self):
+        self.other.write_text("module B{ sequence<int> Ints; };")
+        self.assertEqual(self.watcher.wait(0.2), set())
+
+    def test_modified(self):
+        timer = threading.Timer(0.1, self.watched.write_text, ["module A{ sequence<int> Ints; };"])
+        timer.start()
+        self.assertEqual(self.watcher.wait(5), {self.watched})
+        timer.join()
+
+    def test_replaced(self):
+        # as most editors save the files
+        new_file = self.tmp_dir / "watched.idsl.tmp"
+        new_file.write_text("module A{ sequence<float> Floats; };")
+        os.replace(new_file, self.watched)
+        self.assertEqual(self.watcher.wait(5), {self.watched})
+
+
+class PollingWatcherTestCase(FileWatcherTestMixin, unittest.TestCase):
+
+    def create_watcher(self):
+        return PollingWatcher(interval=0.01)
+
+
+@unittest.skipUnless(sys.platform.startswith('linux'), "inotify is only available in Linux")
+class InotifyWatcherTestCase(FileWatcherTestMixin, unittest.TestCase):
+
+    def create_watcher(self):
+        return InotifyWatcher()
+
+
+class ComponentWatcherTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.persistent_cache = DSLFactory().persistent_cache
+        DSLFactory().set_persistent_cache(None)
+        self.idsl_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_idsls_'))
+        (self.idsl_dir / "WatchBase.idsl").write_text("module RoboCompWatchBase{ sequence<int> Ints; };")
+        (self.idsl_dir / "WatchTop.idsl").write_text('import "WatchBase.idsl"; module RoboCompWatchTop{ sequence<float> Floats; };')
+        (self.idsl_dir / "WatchOther.idsl").write_text("module RoboCompWatchOther{ sequence<byte> Bytes; };")
+        self.pool = IDSLPool()
+        self.pool.update_directories([self.idsl_dir])
+        pool_patcher = mock.patch('robocompdsl.common.watcher.idsl_pool', self.pool)
+        pool_patcher.start()
+        self.addCleanup(pool_patcher.stop)
+
+    def tearDown(self):
+        DSLFactory().set_persistent_cache(self.persistent_cache)
+        shutil.rmtree(self.idsl_dir, ignore_errors=True)
+
+    def test_invalidate(self):
+        self.pool.load_idsls(["WatchTop.idsl", "WatchOther.idsl"])
+        other = dict.get(self.pool, "WatchOther")
+        watcher = ComponentWatcher(self.idsl_dir / "component.cdsl", str(self.idsl_dir), PollingWatcher())
+        watcher.invalidate({self.idsl_dir / "WatchBase.idsl"})
+        # the changed module and the ones importing it must be loaded again
+        self.assertEqual(list(self.pool), ["WatchOther"])
+        self.assertIs(DSLFactory().cached_struct(self.idsl_dir / "WatchOther.idsl", ""), other)
+        self.assertIsNone(DSLFactory().cached_struct(self.idsl_dir / "WatchBase.idsl", ""))
+        self.assertIsNone(DSLFactory().cached_struct(self.idsl_dir / "WatchTop.idsl", ""))
+
+    def test_changed_imports(self):
+        # a watched idsl importing a different file, with the component restored from the persistent cache
+        cache_dir = tempfile.mkdtemp(prefix='testrobocompdsl_cache_')
+        output_dir = Path(tempfile.mkdtemp(prefix='testrobocompdsl_out_'))
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        self.addCleanup(shutil.rmtree, output_dir, ignore_errors=True)
+        DSLFactory().set_persistent_cache(DSLCache(cache_dir))
+        (self.idsl_dir / "CommonBehavior.idsl").write_text(
+            "module RoboCompCommonBehavior{ interface CommonBehavior{ int getPeriod(); void setPeriod(int p); }; };")
+        top_idsl = self.idsl_dir / "WatchTop.idsl"
+        top_content = 'import "{}"; module RoboCompWatchTop{{ interface WatchTop{{ void f(); }}; }};'
+        top_idsl.write_text(top_content.format("WatchBase.idsl"))
+        cdsl_path = self.idsl_dir / "component.cdsl"
+        cdsl_path.write_text('import "WatchTop.idsl";\nComponent watched\n{\n\tCommunications\n\t{\n'
+                             '\t\trequires WatchTop;\n\t};\n\tlanguage Cpp11;\n};\n')
+        for module in ['robocompdsl.dsl_parsers.idslpool', 'robocompdsl.common.icegenerator',
+                       'robocompdsl.templates.common.abstracttemplatesmanager']:
+            pool_patcher = mock.patch(module + '.idsl_pool', self.pool)
+            pool_patcher.start()
+            self.addCleanup(pool_patcher.stop)
+        watcher = ComponentWatcher(cdsl_path, str(output_dir), PollingWatcher())
+        with mock.patch('robocompdsl.common.watcher.console'):
+            watcher.generate()
+            self.assertIn(self.idsl_dir / "WatchBase.idsl", watcher.watched)
+            top_idsl.write_text(top_content.format("WatchOther.idsl"))
+            watcher.invalidate({top_idsl})
+            watcher.generate()
+        self.assertEqual(watcher.generations, 2)
+        self.assertIn(self.idsl_dir / "WatchOther.idsl", watcher.watched)
+        self.assertNotIn(self.idsl_dir / "WatchBase.idsl", watcher.watched)
+        cmake = (output_dir / "src" / "CMakeLists.txt").read_text()
+        self.assertIn("ROBOCOMP_IDSL_TO_ICE( CommonBehavior WatchOther WatchTop)", cmake)
+
+
+if __name__ == '__main__':
+    unittest.main()
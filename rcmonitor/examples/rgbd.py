@@ -129,7 +129,6 @@ class C(QWidget):
 				print ('Undetermined Color image size: we shall not paint! %d'%(len(self.color)))
 				return
 		elif "getRGB" in self.method_combo or "getImage" in self.method_combo:
-			new_color = ''
 			if (len(self.color) == 640 * 480):
 				color_image_width = 640
 				color_image_height = 480
@@ -139,11 +138,7 @@ class C(QWidget):
 			else:
 				print ('Undetermined Color image size in getRGB: we shall not paint! %d'%(len(self.color)))
 				return
-			for color_struct in self.color:
-				new_color+=chr(color_struct.red)
-				new_color+=chr(color_struct.green)
-				new_color+=chr(color_struct.blue)
-			self.color= new_color
+			self.color = np.array([(color_struct.red, color_struct.green, color_struct.blue) for color_struct in self.color], dtype=np.uint8).tobytes()
 
 		elif "getXYZ" in self.method_combo :
 